@@ -0,0 +1,289 @@
+# Headless benchmark of every dashboard section.
+#
+# For each data scale a synthetic data directory is generated from the
+# bundled raw tables, and every sidebar section is rendered with Streamlit's
+# AppTest in a fresh process pointed at that directory (CULTURAL_DATA_DIR):
+# once with cold caches, then again from new sessions with warm caches. Wall
+# time, peak memory and the bytes sent to the browser are written to JSON
+# and can be compared against a stored baseline.
+#
+#   python benchmark.py                                 # 15, 10k and 1M rows
+#   python benchmark.py --scales 15 10000 --out bench.json
+#   python benchmark.py --baseline bench_baseline.json  # exit 1 on regressions
+#   python benchmark.py --scales 1000000 --sessions 20  # + resident memory per session
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import timeseries
+
+APP = Path(__file__).resolve().parent / "cultural_tourism_app.py"
+SCALES = [15, 10_000, 1_000_000]
+WARM_RUNS = 3
+SECTION_TIMEOUT = 900
+# Relative growth over the baseline that counts as a regression
+TOLERANCE = 0.2
+METRICS = ['wall_s', 'peak_rss_mb', 'payload_bytes', 'figure_bytes']
+
+# Column that must stay unique when a table is scaled up
+KEY_COLUMNS = {'art_forms': 'Art_Form'}
+
+
+def scale_table(base, n_rows, rng, key=None):
+    # The real rows first, then resampled rows with jittered numbers
+    extra = n_rows - len(base)
+    if extra <= 0:
+        return base.head(n_rows).reset_index(drop=True)
+    rows = base.iloc[rng.integers(0, len(base), extra)].reset_index(drop=True)
+    for column in rows.columns:
+        values = rows[column].to_numpy()
+        if column in ('Latitude', 'Longitude'):
+            rows[column] = np.round(values + rng.normal(0.0, 0.5, extra), 4)
+        elif np.issubdtype(values.dtype, np.integer):
+            rows[column] = np.rint(values * rng.lognormal(0.0, 0.2, extra)).astype(values.dtype)
+        elif np.issubdtype(values.dtype, np.floating):
+            rows[column] = np.round(values * rng.lognormal(0.0, 0.2, extra), 1)
+    if key is not None:
+        rows[key] = rows[key].astype(str) + " " + (np.arange(extra) + len(base)).astype(str)
+    return pd.concat([base, rows], ignore_index=True)
+
+
+def write_synthetic(data_dir, n_rows, seed=0):
+    # data_dir/raw + data_dir/store for one scale. States are drawn from the
+    # real ones so partition counts stay realistic; tourism_trends keeps
+    # its twelve months.
+    rng = np.random.default_rng(seed)
+    raw_dir, store_dir = Path(data_dir) / "raw", Path(data_dir) / "store"
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    tables = {}
+    for name in data_store.TABLES:
+        base = pd.read_csv(data_store.RAW_DIR / f"{name}.csv")
+        tables[name] = base if name == 'tourism_trends' else scale_table(base, n_rows, rng, KEY_COLUMNS.get(name))
+        tables[name].to_csv(raw_dir / f"{name}.csv", index=False)
+    data_store.convert_all(raw_dir, store_dir)
+
+    # One footfall series per state (its average site) keeps the daily
+    # table at a fixed size
+    per_state = tables['cultural_sites'].groupby('State', sort=False)['Annual_Tourists'].mean().reset_index()
+    data_store.write_table(timeseries.FOOTFALL_TABLE,
+                           timeseries.sample_footfall(per_state, tables['tourism_trends']),
+                           timeseries.SAMPLE_SOURCE, store_dir)
+
+
+def _reset_peak_rss():
+    # Linux lets a process reset its own high-water mark
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _rss_mb(field='VmHWM'):
+    # Peak (VmHWM) or current (VmRSS) resident memory; other platforms only
+    # report the peak
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def _elements(node):
+    for child in getattr(node, 'children', {}).values():
+        yield child
+        yield from _elements(child)
+
+
+def _open_session(section, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(APP), default_timeout=timeout)
+    at.session_state['section'] = section
+    return at
+
+
+def render_section(section, timeout=SECTION_TIMEOUT):
+    # One session rendering one section, with what it sent to the browser
+    at = _open_session(section, timeout)
+    _reset_peak_rss()
+    start = time.perf_counter()
+    at.run()
+    wall = time.perf_counter() - start
+
+    elements = list(_elements(at._tree))
+    protos = [e.proto for e in elements if getattr(e, 'proto', None) is not None]
+    return {
+        'wall_s': round(wall, 4),
+        'peak_rss_mb': round(_rss_mb(), 1),
+        'payload_bytes': sum(p.ByteSize() for p in protos),
+        'figure_bytes': sum(len(e.proto.spec) for e in elements if getattr(e, 'type', None) == 'plotly_chart'),
+        'errors': [str(e.value) for e in at.exception],
+    }
+
+
+def session_memory(section, n_sessions, timeout=SECTION_TIMEOUT):
+    # Resident memory added by each concurrently open session, from the
+    # slope between the first and the last of n_sessions kept alive
+    sessions = []
+    rss = []
+    for _ in range(n_sessions):
+        at = _open_session(section, timeout)
+        at.run()
+        sessions.append(at)
+        gc.collect()
+        rss.append(_rss_mb('VmRSS'))
+    per_session = (rss[-1] - rss[0]) / (n_sessions - 1) if n_sessions > 1 else 0.0
+    return {'sessions': n_sessions, 'rss_first_mb': round(rss[0], 1), 'rss_last_mb': round(rss[-1], 1),
+            'rss_per_session_mb': round(per_session, 2)}
+
+
+def _child(section, warm_runs, timeout, n_sessions):
+    # Runs inside the per-section process
+    cold = render_section(section, timeout)
+    warm_runs = [render_section(section, timeout) for _ in range(warm_runs)]
+    warm = min(warm_runs, key=lambda r: r['wall_s'])
+    warm['peak_rss_mb'] = max(r['peak_rss_mb'] for r in warm_runs)
+    result = {'cold': cold, 'warm': warm}
+    if n_sessions:
+        result['memory'] = session_memory(section, n_sessions, timeout)
+    print(json.dumps(result))
+
+
+def run_section(data_dir, section, warm_runs=WARM_RUNS, timeout=SECTION_TIMEOUT, n_sessions=0):
+    env = {**os.environ, 'CULTURAL_DATA_DIR': str(data_dir)}
+    cmd = [sys.executable, __file__, '--child', section, '--warm-runs', str(warm_runs), '--timeout', str(timeout),
+           '--sessions', str(n_sessions)]
+    try:
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True,
+                              timeout=timeout * (warm_runs + n_sessions + 1))
+    except subprocess.TimeoutExpired:
+        return {'errors': [f"timed out after {timeout * (warm_runs + n_sessions + 1)}s"]}
+    if proc.returncode != 0:
+        return {'errors': [proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"]}
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result['errors'] = result['cold'].pop('errors') + result['warm'].pop('errors')
+    return result
+
+
+def run_benchmark(scales, sections, work_dir, warm_runs=WARM_RUNS, timeout=SECTION_TIMEOUT, n_sessions=0):
+    results = []
+    for n_rows in scales:
+        data_dir = Path(work_dir) / f"rows_{n_rows}"
+        write_synthetic(data_dir, n_rows)
+        for section in sections:
+            result = {'scale': n_rows, 'section': section,
+                      **run_section(data_dir, section, warm_runs, timeout, n_sessions)}
+            results.append(result)
+            print(_summary_line(result), flush=True)
+    return results
+
+
+def _summary_line(result):
+    cells = [f"{result['scale']:>9,}", f"{result['section']:<32}"]
+    for phase in ('cold', 'warm'):
+        stats = result.get(phase)
+        cells.append(f"{phase} {stats['wall_s']:7.2f}s {stats['peak_rss_mb']:7.1f}MB {stats['payload_bytes']:>11,}B"
+                     if stats else f"{phase} {'-':>30}")
+    if result.get('memory'):
+        cells.append(f"{result['memory']['rss_per_session_mb']:6.2f}MB/session")
+    if result['errors']:
+        cells.append("ERROR: " + "; ".join(result['errors']))
+    return "  ".join(cells)
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    # Metrics that grew by more than tolerance, as printable lines
+    previous = {(r['scale'], r['section']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get((result['scale'], result['section']))
+        if old is None:
+            continue
+        for phase in ('cold', 'warm'):
+            for metric in METRICS:
+                new_value = (result.get(phase) or {}).get(metric)
+                old_value = (old.get(phase) or {}).get(metric)
+                if new_value is None or not old_value:
+                    continue
+                if new_value > old_value * (1 + tolerance):
+                    regressions.append(f"{result['scale']:,} rows, {result['section']}, {phase} {metric}: "
+                                       f"{old_value} -> {new_value} (+{new_value / old_value - 1:.0%})")
+        new_value = (result.get('memory') or {}).get('rss_per_session_mb')
+        old_value = (old.get('memory') or {}).get('rss_per_session_mb')
+        # Per-session growth is noisy below a megabyte
+        if new_value is not None and old_value is not None and new_value > max(old_value, 1.0) * (1 + tolerance):
+            regressions.append(f"{result['scale']:,} rows, {result['section']}, rss_per_session_mb: "
+                               f"{old_value} -> {new_value}")
+    return regressions
+
+
+def main(argv=None):
+    import sections
+
+    parser = argparse.ArgumentParser(description="Benchmark every dashboard section headlessly")
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES, help="rows per table")
+    parser.add_argument('--sections', nargs='+', default=list(sections.SECTIONS),
+                        help="sidebar labels (default: all)")
+    parser.add_argument('--out', type=Path, default=Path('benchmark_results.json'))
+    parser.add_argument('--baseline', type=Path, help="results file to compare against")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--work-dir', type=Path, help="where synthetic data is written (default: a temp dir)")
+    parser.add_argument('--warm-runs', type=int, default=WARM_RUNS)
+    parser.add_argument('--timeout', type=int, default=SECTION_TIMEOUT, help="seconds per page render")
+    parser.add_argument('--sessions', type=int, default=0,
+                        help="also keep this many sessions open and report resident memory per session")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.child, args.warm_runs, args.timeout, args.sessions)
+        return
+
+    unknown = [s for s in args.sections if s not in sections.SECTIONS]
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix='cultural-bench-') as tmp:
+        results = run_benchmark(args.scales, args.sections, args.work_dir or tmp, args.warm_runs, args.timeout,
+                                args.sessions)
+
+    import streamlit
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'streamlit': streamlit.__version__,
+        'platform': platform.platform(),
+        'results': results,
+    }
+    args.out.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"wrote {args.out}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print("REGRESSION " + line)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions over {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == '__main__':
+    main()
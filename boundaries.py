@@ -0,0 +1,232 @@
+# Multi-resolution state boundaries for the choropleth.
+#
+# The raw boundary export (data/raw/state_boundaries.geojson, one Polygon
+# or MultiPolygon feature per state) is simplified once with
+# Douglas-Peucker at a few tolerances. Each tolerance is about one screen
+# pixel at a band of map zooms. The result is stored in the columnar store,
+# partitioned by Level, as one row per ring. Ring coordinates are quantized
+# to a quarter of the level's tolerance and delta-encoded as int32 lists.
+# The map asks for the level that fits its zoom, so the whole-country view
+# gets a light outline and full detail is only sent when zoomed in.
+#
+#   python boundaries.py                    # (re)build from the raw export
+#   python boundaries.py path/to/india.geojson
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+import data_store
+from formatting import thousands
+
+BOUNDARY_TABLE = 'state_boundaries'
+BOUNDARY_FILE = 'state_boundaries.geojson'
+# Feature properties that may hold the state name, in order of preference
+NAME_PROPERTIES = ['State', 'ST_NM', 'NAME_1', 'st_nm', 'name']
+# Simplification tolerance per level, in degrees, coarsest first. Roughly
+# one pixel at zooms 5, 7, 9 and 11.
+LEVEL_TOLERANCES = [0.04, 0.01, 0.0025, 0.0006]
+# Coordinate grid per level, as a fraction of its tolerance
+QUANTUM_FRACTION = 0.25
+TILE_PX = 256
+# Fill colors from low to high annual tourists (ColorBrewer YlOrRd)
+PALETTE = ['#ffffb2', '#fed976', '#feb24c', '#fd8d3c', '#f03b20', '#bd0026']
+
+
+def boundaries_available(store_dir=None):
+    return BOUNDARY_TABLE in data_store.read_manifest(store_dir)['tables']
+
+
+def boundary_digest(store_dir=None):
+    # Hash of the raw export the stored boundaries were built from; the
+    # same across versions until the export itself changes
+    return data_store.read_manifest(store_dir)['tables'].get(BOUNDARY_TABLE, {}).get('sha256')
+
+
+def level_for_zoom(zoom):
+    # Coarsest level whose tolerance is under one pixel at this zoom
+    pixel_deg = 360.0 / (TILE_PX * 2 ** zoom)
+    for level, tolerance in enumerate(LEVEL_TOLERANCES):
+        if tolerance <= pixel_deg:
+            return level
+    return len(LEVEL_TOLERANCES) - 1
+
+
+def _segment_distances(points, a, b):
+    # Distance of each point to the segment a-b, in degrees
+    ab = b - a
+    length2 = float(ab @ ab)
+    if length2 == 0.0:
+        return np.hypot(*(points - a).T)
+    t = np.clip((points - a) @ ab / length2, 0.0, 1.0)
+    return np.hypot(*(points - (a + t[:, None] * ab)).T)
+
+
+def simplify_line(points, tolerance):
+    # Douglas-Peucker with an explicit stack; endpoints are always kept
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        distances = _segment_distances(points[start + 1:end], points[start], points[end])
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            split = start + 1 + i
+            keep[split] = True
+            stack += [(start, split), (split, end)]
+    return points[keep]
+
+
+def simplify_ring(ring, tolerance):
+    # A closed ring is split at its farthest point from the start so both
+    # halves are open lines; the result keeps at least a triangle
+    ring = np.asarray(ring, dtype=np.float64)[:, :2]
+    if len(ring) < 5:
+        return ring
+    far = int(np.argmax(np.hypot(*(ring - ring[0]).T)))
+    first = simplify_line(ring[:far + 1], tolerance)
+    second = simplify_line(ring[far:], tolerance)
+    return np.concatenate([first, second[1:]])
+
+
+def _polygons(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+
+def _state_name(properties):
+    for key in NAME_PROPERTIES:
+        if properties.get(key):
+            return str(properties[key])
+    raise ValueError(f"boundary feature has none of {', '.join(NAME_PROPERTIES)}: {properties}")
+
+
+def boundary_rows(geojson):
+    # One row per (state, level, polygon, ring) with quantized, delta-encoded
+    # coordinates
+    rows = []
+    for feature in geojson['features']:
+        state = _state_name(feature.get('properties') or {})
+        polygons = [[np.asarray(ring, dtype=np.float64)[:, :2] for ring in polygon]
+                    for polygon in _polygons(feature['geometry'])]
+        if not polygons:
+            continue
+        largest = max(range(len(polygons)), key=lambda i: len(polygons[i][0]))
+        for level, tolerance in enumerate(LEVEL_TOLERANCES):
+            quantum = tolerance * QUANTUM_FRACTION
+            for p, polygon in enumerate(polygons):
+                for r, ring in enumerate(polygon):
+                    # Islands and holes smaller than the tolerance vanish,
+                    # but every state keeps its main outline
+                    extent = ring.max(axis=0) - ring.min(axis=0)
+                    if (extent < tolerance).all() and not (p == largest and r == 0):
+                        continue
+                    grid = np.rint(simplify_ring(ring, tolerance) / quantum).astype(np.int64)
+                    deltas = np.diff(grid, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).astype(np.int32)
+                    rows.append((state, level, p, r, deltas[:, 0], deltas[:, 1]))
+    return pd.DataFrame(rows, columns=['State', 'Level', 'Polygon', 'Ring', 'X', 'Y'])
+
+
+def _read_rows(path):
+    with open(path) as f:
+        return boundary_rows(json.load(f))
+
+
+def boundary_writer(path):
+    # Update (see data_store.build_version) simplifying a raw export into a
+    # version being built
+    def write(staging):
+        return data_store.frame_writer(BOUNDARY_TABLE, _read_rows(path), str(path),
+                                       digest=data_store.file_digest(path))(staging)
+    return write
+
+
+def build_boundaries(path=None, store_dir=None):
+    path = Path(path or data_store.RAW_DIR / BOUNDARY_FILE)
+    rows = _read_rows(path)
+    data_store.write_table(BOUNDARY_TABLE, rows, str(path), store_dir, digest=data_store.file_digest(path))
+    return rows
+
+
+def load_geometries(level, store_dir=None):
+    # State -> (((south, west), (north, east)), serialized GeoJSON
+    # MultiPolygon) for one level
+    table = data_store.load_arrow(BOUNDARY_TABLE, store_dir, filter=ds.field('Level') == level)
+    quantum = LEVEL_TOLERANCES[level] * QUANTUM_FRACTION
+    states = table['State'].to_pylist()
+    polygons = table['Polygon'].to_pylist()
+    # Rows arrive in write order: states, then polygons, then rings
+    offsets = table['X'].combine_chunks().offsets.to_numpy()
+    x = table['X'].combine_chunks().flatten().to_numpy().astype(np.int64)
+    y = table['Y'].combine_chunks().flatten().to_numpy().astype(np.int64)
+
+    parts = {}
+    extents = {}
+    for i, (state, polygon) in enumerate(zip(states, polygons)):
+        lo, hi = offsets[i], offsets[i + 1]
+        coords = np.round(np.column_stack([np.cumsum(x[lo:hi]), np.cumsum(y[lo:hi])]) * quantum, 6)
+        parts.setdefault(state, {}).setdefault(polygon, []).append(coords.tolist())
+        low, high = coords.min(axis=0), coords.max(axis=0)
+        if state in extents:
+            low, high = np.minimum(low, extents[state][0]), np.maximum(high, extents[state][1])
+        extents[state] = (low, high)
+    return {state: (((low[1], low[0]), (high[1], high[0])),
+                    json.dumps({"type": "MultiPolygon", "coordinates": list(parts[state].values())},
+                               separators=(",", ":")))
+            for state, (low, high) in extents.items()}
+
+
+def _overlaps(a, b):
+    (south_a, west_a), (north_a, east_a) = a
+    (south_b, west_b), (north_b, east_b) = b
+    return south_a <= north_b and south_b <= north_a and west_a <= east_b and west_b <= east_a
+
+
+def fill_colors(values):
+    # Log-scaled position between the smallest and largest value
+    logs = np.log1p(np.asarray(values, dtype=np.float64))
+    span = max(logs.max(initial=0.0) - logs.min(initial=0.0), 1e-9)
+    bins = np.minimum(((logs - logs.min(initial=0.0)) / span * len(PALETTE)).astype(int), len(PALETTE) - 1)
+    return np.asarray(PALETTE)[bins]
+
+
+def choropleth_layer_json(geometries, cultural_sites, bounds=None):
+    # FeatureCollection of the states with a boundary, shaded by their
+    # total annual tourists; with bounds, only the states overlapping them.
+    # Colors are scaled over all states so they don't shift while panning.
+    totals = cultural_sites.groupby('State', sort=True)['Annual_Tourists'].sum()
+    totals = totals[totals.index.isin(list(geometries))]
+    colors = fill_colors(totals.to_numpy())
+    tooltips = totals.index.to_numpy(dtype=object) + ": " + thousands(totals.to_numpy()) + " annual tourists"
+    features = [
+        '{"type":"Feature","properties":' + json.dumps({"State": state, "color": color, "tooltip": tooltip})
+        + ',"geometry":' + geometries[state][1] + '}'
+        for state, color, tooltip in zip(totals.index, colors, tooltips)
+        if bounds is None or _overlaps(geometries[state][0], bounds)
+    ]
+    return '{"type":"FeatureCollection","features":[' + ','.join(features) + ']}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simplify state boundaries into the columnar store")
+    parser.add_argument('geojson', nargs='?', type=Path, default=data_store.RAW_DIR / BOUNDARY_FILE)
+    parser.add_argument('--store', default=data_store.STORE_DIR)
+    args = parser.parse_args(argv)
+
+    rows = build_boundaries(args.geojson, args.store)
+    points = rows.assign(Points=rows['X'].map(len)).groupby('Level')['Points'].sum()
+    for level, tolerance in enumerate(LEVEL_TOLERANCES):
+        print(f"level {level}: tolerance {tolerance}°, {points.get(level, 0):,} points")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+# Capacity-and-demand model for off-peak growth potential.
+#
+# For every series in the footfall matrix (state or site), monthly demand is
+# the mean daily footfall in that calendar month, and carrying capacity is
+# either the value from the carrying_capacity table or, when a series has
+# none, the footfall it has demonstrably handled (a high percentile of its
+# daily visitors). Headroom is the gap between demand and a sustainable
+# share of capacity, reported in visitors per day and in index points
+# relative to the series' peak month, so it stacks onto the seasonal index.
+#
+# carrying_capacity (data/raw/carrying_capacity.csv) has a Daily_Capacity
+# column and a label column named like the series it applies to. A State
+# row is the capacity of the whole state, i.e. of the summed footfall of
+# its sites, not of each site; per-site capacities need a row per site
+# under the site label column. A scope without footfall has no series and
+# gives an empty frame.
+import numpy as np
+import pandas as pd
+
+import data_store
+from seasonality import MONTHS, footfall_matrix, month_one_hot
+
+CAPACITY_TABLE = 'carrying_capacity'
+CAPACITY_PERCENTILE = 95
+# Share of carrying capacity that growth may fill
+TARGET_UTILIZATION = 0.85
+
+
+def carrying_capacity(labels, matrix, by='State', store_dir=None):
+    # Daily capacity per series: configured values where available,
+    # demonstrated capacity elsewhere
+    capacity = np.percentile(matrix, CAPACITY_PERCENTILE, axis=1)
+    if CAPACITY_TABLE in data_store.read_manifest(store_dir)['tables']:
+        configured = data_store.load_table(CAPACITY_TABLE, store_dir)
+        if by in configured.columns:
+            lookup = configured.set_index(by)['Daily_Capacity']
+            known = pd.Series(labels).map(lookup).to_numpy(dtype=float)
+            capacity = np.where(np.isnan(known), capacity, known)
+    return capacity
+
+
+def monthly_headroom(labels, dates, matrix, capacity):
+    # Long frame of demand, capacity and headroom per (series, month)
+    _, one_hot = month_one_hot(dates)
+    demand = matrix @ one_hot / np.maximum(one_hot.sum(axis=0), 1)
+    peak_demand = demand.max(axis=1, keepdims=True)
+
+    headroom = np.clip(capacity[:, None] * TARGET_UTILIZATION - demand, 0, None)
+    scale = np.divide(100.0, peak_demand, out=np.zeros_like(peak_demand), where=peak_demand > 0)
+    return pd.DataFrame({
+        'Label': np.repeat(labels, 12),
+        'Month': np.tile(MONTHS, len(labels)),
+        'Demand': demand.round(1).ravel(),
+        'Capacity': np.repeat(capacity.round(1), 12),
+        'Headroom': headroom.round(1).ravel(),
+        'Current_Index': (demand * scale).round(1).ravel(),
+        'Headroom_Index': (headroom * scale).round(1).ravel(),
+    })
+
+
+def headroom_by(by='State', national_label=None, store_dir=None, start=None, end=None, states=None):
+    # Headroom for every series at once; with national_label, the summed
+    # series is appended under that label
+    labels, dates, matrix = footfall_matrix(by, start, end, store_dir, states)
+    if not len(labels):
+        return monthly_headroom(labels, dates, np.zeros((0, 0)), np.zeros(0)).rename(columns={'Label': by})
+    capacity = carrying_capacity(labels, matrix, by, store_dir)
+    if national_label is not None:
+        labels = np.append(labels, national_label)
+        national = matrix.sum(axis=0, keepdims=True)
+        matrix = np.vstack([matrix, national])
+        capacity = np.append(capacity, capacity.sum())
+    return monthly_headroom(labels, dates, matrix, capacity).rename(columns={'Label': by})
@@ -0,0 +1,179 @@
+# Monte Carlo crowding and carrying-capacity simulator.
+#
+# Expected daily visitors per site:
+# - the site's Annual_Tourists spread over the year by the monthly
+#   Cultural_Tourism index in tourism_trends;
+# - times a weekend uplift.
+# Each scenario draws a full year of daily arrivals per site. Arrivals are
+# negative binomial (Poisson with a gamma-distributed daily rate), so days
+# vary more than pure chance would give; `variability` is that extra
+# coefficient of variation.
+#
+# Carrying capacity per site defaults to `capacity_factor` times the site's
+# average daily visitors in its peak month. Where the carrying_capacity
+# table has a Daily_Capacity for the site's state, that is the capacity of
+# the whole state: it is split across the state's sites in proportion to
+# their peak-month averages (evenly when those are all zero).
+#
+# Sites are simulated in blocks: each block draws all its sites, scenarios
+# and days as one (sites x scenarios x 365) array. Blocks are split across
+# a process pool once the job is large. Each block's random stream is
+# derived from the seed and its position, and blocks start at fixed site
+# positions, so the results don't depend on how the blocks were split.
+import calendar
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import data_store
+from capacity import CAPACITY_TABLE
+
+MONTHS = list(calendar.month_abbr[1:])
+# A non-leap year starting on a Sunday, for month lengths and weekends
+CALENDAR_YEAR = 2023
+WEEKEND_UPLIFT = 1.3
+# Jobs with more draws than this run in a process pool
+PARALLEL_MIN_DRAWS = 50_000_000
+# Draws per block of sites, to bound the memory of one array
+BLOCK_DRAWS = 4_000_000
+
+CrowdParams = namedtuple('CrowdParams', [
+    'scenarios',         # simulated years per site
+    'capacity_factor',   # default capacity, x peak-month average daily visitors
+    'variability',       # extra day-to-day coefficient of variation
+    'growth',            # demand growth over Annual_Tourists, e.g. 0.1 for +10%
+    'seed',
+])
+DEFAULT_PARAMS = CrowdParams(2000, 1.5, 0.25, 0.0, 7)
+
+
+def year_days():
+    # Month (0-11) and weekend flag of every day of the simulated year
+    dates = np.arange(f'{CALENDAR_YEAR}-01-01', f'{CALENDAR_YEAR + 1}-01-01', dtype='datetime64[D]')
+    months = dates.astype('datetime64[M]').astype(np.int64) % 12
+    # 1970-01-01 was a Thursday, so (days + 3) % 7 is 0 on Mondays
+    weekend = np.isin((dates.astype(np.int64) + 3) % 7, [5, 6])
+    return months, weekend
+
+
+def daily_demand(cultural_sites, tourism_trends):
+    # (sites x 365) expected visitors per day
+    months, weekend = year_days()
+    index = (tourism_trends.set_index('Month')['Cultural_Tourism'].astype(np.float64)
+             .reindex(MONTHS).fillna(0.0).to_numpy())
+    # Share of the year's visitors arriving on each day
+    day_weight = index[months] * np.where(weekend, WEEKEND_UPLIFT, 1.0)
+    day_weight /= day_weight.sum()
+    annual = cultural_sites['Annual_Tourists'].to_numpy(dtype=np.float64)
+    return annual[:, None] * day_weight[None, :]
+
+
+def site_capacity(cultural_sites, demand, capacity_factor, store_dir=None):
+    months, _ = year_days()
+    one_hot = months[:, None] == np.arange(12)
+    monthly_mean = demand @ one_hot / one_hot.sum(axis=0)
+    peak = monthly_mean.max(axis=1)
+    capacity = capacity_factor * peak
+    if CAPACITY_TABLE in data_store.read_manifest(store_dir)['tables']:
+        configured = data_store.load_table(CAPACITY_TABLE, store_dir)
+        if 'State' in configured.columns:
+            lookup = configured.set_index('State')['Daily_Capacity']
+            states = cultural_sites['State'].astype(object).reset_index(drop=True)
+            state_capacity = states.map(lookup).to_numpy(dtype=np.float64)
+            # Each site's share of its state's peak-month visitors
+            by_state = pd.Series(peak).groupby(states)
+            total = by_state.transform('sum').to_numpy()
+            sites = by_state.transform('size').to_numpy(dtype=np.float64)
+            share = np.divide(peak, total, out=1.0 / sites, where=total > 0)
+            capacity = np.where(np.isnan(state_capacity), capacity, state_capacity * share)
+    return capacity
+
+
+def block_sites(params, n_days=365):
+    return max(1, BLOCK_DRAWS // (params.scenarios * n_days))
+
+
+def _simulate_rows(args):
+    # Share of scenarios over capacity for every (site, day), and the
+    # number of overflow days in each scenario's year, per site. offset is
+    # the first site's position and a multiple of block_sites.
+    demand, capacity, params, offset = args
+    block = block_sites(params, demand.shape[1])
+    first = offset // block
+    seeds = np.random.SeedSequence(params.seed).spawn(first + -(-len(demand) // block))[first:]
+    shape = 1.0 / params.variability ** 2 if params.variability > 0 else None
+    over_by_day = np.empty(demand.shape)
+    overflow_days = np.empty((len(demand), params.scenarios))
+    for lo, seed in zip(range(0, len(demand), block), seeds):
+        rng = np.random.default_rng(seed)
+        mean = demand[lo:lo + block, None, :]
+        size = (len(mean), params.scenarios, demand.shape[1])
+        if shape is None:
+            arrivals = rng.poisson(mean, size)
+        else:
+            # Gamma-Poisson mixture with mean `mean` and the extra variance
+            arrivals = rng.negative_binomial(shape, shape / (shape + mean), size)
+        over = arrivals > capacity[lo:lo + block, None, None]
+        over_by_day[lo:lo + block] = over.mean(axis=1)
+        overflow_days[lo:lo + block] = over.sum(axis=2)
+    return over_by_day, overflow_days
+
+
+def simulate(demand, capacity, params, workers=None):
+    n_draws = demand.size * params.scenarios
+    if n_draws < PARALLEL_MIN_DRAWS or len(demand) < 2:
+        return _simulate_rows((demand, capacity, params, 0))
+
+    workers = workers or os.cpu_count() or 1
+    # Split on block boundaries
+    block = block_sites(params, demand.shape[1])
+    n_blocks = -(-len(demand) // block)
+    bounds = np.minimum(np.linspace(0, n_blocks, min(workers, n_blocks) + 1).astype(int) * block, len(demand))
+    jobs = [(demand[lo:hi], capacity[lo:hi], params, lo) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    # spawn, not fork: the Streamlit server process is multi-threaded
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        parts = list(pool.map(_simulate_rows, jobs))
+    return tuple(np.concatenate(part) for part in zip(*parts))
+
+
+def crowding_risk(cultural_sites, tourism_trends, params=DEFAULT_PARAMS, store_dir=None, workers=None):
+    # (monthly, summary):
+    # - monthly has one row per (site, month) with the chance a day is over
+    #   capacity and the chance of at least one such day in the month;
+    # - summary has one row per site with its capacity and overflow days
+    #   per year.
+    # Capacity is set by today's demand; growth only raises demand
+    current = daily_demand(cultural_sites, tourism_trends)
+    capacity = site_capacity(cultural_sites, current, params.capacity_factor, store_dir)
+    demand = current * (1.0 + params.growth)
+    over_by_day, overflow_days = simulate(demand, capacity, params, workers)
+
+    months, _ = year_days()
+    one_hot = months[:, None] == np.arange(12)
+    days_in_month = one_hot.sum(axis=0)
+    day_risk = over_by_day @ one_hot / days_in_month
+    # Days are treated as independent within a month
+    month_risk = 1.0 - np.exp(np.log1p(-np.minimum(over_by_day, 1 - 1e-12)) @ one_hot)
+    labels = cultural_sites['State'].astype(str).to_numpy()
+
+    monthly = pd.DataFrame({
+        'State': np.repeat(labels, 12),
+        'Month': pd.Categorical(np.tile(MONTHS, len(labels)), categories=MONTHS, ordered=True),
+        'Day_Risk': day_risk.round(4).ravel(),
+        'Month_Risk': month_risk.round(4).ravel(),
+        'Expected_Days': (day_risk * days_in_month).round(2).ravel(),
+    })
+    summary = pd.DataFrame({
+        'State': labels,
+        'Annual_Tourists': cultural_sites['Annual_Tourists'].to_numpy(),
+        'Capacity': capacity.round(0),
+        'Peak_Daily_Demand': demand.max(axis=1).round(0),
+        'Overflow_Days': overflow_days.mean(axis=1).round(1),
+        'Overflow_Days_P90': np.percentile(overflow_days, 90, axis=1),
+        'Any_Overflow': (overflow_days > 0).mean(axis=1).round(3),
+    }).sort_values('Overflow_Days', ascending=False, kind='stable')
+    return monthly, summary
@@ -0,0 +1,386 @@
+# Columnar data store for the dashboard.
+#
+# Raw exports (data.gov.in CSV drops) live in data/raw/<table>.csv and are
+# converted once into partitioned Parquet datasets. Every conversion writes
+# a complete version directory, data/store/<version>/, named by its data
+# version and never modified afterwards; tables that did not change are
+# hard links to the previous version's files. data/store/CURRENT names the
+# published version. A reader bound to a version therefore never sees
+# another version's files, and an old version is only removed once nothing
+# in the process holds it (see StoreVersion). At startup the dashboard
+# reads the datasets through a memory-mapped filesystem, so CSV is never
+# parsed on the request path.
+#
+#   python data_store.py                  # convert every table
+#   python data_store.py cultural_sites   # convert selected tables
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+import weakref
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs as pafs
+
+DATA_DIR = Path(os.environ.get("CULTURAL_DATA_DIR", Path(__file__).resolve().parent / "data"))
+RAW_DIR = DATA_DIR / "raw"
+STORE_DIR = DATA_DIR / "store"
+
+MANIFEST_FILE = "manifest.json"
+# Names the published version directory under STORE_DIR
+CURRENT_FILE = "CURRENT"
+# Versions kept on disk, current included, for other processes (report.py,
+# benchmark runs) that may still read an older one
+KEEP_VERSIONS = 3
+SCHEMA_FILE = "_common_metadata"
+# Hidden column that keeps the source row order across partitions
+ROW_ID = "_row_id"
+
+# Table name -> hive partition columns
+TABLES = {
+    "cultural_sites": ["State"],
+    "tourism_trends": [],
+    "art_forms": [],
+    "sustainability_data": ["State"],
+}
+
+# Tables that are only built when their raw export is present
+OPTIONAL_TABLES = {
+    "footfall_daily": ["Year"],
+    "carrying_capacity": [],
+    "state_boundaries": ["Level"],
+}
+ALL_TABLES = {**TABLES, **OPTIONAL_TABLES}
+# Raw exports that aren't <table>.csv
+RAW_FILES = {
+    "state_boundaries": "state_boundaries.geojson",
+}
+
+# Row groups sized for scans of a few columns over millions of rows
+ROWS_PER_GROUP = 1 << 18
+
+_MMAP_FS = pafs.LocalFileSystem(use_mmap=True)
+_CONVERT_LOCK = threading.RLock()
+# Live StoreVersion objects; their directories are never pruned
+_LEASES = weakref.WeakSet()
+
+
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def current_dir(store_dir=None):
+    # Published version directory under a store root; None before the first
+    # conversion
+    root = Path(store_dir or STORE_DIR)
+    try:
+        name = (root / CURRENT_FILE).read_text().strip()
+    except FileNotFoundError:
+        return None
+    return root / name
+
+
+def version_dir(store_dir=None):
+    # store_dir is a version directory or a store root, which stands for its
+    # current version. A root from before versioning is its own version.
+    path = Path(store_dir or STORE_DIR)
+    if (path / CURRENT_FILE).exists():
+        return current_dir(path)
+    if (path / MANIFEST_FILE).exists():
+        return path
+    return None
+
+
+class StoreVersion:
+    # A version directory in use. prune_versions keeps the directory while
+    # this object is alive; DashboardData holds one for its snapshot.
+    def __init__(self, path):
+        self.path = Path(path).resolve()
+        _LEASES.add(self)
+
+    def __repr__(self):
+        return f"StoreVersion({str(self.path)!r})"
+
+
+def read_manifest(store_dir=None):
+    path = version_dir(store_dir)
+    if path is None:
+        return {"tables": {}}
+    with open(path / MANIFEST_FILE) as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, store_dir):
+    path = Path(store_dir) / MANIFEST_FILE
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _version_of(manifest):
+    digests = sorted((name, meta["sha256"]) for name, meta in manifest["tables"].items())
+    return hashlib.sha256(json.dumps(digests).encode()).hexdigest()[:12]
+
+
+def data_version(store_dir=None):
+    # Short fingerprint of every table's source content; changes whenever a
+    # table is re-converted from a different raw file
+    return _version_of(read_manifest(store_dir))
+
+
+def _with_row_ids(reader):
+    offset = 0
+    for batch in reader:
+        row_ids = pa.array(np.arange(offset, offset + batch.num_rows, dtype=np.int64))
+        offset += batch.num_rows
+        yield pa.RecordBatch.from_arrays(batch.columns + [row_ids],
+                                         names=batch.schema.names + [ROW_ID])
+
+
+def _partitioning(schema, partition_cols):
+    if not partition_cols:
+        return None
+    return ds.partitioning(pa.schema([schema.field(c) for c in partition_cols]), flavor="hive")
+
+
+def _write_dataset(name, reader, store_dir, partition_cols):
+    # Write a record batch stream as a partitioned Parquet dataset into a
+    # version directory that is still being built
+    schema = reader.schema.append(pa.field(ROW_ID, pa.int64()))
+    target = store_dir / name
+    shutil.rmtree(target, ignore_errors=True)
+    ds.write_dataset(
+        pa.RecordBatchReader.from_batches(schema, _with_row_ids(reader)),
+        target,
+        format="parquet",
+        partitioning=_partitioning(schema, partition_cols),
+        max_rows_per_group=ROWS_PER_GROUP,
+        max_partitions=4096,
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    pq.write_metadata(schema, target / SCHEMA_FILE)
+    return ds.dataset(target, format="parquet").count_rows()
+
+
+def convert_table(name, csv_path, store_dir, partition_cols=None):
+    # Stream the CSV in large blocks straight into a version being built
+    store_dir = Path(store_dir)
+    partition_cols = ALL_TABLES.get(name, []) if partition_cols is None else partition_cols
+
+    # Hash first: if the file changes mid-conversion the recorded digest
+    # no longer matches and the next refresh converts it again
+    digest = file_digest(csv_path)
+    reader = pacsv.open_csv(csv_path, read_options=pacsv.ReadOptions(block_size=1 << 24))
+    rows = _write_dataset(name, reader, store_dir, partition_cols)
+    return {
+        "source": str(csv_path),
+        "sha256": digest,
+        "rows": rows,
+        "partition_cols": list(partition_cols),
+    }
+
+
+def _link(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def build_version(updates, store_dir=None, base=None, publish=True):
+    # New version directory under the store root: the base version's tables
+    # (default: the current version's) with each of `updates` (table ->
+    # function(staging directory) returning its manifest entry) written in
+    # order; an update can read the tables written before it. Returns the
+    # version directory, published unless publish is False.
+    root = Path(store_dir or STORE_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    with _CONVERT_LOCK:
+        base = version_dir(base or root)
+        manifest = read_manifest(base) if base is not None else {"tables": {}}
+        staging = root / f".staging-{uuid.uuid4().hex[:12]}"
+        staging.mkdir()
+        try:
+            for name in manifest["tables"]:
+                if name not in updates:
+                    shutil.copytree(base / name, staging / name, copy_function=_link)
+            write_manifest(manifest, staging)
+            for name, write in updates.items():
+                manifest["tables"][name] = write(staging)
+                write_manifest(manifest, staging)
+            target = root / _version_of(manifest)
+            if target.exists():
+                # Same content as a version already on disk
+                shutil.rmtree(staging)
+            else:
+                staging.rename(target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if publish:
+            publish_version(target)
+    return target
+
+
+def publish_version(path):
+    # Points CURRENT at a version directory; one rename, so other processes
+    # see the old version or the new one
+    path = Path(path)
+    tmp = path.parent / f".{CURRENT_FILE}.{uuid.uuid4().hex[:12]}"
+    tmp.write_text(path.name)
+    os.replace(tmp, path.parent / CURRENT_FILE)
+
+
+def prune_versions(store_dir=None, keep=KEEP_VERSIONS):
+    # Removes version directories that are not among the `keep` newest and
+    # that no live StoreVersion holds; returns their names
+    root = Path(store_dir or STORE_DIR)
+    if not root.exists():
+        return []
+    with _CONVERT_LOCK:
+        current = current_dir(root)
+        held = {lease.path for lease in list(_LEASES)} | {current and current.resolve()}
+        versions = sorted((path for path in root.iterdir()
+                           if not path.name.startswith(".") and (path / MANIFEST_FILE).exists()),
+                          key=lambda path: (path / MANIFEST_FILE).stat().st_mtime, reverse=True)
+        removed = []
+        for path in versions[keep:]:
+            if path.resolve() not in held:
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path.name)
+    return removed
+
+
+def frame_writer(name, df, source, partition_cols=None, digest=None):
+    # Update (see build_version) storing a frame produced in-process, e.g.
+    # sample data, like a converted export. digest defaults to a hash of
+    # the frame; pass the source file's when it has list columns.
+    partition_cols = ALL_TABLES.get(name, []) if partition_cols is None else partition_cols
+    if digest is None:
+        digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+    def write(staging):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        return {
+            "source": source,
+            "sha256": digest,
+            "rows": _write_dataset(name, table.to_reader(), staging, partition_cols),
+            "partition_cols": list(partition_cols),
+        }
+    return write
+
+
+def write_table(name, df, source, store_dir=None, partition_cols=None, digest=None):
+    # Publishes a new version with the frame as table `name`; returns its
+    # manifest
+    return read_manifest(build_version({name: frame_writer(name, df, source, partition_cols, digest)}, store_dir))
+
+
+def raw_path(name, raw_dir=None):
+    return Path(raw_dir or RAW_DIR) / RAW_FILES.get(name, f"{name}.csv")
+
+
+def available_raw_tables(raw_dir=None):
+    # Required tables plus any optional table with a raw export on disk
+    return list(TABLES) + [name for name in OPTIONAL_TABLES if raw_path(name, raw_dir).exists()]
+
+
+def converters(tables, raw_dir=None):
+    # Updates (see build_version) converting the tables' raw exports
+    updates = {}
+    for name in tables:
+        path = raw_path(name, raw_dir)
+        if name == "state_boundaries":
+            # GeoJSON, simplified per zoom level on the way in
+            import boundaries
+            updates[name] = boundaries.boundary_writer(path)
+        else:
+            updates[name] = lambda staging, name=name, path=path: convert_table(name, path, staging)
+    return updates
+
+
+def convert_all(raw_dir=None, store_dir=None, tables=None):
+    # Converts the tables (default: every raw export) into a new published
+    # version; returns its directory
+    tables = available_raw_tables(raw_dir) if tables is None else tables
+    return build_version(converters(tables, raw_dir), store_dir)
+
+
+def ensure_store(raw_dir=None, store_dir=None):
+    # One-time conversion: only tables missing from the store are built. A
+    # store from before versioning becomes the first version as it is.
+    # Loaders for different tables can start together, so serialize this.
+    with _CONVERT_LOCK:
+        manifest = read_manifest(store_dir)
+        missing = [name for name in available_raw_tables(raw_dir) if name not in manifest["tables"]]
+        if missing or current_dir(store_dir) is None:
+            manifest = read_manifest(convert_all(raw_dir, store_dir, missing))
+    return manifest
+
+
+def reconvert(updates, store_dir=None):
+    # Next version with the updates applied, not yet published (see
+    # publish_version); returns its directory
+    return build_version(updates, store_dir, publish=False)
+
+
+def open_dataset(name, store_dir=None):
+    store_dir = version_dir(store_dir)
+    path = (store_dir / name).resolve()
+    schema = pq.read_schema(path / SCHEMA_FILE)
+    partition_cols = read_manifest(store_dir)["tables"][name]["partition_cols"]
+    return ds.dataset(str(path), schema=schema, format="parquet",
+                      partitioning=_partitioning(schema, partition_cols),
+                      filesystem=_MMAP_FS)
+
+
+def load_arrow(name, store_dir=None, columns=None, filter=None):
+    dataset = open_dataset(name, store_dir)
+    if columns is not None:
+        columns = list(columns) + [ROW_ID]
+    table = dataset.to_table(columns=columns, filter=filter)
+    return table.sort_by(ROW_ID).drop_columns([ROW_ID])
+
+
+def load_table(name, store_dir=None, columns=None, filter=None, arrow_backed=False):
+    # arrow_backed keeps the Arrow buffers as pd.ArrowDtype columns instead
+    # of converting them to NumPy
+    table = load_arrow(name, store_dir, columns, filter)
+    if arrow_backed:
+        return table.combine_chunks().to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert raw CSV exports into the columnar store")
+    parser.add_argument("tables", nargs="*", metavar="table", help=f"tables to convert (default: all of {', '.join(ALL_TABLES)} with a raw export)")
+    parser.add_argument("--raw", default=RAW_DIR, help="directory with <table>.csv exports")
+    parser.add_argument("--store", default=STORE_DIR, help="store root for the Parquet version directories")
+    args = parser.parse_args(argv)
+    unknown = set(args.tables) - set(ALL_TABLES)
+    if unknown:
+        parser.error(f"unknown tables: {', '.join(sorted(unknown))}")
+
+    version = convert_all(args.raw, args.store, args.tables or None)
+    for name, meta in read_manifest(version)["tables"].items():
+        print(f"{name}: {meta['rows']:,} rows, partitioned by {meta['partition_cols'] or '-'}")
+    print(f"data version: {version.name}")
+    prune_versions(args.store)
+
+
+if __name__ == "__main__":
+    main()
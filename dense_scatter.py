@@ -0,0 +1,200 @@
+# Scatter charts that stay responsive at any point count.
+#
+# The renderer is picked by the number of points:
+# - up to SVG_MAX_POINTS: plain SVG markers;
+# - up to WEBGL_MAX_POINTS: WebGL markers, still one marker per point;
+# - beyond that: the points are rasterized on the server into a PNG density
+#   image laid over the axes.
+# In a raster, each pixel is colored by the mean of the color column and
+# made more opaque where points are denser. Hover works by lookup: a coarse,
+# invisible heatmap over the same axes carries each cell's point count,
+# color mean and the label of one of its points. Rows without a finite x
+# and y are left out, missing color values don't count towards a mean, and
+# the size encoding is dropped (describe notes it).
+#
+# The mode and the number of points drawn (rows with a finite x and y)
+# travel in layout.meta, so the bytes each chart sends to the browser can
+# be reported next to it (see describe).
+import base64
+import io
+import os
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.colors import sample_colorscale, unlabel_rgb
+
+SVG_MAX_POINTS = int(os.environ.get('SCATTER_SVG_MAX_POINTS', 2_000))
+WEBGL_MAX_POINTS = int(os.environ.get('SCATTER_WEBGL_MAX_POINTS', 100_000))
+# Raster size in pixels, and the hover grid laid over it
+RASTER_SIZE = (640, 400)
+HOVER_BINS = (80, 50)
+NO_COLOR = (160, 160, 160)
+MODES = {'svg': "SVG", 'webgl': "WebGL", 'raster': "server raster"}
+
+
+def render_mode(n_points):
+    if n_points <= SVG_MAX_POINTS:
+        return 'svg'
+    if n_points <= WEBGL_MAX_POINTS:
+        return 'webgl'
+    return 'raster'
+
+
+def _bins(values, low, high, n):
+    return np.clip(((values - low) / max(high - low, 1e-12) * n).astype(np.int64), 0, n - 1)
+
+
+def _cells(x, y, ranges, shape):
+    # Flat cell number of every point in a (rows x cols) grid, row 0 at the
+    # bottom
+    cols, rows = shape
+    (x_low, x_high), (y_low, y_high) = ranges
+    return _bins(y, y_low, y_high, rows) * cols + _bins(x, x_low, x_high, cols)
+
+
+def _ranges(x, y):
+    # Axis ranges with a little padding, so edge points aren't cut in half
+    ranges = []
+    for values in (x, y):
+        low, high = (float(np.nanmin(values)), float(np.nanmax(values))) if len(values) else (0.0, 1.0)
+        pad = (high - low) * 0.02 or 0.5
+        ranges.append((low - pad, high + pad))
+    return ranges
+
+
+def _color_mean(cells, color, n_cells):
+    # Mean of the finite color values per cell; NaN where a cell has none
+    valid = np.isfinite(color)
+    counts = np.bincount(cells[valid], minlength=n_cells)
+    sums = np.bincount(cells[valid], weights=color[valid], minlength=n_cells)
+    return np.divide(sums, counts, out=np.full(n_cells, np.nan), where=counts > 0)
+
+
+def _color_range(color):
+    valid = color[np.isfinite(color)]
+    return (float(valid.min()), float(valid.max())) if len(valid) else (0.0, 0.0)
+
+
+def _palette(colorscale, n=256):
+    return np.array([unlabel_rgb(c) for c in sample_colorscale(colorscale, np.linspace(0, 1, n))], dtype=np.float64)
+
+
+def density_png(x, y, color, ranges, colorscale, size=RASTER_SIZE):
+    # RGBA PNG: pixel color from the mean color value, opacity from the
+    # log point count. Returns (png bytes, (color min, color max)).
+    cols, rows = size
+    cells = _cells(x, y, ranges, size)
+    counts = np.bincount(cells, minlength=rows * cols)
+    filled = counts > 0
+    mean = _color_mean(cells, color, rows * cols)
+
+    c_low, c_high = _color_range(color)
+    palette = _palette(colorscale)
+    shade = palette[_bins(np.nan_to_num(mean, nan=c_low), c_low, c_high if c_high > c_low else c_low + 1,
+                          len(palette))]
+    # Cells whose points all lack a color value are grey
+    shade[filled & np.isnan(mean)] = NO_COLOR
+    density = np.log1p(counts) / np.log1p(counts.max())
+    alpha = np.where(filled, 0.35 + 0.65 * density, 0.0)
+
+    rgba = np.concatenate([shade, alpha[:, None] * 255], axis=1).round().astype(np.uint8)
+    # Image rows run top-down, grid rows bottom-up
+    image = rgba.reshape(rows, cols, 4)[::-1]
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(image, 'RGBA').save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue(), (c_low, c_high)
+
+
+def hover_grid(x, y, color, labels, ranges, bins=HOVER_BINS):
+    # Invisible heatmap with per-cell count, mean color value and one label
+    cols, rows = bins
+    cells = _cells(x, y, ranges, bins)
+    counts = np.bincount(cells, minlength=rows * cols)
+    color_mean = _color_mean(cells, color, rows * cols)
+    example = np.full(rows * cols, '', dtype=object)
+    occupied, first = np.unique(cells, return_index=True)
+    example[occupied] = np.asarray(labels, dtype=object)[first]
+
+    (x_low, x_high), (y_low, y_high) = ranges
+    z = np.where(counts > 0, counts, np.nan).reshape(rows, cols)
+    customdata = np.dstack([color_mean.reshape(rows, cols), example.reshape(rows, cols)])
+    return z, customdata, (x_low + (np.arange(cols) + 0.5) * (x_high - x_low) / cols,
+                           y_low + (np.arange(rows) + 0.5) * (y_high - y_low) / rows)
+
+
+def _coordinates(df, x, y):
+    return df[x].to_numpy(dtype=np.float64, na_value=np.nan), df[y].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _placed(df, x, y):
+    # Rows with a finite x and y: the points any renderer draws
+    xs, ys = _coordinates(df, x, y)
+    return np.isfinite(xs) & np.isfinite(ys)
+
+
+def raster_scatter(df, x, y, color, hover_name, title, colorscale):
+    xs, ys = _coordinates(df, x, y)
+    cs = df[color].to_numpy(dtype=np.float64, na_value=np.nan) if color else np.zeros(len(df))
+    labels = df[hover_name].astype(str).to_numpy()
+    placed = np.isfinite(xs) & np.isfinite(ys)
+    xs, ys, cs, labels = xs[placed], ys[placed], cs[placed], labels[placed]
+    ranges = _ranges(xs, ys)
+    png, (c_low, c_high) = density_png(xs, ys, cs, ranges, colorscale)
+    z, customdata, (x_centers, y_centers) = hover_grid(xs, ys, cs, labels, ranges)
+    (x_low, x_high), (y_low, y_high) = ranges
+
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=x_centers, y=y_centers, z=z, customdata=customdata,
+        opacity=0, showscale=False,
+        hovertemplate=(f"{x} ≈ %{{x:,.3s}}<br>{y} ≈ %{{y:,.3s}}<br>%{{z:,}} points"
+                       + (f"<br>mean {color}: %{{customdata[0]:,.1f}}" if color else "")
+                       + "<br>e.g. %{customdata[1]}<extra></extra>")
+    ))
+    if color:
+        # Colorbar for the color column; the trace itself draws nothing
+        fig.add_trace(go.Scatter(
+            x=[None], y=[None], mode='markers', hoverinfo='skip', showlegend=False,
+            marker=dict(colorscale=colorscale, cmin=c_low, cmax=c_high, color=[c_low],
+                        showscale=True, colorbar=dict(title=color))
+        ))
+    fig.add_layout_image(
+        source="data:image/png;base64," + base64.b64encode(png).decode(),
+        xref='x', yref='y', x=x_low, y=y_high, sizex=x_high - x_low, sizey=y_high - y_low,
+        sizing='stretch', layer='below'
+    )
+    fig.update_layout(title=title, xaxis=dict(title=x, range=[x_low, x_high]),
+                      yaxis=dict(title=y, range=[y_low, y_high]), plot_bgcolor='white')
+    return fig
+
+
+def scatter(df, x, y, color=None, size=None, hover_name=None, hover_data=None, title=None,
+            color_continuous_scale='Viridis'):
+    # px.scatter with the renderer picked by the number of points drawn
+    points = int(_placed(df, x, y).sum())
+    mode = render_mode(points)
+    if mode == 'raster':
+        fig = raster_scatter(df, x, y, color, hover_name or (hover_data or [x])[0], title, color_continuous_scale)
+    else:
+        fig = px.scatter(df, x=x, y=y, color=color, size=size, hover_name=hover_name, hover_data=hover_data,
+                         title=title, color_continuous_scale=color_continuous_scale, render_mode=mode)
+    # The raster has no marker size
+    fig.update_layout(meta={'render_mode': mode, 'points': points,
+                            'size_dropped': size if mode == 'raster' else None})
+    return fig
+
+
+def describe(figure):
+    # "12,345 points · WebGL · 1.2 MB sent" for a figure built by scatter
+    from figure_cache import FIGURE_CACHE
+
+    meta = figure.layout.meta or {}
+    nbytes = FIGURE_CACHE.json_bytes(figure)
+    if nbytes is None:
+        nbytes = len(figure.to_json())
+    size = f"{nbytes / 1e6:,.1f} MB" if nbytes >= 1e6 else f"{nbytes / 1e3:,.0f} KB"
+    dropped = f" · marker size ({meta['size_dropped']}) not shown" if meta.get('size_dropped') else ""
+    return f"{meta.get('points', 0):,} points · {MODES.get(meta.get('render_mode'), '?')} · {size} sent{dropped}"
@@ -0,0 +1,126 @@
+# Process-wide LRU cache of built Plotly figures.
+#
+# Entries are keyed by (section, chart id, data version, filter state), so
+# every session viewing the same data and filters shares one figure. Each
+# entry keeps the Figure together with its serialized JSON. The JSON is
+# what instrumentation.plotly_chart sends to the browser, so a warm rerun
+# doesn't serialize the figure again; it is also used for payload sizes.
+# Cached figures are shared and must not be modified.
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from instrumentation import timed
+
+CachedFigure = namedtuple('CachedFigure', ['figure', 'json', 'build_seconds'])
+
+
+class FigureCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # id(figure) -> serialized JSON of the cached figures
+        self._specs = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        # Build outside the lock; two sessions racing on the same key both
+        # build, and the later one simply replaces the earlier entry. Keys
+        # come from figure_key, so they start with (section, chart id).
+        start = time.perf_counter()
+        with timed('figure_build', *key[:2]):
+            figure = build()
+        with timed('figure_serialize', *key[:2]):
+            serialized = figure.to_json()
+        entry = CachedFigure(figure, serialized, time.perf_counter() - start)
+
+        with self._lock:
+            self.misses += 1
+            if key in self._entries:
+                self._forget(self._entries[key])
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._specs[id(figure)] = serialized
+            while len(self._entries) > self.max_entries:
+                self._forget(self._entries.popitem(last=False)[1])
+                self.evictions += 1
+        return entry
+
+    def _forget(self, entry):
+        self._specs.pop(id(entry.figure), None)
+
+    def spec(self, figure):
+        # Serialized JSON of a figure held by the cache, else None
+        with self._lock:
+            return self._specs.get(id(figure))
+
+    def json_bytes(self, figure):
+        # Serialized size of a figure held by the cache, else None
+        spec = self.spec(figure)
+        return None if spec is None else len(spec)
+
+    def invalidate(self, predicate):
+        # Drop every entry whose key matches, e.g. a stale data version
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                self._forget(self._entries.pop(key))
+        return len(stale)
+
+    def carry_over(self, old_version, new_version, keep):
+        # Re-key entries of old_version to new_version where keep(key) holds
+        # (their inputs did not change); the rest of old_version is dropped.
+        # Keys come from figure_key: (section, chart id, version, filters).
+        with self._lock:
+            kept = dropped = 0
+            for key in [key for key in self._entries if key[2] == old_version]:
+                entry = self._entries.pop(key)
+                if keep(key):
+                    self._entries[key[:2] + (new_version,) + key[3:]] = entry
+                    kept += 1
+                else:
+                    self._forget(entry)
+                    dropped += 1
+        return kept, dropped
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._specs.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'json_bytes': sum(len(e.json) for e in self._entries.values()),
+            }
+
+
+FIGURE_CACHE = FigureCache(int(os.environ.get('FIGURE_CACHE_SIZE', 256)))
+
+
+def figure_key(section, chart_id, data_version, filters=None):
+    return (section, chart_id, data_version, tuple(sorted((filters or {}).items())))
+
+
+def cached_figure(section, chart_id, data_version, build, filters=None):
+    # Returns the figure for this chart, building it only on a cache miss
+    return FIGURE_CACHE.get_or_build(figure_key(section, chart_id, data_version, filters), build).figure
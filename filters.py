@@ -0,0 +1,83 @@
+# Global sidebar filters.
+#
+# Year range, states, UNESCO-only and minimum annual tourists apply to every
+# section. They are compiled into pyarrow dataset expressions and evaluated
+# by the scan over the columnar store, not by pandas on each rerun:
+# - state terms prune the State partitions of cultural_sites,
+#   sustainability_data and footfall_daily;
+# - year terms prune the Year partitions of footfall_daily;
+# - numeric terms skip row groups whose statistics rule them out.
+# A filtered view gets its own data version, so every cache keyed by data
+# version (derived metrics, figures, map layers) keeps it apart from the
+# unfiltered data.
+import hashlib
+from collections import namedtuple
+from datetime import date
+
+import pyarrow.dataset as ds
+
+Filters = namedtuple('Filters', [
+    'years',          # (first, last) inclusive, or None for the whole series
+    'states',         # sorted tuple of state names; empty for all
+    'unesco_only',    # only sites with at least one UNESCO site
+    'min_tourists',   # minimum Annual_Tourists per site
+])
+NO_FILTERS = Filters(None, (), False, 0)
+
+
+def site_expression(filters):
+    terms = []
+    if filters.states:
+        terms.append(ds.field('State').isin(list(filters.states)))
+    if filters.unesco_only:
+        terms.append(ds.field('UNESCO_Sites') > 0)
+    if filters.min_tourists:
+        terms.append(ds.field('Annual_Tourists') >= filters.min_tourists)
+    return _conjunction(terms)
+
+
+def state_expression(filters):
+    return _conjunction([ds.field('State').isin(list(filters.states))] if filters.states else [])
+
+
+def _conjunction(terms):
+    expr = None
+    for term in terms:
+        expr = term if expr is None else expr & term
+    return expr
+
+
+def footfall_window(filters):
+    # (start, end) dates for footfall queries; None where unbounded
+    if filters.years is None:
+        return None, None
+    first, last = filters.years
+    return date(first, 1, 1), date(last, 12, 31)
+
+
+def version(data_version, filters):
+    # Data version of a filtered view
+    if filters == NO_FILTERS:
+        return data_version
+    return data_version + '-' + hashlib.sha256(repr(tuple(filters)).encode()).hexdigest()[:8]
+
+
+def sidebar_filters(states, year_bounds, max_tourists):
+    # Filter widgets in the sidebar; returns the Filters they describe, with
+    # defaults normalized away so an untouched bar is NO_FILTERS
+    import streamlit as st
+
+    st.sidebar.markdown("### Filters")
+    years = None
+    if year_bounds is not None:
+        first, last = year_bounds
+        picked = st.sidebar.slider("Years", first, last, (first, last), key='filter_years',
+                                   help="Daily footfall and the seasonality built from it")
+        years = None if picked == (first, last) else tuple(picked)
+    picked_states = st.sidebar.multiselect("States", states, key='filter_states',
+                                           help="Sites, footfall and sustainability data; empty for all")
+    unesco_only = st.sidebar.checkbox("UNESCO sites only", key='filter_unesco')
+    step = 100_000
+    min_tourists = st.sidebar.slider("Minimum annual tourists", 0, -(-int(max_tourists) // step) * step, 0,
+                                     step=step, key='filter_min_tourists')
+    return Filters(years, tuple(sorted(picked_states)), unesco_only, min_tourists)
@@ -0,0 +1,47 @@
+# Vectorized number formatting for labels and tables.
+#
+# Whole columns are formatted at once: the digits of every value are laid
+# out in one byte matrix with the group separators in place, shifted left
+# by each value's length and viewed as fixed-width strings. There is no
+# per-value Python call.
+import numpy as np
+
+MAX_DIGITS = 19
+POWERS = 10 ** np.arange(MAX_DIGITS, dtype=np.uint64)
+
+
+def _grouped_digits(whole):
+    # Non-negative integers -> "1,234,567" as a byte-string array
+    n_digits = np.maximum(np.searchsorted(POWERS, whole, side='right'), 1)
+    most = int(n_digits.max(initial=1))
+    width = most + (most - 1) // 3
+    length = n_digits + (n_digits - 1) // 3
+
+    # Right-aligned: digit k (0 = units) sits k + k // 3 places from the end
+    chars = np.full((len(whole), width), ord(','), dtype=np.uint8)
+    rest = whole.copy()
+    for k in range(most):
+        chars[:, width - 1 - (k + k // 3)] = rest % 10 + ord('0')
+        rest //= 10
+
+    # Shift each row left by its unused width; trailing zeros end the string
+    cols = np.arange(width)[None, :] + (width - length)[:, None]
+    chars = np.take_along_axis(chars, np.minimum(cols, width - 1), axis=1)
+    chars[cols >= width] = 0
+    return chars.view(f'S{width}').ravel()
+
+
+def thousands(values, prefix='', decimals=0):
+    # Numbers -> "1,234,567" labels (object array, so "+" concatenates
+    # element-wise); decimals > 0 keeps that many fractional digits
+    values = np.asarray(values, dtype=np.float64 if decimals else np.int64)
+    scale = 10 ** decimals
+    scaled = np.rint(np.abs(values) * scale).astype(np.uint64) if decimals else np.abs(values).astype(np.uint64)
+    whole, fraction = np.divmod(scaled, np.uint64(scale))
+
+    text = _grouped_digits(whole).astype(str)
+    if decimals:
+        text = np.strings.add(np.strings.add(text, '.'), np.strings.zfill(fraction.astype(str), decimals))
+    if prefix or (values < 0).any():
+        text = np.strings.add(np.strings.add(np.where(values < 0, '-', ''), prefix), text)
+    return np.asarray(text, dtype=object)
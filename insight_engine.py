@@ -0,0 +1,311 @@
+# Insight statements computed from the loaded data.
+#
+# The Insights section used to show fixed claims ("Top 5 states receive 70%
+# of cultural tourists"). They are now computed from the frames of the data
+# version on screen, filtered views included:
+# - concentration: top-k shares and the Herfindahl index of tourists by
+#   state, and of the monthly tourism index by month;
+# - correlations: one correlation matrix over every numeric column of the
+#   state-level table (sites aggregated by state, joined with the
+#   sustainability scores), with its strongest pairs;
+# - movers: states whose footfall changed most over the last year of the
+#   daily series against the year before;
+# - anomalies: values far from their column's median by a robust (median
+#   absolute deviation) z-score, over all state-level columns at once;
+# - art forms: the leaders and laggards of the scored art form table, for
+#   the Art Forms section's insight box.
+# Every statistic is one vectorized pass over a NumPy matrix; the section
+# caches the result per data version. insight_box_html renders a list of
+# statements as the dashboard's insight box, for the sections and report.
+import html
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import filters
+import timeseries
+from seasonality import footfall_matrix
+
+TOP_STATES = 5
+PEAK_MONTHS = 4
+TOP_PAIRS = 5
+TOP_MOVERS = 3
+# |robust z| from which a value counts as an anomaly
+ANOMALY_Z = 3.5
+# Rows a correlation needs to be reported
+MIN_ROWS = 5
+# Numeric columns that are positions, not measures
+COORDINATES = {'Latitude', 'Longitude'}
+# 1 / Phi^-1(3/4): makes the MAD comparable to a standard deviation
+MAD_SCALE = 1.4826
+
+Insights = namedtuple('Insights', [
+    'opportunities',      # [(headline, statement)]
+    'challenges',         # [(headline, statement)]
+    'success_metrics',    # [(label, value, target, help)]
+    'state_table',        # the state-level frame the statistics ran on
+    'correlations',       # correlation matrix over its numeric columns
+    'top_pairs',          # strongest correlations, one row per pair
+    'movers',             # footfall change per state, largest first
+    'anomalies',          # one row per flagged (state, column)
+])
+
+
+def concentration(values, k):
+    # (share of the k largest values, Herfindahl index) of a non-negative
+    # series
+    values = np.sort(np.asarray(values, dtype=np.float64))[::-1]
+    total = values.sum()
+    if total <= 0:
+        return 0.0, 0.0
+    shares = values / total
+    return float(shares[:k].sum()), float((shares ** 2).sum())
+
+
+def state_table(cultural_sites, sustainability_data):
+    # One row per state: site totals, derived ratios and, where a state has
+    # them, its sustainability scores
+    states = cultural_sites.groupby('State', observed=True, sort=True).agg(
+        Sites=('State', 'size'),
+        UNESCO_Sites=('UNESCO_Sites', 'sum'),
+        Art_Forms=('Art_Forms', 'sum'),
+        Annual_Tourists=('Annual_Tourists', 'sum'),
+        Cultural_Budget=('Cultural_Budget', 'sum'),
+    ).astype(np.float64)
+    states['Tourists_per_Art_Form'] = states['Annual_Tourists'] / states['Art_Forms'].where(states['Art_Forms'] > 0)
+    states['Budget_per_Million_Tourists'] = (states['Cultural_Budget']
+                                             / (states['Annual_Tourists'] / 1e6).where(states['Annual_Tourists'] > 0))
+    scores = sustainability_data.assign(State=sustainability_data['State'].astype(str)).set_index('State')
+    states.index = states.index.astype(str)
+    return states.join(scores.astype(np.float64), how='left')
+
+
+def measure_columns(table):
+    # Numeric, non-coordinate columns with at least one value; a filter can
+    # leave the sustainability scores empty
+    return [c for c in table.columns
+            if c not in COORDINATES and pd.api.types.is_numeric_dtype(table[c]) and table[c].notna().any()]
+
+
+def correlation_matrix(table):
+    # Pearson correlation of every pair of numeric columns, each over the
+    # rows where both are present
+    columns = measure_columns(table)
+    values = table[columns].to_numpy(dtype=np.float64)
+    present = ~np.isnan(values)
+    # Centered first, so the sums of squares don't cancel for large values
+    filled = np.where(present, values - np.nanmean(values, axis=0), 0.0)
+    both = present.T.astype(np.float64) @ present
+    # Pairwise sums over shared rows, all pairs at once
+    sum_x = filled.T @ present
+    sum_xx = (filled ** 2).T @ present
+    sum_xy = filled.T @ filled
+    n = np.maximum(both, 1)
+    cov = sum_xy / n - (sum_x / n) * (sum_x.T / n)
+    var_x = sum_xx / n - (sum_x / n) ** 2
+    denominator = np.sqrt(np.clip(var_x, 0, None) * np.clip(var_x.T, 0, None))
+    corr = np.divide(cov, denominator, out=np.full_like(cov, np.nan), where=(denominator > 1e-12) & (both >= MIN_ROWS))
+    return pd.DataFrame(np.clip(corr, -1, 1), index=columns, columns=columns), pd.DataFrame(both, index=columns,
+                                                                                            columns=columns)
+
+
+def top_pairs(corr, rows, k=TOP_PAIRS):
+    i, j = np.triu_indices(len(corr), k=1)
+    r = corr.to_numpy()[i, j]
+    keep = ~np.isnan(r)
+    i, j, r = i[keep], j[keep], r[keep]
+    order = np.argsort(-np.abs(r), kind='stable')[:k]
+    return pd.DataFrame({
+        'Column_A': corr.columns[i[order]],
+        'Column_B': corr.columns[j[order]],
+        'R': r[order].round(2),
+        'Rows': rows.to_numpy()[i[order], j[order]].astype(int),
+    })
+
+
+def anomalies(table, threshold=ANOMALY_Z):
+    # Robust z-score of every numeric value against its column
+    columns = measure_columns(table)
+    values = table[columns].to_numpy(dtype=np.float64)
+    median = np.nanmedian(values, axis=0)
+    mad = np.nanmedian(np.abs(values - median), axis=0) * MAD_SCALE
+    z = np.divide(values - median, mad, out=np.zeros_like(values), where=mad > 0)
+    z = np.where(np.isnan(values), 0.0, z)
+    rows, cols = np.nonzero(np.abs(z) >= threshold)
+    order = np.argsort(-np.abs(z[rows, cols]), kind='stable')
+    rows, cols = rows[order], cols[order]
+    return pd.DataFrame({
+        'State': table.index[rows],
+        'Column': np.asarray(columns, dtype=object)[cols],
+        'Value': values[rows, cols],
+        'Median': median[cols],
+        'Z': z[rows, cols].round(1),
+    })
+
+
+def footfall_movers(data):
+    # Footfall of the last 365 days of the series against the 365 before,
+    # per state; empty without two years of footfall
+    empty = pd.DataFrame(columns=['State', 'Last_Year', 'Previous_Year', 'Change'])
+    if not timeseries.footfall_available(data.store.path):
+        return empty
+    start, end = filters.footfall_window(data.filters)
+    states = None
+    if data.filters != filters.NO_FILTERS:
+        states = tuple(sorted(data.cultural_sites['State'].unique()))
+    labels, _, matrix = footfall_matrix('State', start, end, data.store.path, states)
+    if matrix.shape[1] < 730:
+        return empty
+    last = matrix[:, -365:].sum(axis=1)
+    previous = matrix[:, -730:-365].sum(axis=1)
+    change = np.divide(last - previous, previous, out=np.full(len(last), np.nan), where=previous > 0)
+    movers = pd.DataFrame({'State': labels, 'Last_Year': last, 'Previous_Year': previous, 'Change': change})
+    return movers.dropna(subset=['Change']).sort_values('Change', key=np.abs, ascending=False, kind='stable')
+
+
+def art_form_insights(art_forms):
+    # [(art form, statement)] from the scored art form table
+    if art_forms.empty:
+        return []
+    ranked = {column: art_forms.sort_values(column, ascending=False, kind='stable')['Art_Form']
+              for column in ['Practitioners', 'Revenue_Crores', 'Tourism_Impact']}
+    rows = art_forms.set_index('Art_Form')
+    items = []
+
+    top_revenue = ranked['Revenue_Crores'].iloc[0]
+    revenue = f"revenue generation (₹{rows.loc[top_revenue, 'Revenue_Crores']:,.0f} cr)"
+    if ranked['Practitioners'].iloc[0] == top_revenue:
+        items.append((top_revenue, f"leads in both practitioner base "
+                      f"({rows.loc[top_revenue, 'Practitioners']:,.0f}) and {revenue}"))
+    else:
+        top_base = ranked['Practitioners'].iloc[0]
+        items.append((top_revenue, f"leads in {revenue}"))
+        items.append((top_base, f"has the largest practitioner base ({rows.loc[top_base, 'Practitioners']:,.0f})"))
+
+    top_impact = ranked['Tourism_Impact'].iloc[0]
+    items.append((top_impact, f"has the highest tourism impact score "
+                  f"({rows.loc[top_impact, 'Tourism_Impact']:.0f}/100)"))
+
+    # Strong appeal from a small base: above-median impact, below-median
+    # practitioners
+    appeal = art_forms[(art_forms['Tourism_Impact'] > art_forms['Tourism_Impact'].median())
+                       & (art_forms['Practitioners'] < art_forms['Practitioners'].median())]
+    if not appeal.empty:
+        best = appeal.sort_values('Tourism_Impact', ascending=False, kind='stable').iloc[0]
+        items.append((best['Art_Form'], f"shows strong tourism appeal ({best['Tourism_Impact']:.0f}/100) despite a "
+                      f"smaller practitioner base ({best['Practitioners']:,.0f})"))
+
+    lowest = ranked['Tourism_Impact'].iloc[-1]
+    if len(art_forms) > 1:
+        items.append((lowest, f"has the lowest tourism impact ({rows.loc[lowest, 'Tourism_Impact']:.0f}/100), with a "
+                      f"performance score of {rows.loc[lowest, 'Performance_Score']:.0f}"))
+    return items
+
+
+def _names(values, limit=3):
+    values = list(values)[:limit]
+    return ", ".join(values[:-1]) + " and " + values[-1] if len(values) > 1 else "".join(values)
+
+
+def _label(column):
+    return column.replace('_', ' ').lower()
+
+
+def compute_insights(data, metrics):
+    states = state_table(data.cultural_sites, data.sustainability_data)
+    corr, rows = correlation_matrix(states)
+    pairs = top_pairs(corr, rows)
+    flagged = anomalies(states)
+    movers = footfall_movers(data)
+
+    tourists = states['Annual_Tourists']
+    top_share, hhi = concentration(tourists, TOP_STATES)
+    n_top = min(TOP_STATES, len(states))
+    trends = metrics.tourism_trends
+    season_share, _ = concentration(trends['Cultural_Tourism'], PEAK_MONTHS)
+    peak_months = (trends.sort_values('Cultural_Tourism', ascending=False, kind='stable')['Month']
+                   .head(PEAK_MONTHS).sort_values())
+
+    opportunities = []
+    challenges = []
+
+    # High cultural endowment, few visitors
+    potential = states['UNESCO_Sites'] * 10 + states['Art_Forms'] * 2
+    hidden = states[(potential >= potential.median()) & (tourists < tourists.median())]
+    if not hidden.empty:
+        hidden = hidden.assign(Potential=potential).sort_values('Potential', ascending=False)
+        ratio = hidden['Annual_Tourists'].mean() / tourists.mean()
+        opportunities.append((_names(hidden.index), f"above-median cultural assets ({hidden['Art_Forms'].sum():,.0f} "
+                              f"art forms) but only {ratio:.0%} of the average state's tourists"))
+
+    if metrics.off_peak_months:
+        off_peak = trends.loc[trends['Off_Peak'], 'Cultural_Tourism']
+        spare = 1 - off_peak.mean() / trends['Cultural_Tourism'].max()
+        opportunities.append(("Off-Peak Promotion", f"{spare:.0%} below peak demand during "
+                              f"{_names(metrics.off_peak_months, 12)}"))
+
+    best_art = metrics.art_forms.sort_values('Performance_Score', ascending=False, kind='stable').iloc[0]
+    per_practitioner = best_art['Revenue_Crores'] * 1e7 / max(best_art['Practitioners'], 1)
+    opportunities.append((f"{best_art['Art_Form']} Tourism", f"highest performance score among art forms "
+                          f"({best_art['Performance_Score']:.0f}), ₹{per_practitioner:,.0f} revenue per practitioner"))
+
+    if len(movers):
+        mover = movers.iloc[0]
+        direction = "grew" if mover['Change'] > 0 else "fell"
+        sample = timeseries.SAMPLE_TAG if timeseries.footfall_is_sample(data.store.path) else ""
+        opportunities.append((f"{mover['State']} Momentum", f"footfall {direction} {abs(mover['Change']):.0%} "
+                              f"over the last year of the daily series{sample}"))
+    elif len(pairs):
+        pair = pairs.iloc[0]
+        opportunities.append(("Strongest Link", f"{_label(pair['Column_A'])} and {_label(pair['Column_B'])} "
+                              f"move together (r = {pair['R']:+.2f} across {pair['Rows']} states)"))
+
+    # With TOP_STATES states or fewer the top states are all of them
+    spread = len(states) > TOP_STATES
+    if spread:
+        challenges.append(("Over-tourism", f"top {n_top} states receive {top_share:.0%} of cultural tourists "
+                           f"(Herfindahl index {hhi:.2f})"))
+    challenges.append(("Seasonal Concentration", f"{season_share:.0%} of the yearly tourism index falls in the "
+                       f"{PEAK_MONTHS} peak months ({_names(peak_months, PEAK_MONTHS)})"))
+    if 'Local_Employment' in states and states['Local_Employment'].notna().any():
+        employment = states['Local_Employment'].dropna()
+        challenges.append(("Local Employment", f"averages {employment.mean():.0f}% across {len(employment)} states, "
+                           f"lowest in {employment.idxmin()} ({employment.min():.0f}%)"))
+    weak_art = metrics.art_forms[metrics.art_forms['Performance_Score'] < 50]
+    if not weak_art.empty:
+        share = len(weak_art) / len(metrics.art_forms)
+        challenges.append(("Art Form Decline", f"{share:.0%} of tracked art forms score below 50 "
+                           f"({_names(weak_art.sort_values('Performance_Score')['Art_Form'])})"))
+    if len(flagged):
+        anomaly = flagged.iloc[0]
+        challenges.append((f"Outlier: {anomaly['State']}", f"{_label(anomaly['Column'])} of "
+                           f"{anomaly['Value']:,.1f} against a median of {anomaly['Median']:,.1f}"))
+
+    # The baseline metrics and targets; only the current values are
+    # computed, and "n/a" stands where the data can't give one
+    success_metrics = [
+        ("Tourism Distribution", f"{top_share * 100:.0f}:{(1 - top_share) * 100:.0f}" if spread else "n/a",
+         "Target: 50:50", f"Current split between top {n_top} vs other states" if spread
+         else f"Needs more than {TOP_STATES} states; the current view has {len(states)}"),
+        # The data has no revenue by recipient to take a share of
+        ("Community Revenue Share", "n/a", "Target: 60%",
+         "Percentage of tourism revenue reaching communities (not in the loaded data)"),
+        ("Seasonal Variation", f"{season_share:.0%}", "Target: 30%",
+         f"Percentage of tourists during peak {PEAK_MONTHS} months (share of the yearly tourism index)"),
+    ]
+    return Insights(opportunities, challenges, success_metrics, states, corr, pairs, movers, flagged)
+
+
+def insight_box_html(title, items):
+    # (headline, text) statements as the styled insight box; both escaped
+    rows = "\n".join(f"                    <li><strong>{html.escape(headline)}</strong>: {html.escape(text)}</li>"
+                     for headline, text in items)
+    return f"""
+            <div class="insight-box">
+                <h4>{html.escape(title)}</h4>
+                <ul>
+{rows}
+                </ul>
+            </div>
+            """
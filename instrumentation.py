@@ -0,0 +1,207 @@
+# Opt-in timers and payload counters for the request path.
+#
+# With DASHBOARD_INSTRUMENTATION=1, each stage of a rerun is timed: data
+# loading, derived-metric transforms, figure builds and serialization, and
+# every chart and map render. The bytes each chart or map layer sends are
+# counted too. The numbers show in the ?debug=1 sidebar panel. When
+# DASHBOARD_METRICS_PORT is also set, they are served as Prometheus text at
+# http://127.0.0.1:<port>/metrics. When disabled, every hook is a no-op.
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get('DASHBOARD_INSTRUMENTATION', '') not in ('', '0')
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = os.environ.get('DASHBOARD_METRICS_PORT')
+PREFIX = 'dashboard'
+LABELS = ('stage', 'section', 'name')
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (stage, section, name) -> [count, total seconds, max seconds]
+        self.timings = {}
+        # (stage, section, name) -> [count, total bytes, last bytes]
+        self.payloads = {}
+
+    def observe(self, stage, seconds, section='', name=''):
+        with self._lock:
+            entry = self.timings.setdefault((stage, section, name), [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def add_payload(self, stage, nbytes, section='', name=''):
+        with self._lock:
+            entry = self.payloads.setdefault((stage, section, name), [0, 0, 0])
+            entry[0] += 1
+            entry[1] += nbytes
+            entry[2] = nbytes
+
+    def snapshot(self):
+        with self._lock:
+            return ({k: list(v) for k, v in self.timings.items()},
+                    {k: list(v) for k, v in self.payloads.items()})
+
+    def clear(self):
+        with self._lock:
+            self.timings.clear()
+            self.payloads.clear()
+
+
+RECORDER = Recorder()
+
+
+@contextmanager
+def timed(stage, section='', name=''):
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        RECORDER.observe(stage, time.perf_counter() - start, section, name)
+
+
+def payload(stage, nbytes, section='', name=''):
+    if ENABLED:
+        RECORDER.add_payload(stage, nbytes, section, name)
+
+
+# st.plotly_chart arguments the cached-spec path handles
+SPEC_ARGUMENTS = {'use_container_width', 'width', 'height', 'theme', 'key', 'config'}
+
+
+def _chart_from_spec(spec, figure, use_container_width=None, width='stretch', height='content',
+                     theme='streamlit', key=None, config=None):
+    # What st.plotly_chart does for a chart without selections, with the
+    # JSON taken from the figure cache instead of serializing the figure.
+    # Uses Streamlit internals (checked against 1.65).
+    import json
+
+    import streamlit as st
+    from streamlit.elements.lib.form_utils import current_form_id
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+    from streamlit.elements.lib.utils import compute_and_register_element_id, to_key
+    from streamlit.elements.plotly_chart import _resolve_content_height, _resolve_content_width
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart
+
+    if use_container_width is not None:
+        width = 'stretch' if use_container_width else width if isinstance(width, int) else 'content'
+    dg = st._main
+    proto = PlotlyChart()
+    proto.theme = theme or ""
+    proto.form_id = current_form_id(dg)
+    proto.spec = spec
+    proto.config = json.dumps(config or {})
+    proto.id = compute_and_register_element_id(
+        'plotly_chart', user_key=to_key(key), key_as_main_identity=False, dg=dg,
+        plotly_spec=proto.spec, plotly_config=proto.config, selection_mode=('points', 'box', 'lasso'),
+        is_selection_activated=False, theme=theme, width=width, height=height, alt=None)
+    layout = LayoutConfig(width=_resolve_content_width(width, figure), height=_resolve_content_height(height, figure))
+    return dg._enqueue('plotly_chart', proto, layout_config=layout)
+
+
+def plotly_chart(figure, section, chart_id, **kwargs):
+    # st.plotly_chart, plus its render time and figure JSON size. Figures
+    # from the figure cache are sent as their cached JSON.
+    import streamlit as st
+    from figure_cache import FIGURE_CACHE
+
+    spec = FIGURE_CACHE.spec(figure)
+    with timed('chart_render', section, chart_id):
+        if spec is not None and set(kwargs) <= SPEC_ARGUMENTS:
+            result = _chart_from_spec(spec, figure, **kwargs)
+        else:
+            result = st.plotly_chart(figure, **kwargs)
+    if ENABLED:
+        payload('chart', len(figure.to_json()) if spec is None else len(spec), section, chart_id)
+    return result
+
+
+def timing_rows():
+    timings, _ = RECORDER.snapshot()
+    return [{'stage': stage, 'section': section, 'name': name, 'count': count,
+             'mean_ms': round(total / count * 1000, 2), 'max_ms': round(peak * 1000, 2),
+             'total_s': round(total, 3)}
+            for (stage, section, name), (count, total, peak) in sorted(timings.items())]
+
+
+def payload_rows():
+    _, payloads = RECORDER.snapshot()
+    return [{'stage': stage, 'section': section, 'name': name, 'count': count,
+             'last_bytes': last, 'mean_bytes': total // count}
+            for (stage, section, name), (count, total, last) in sorted(payloads.items())]
+
+
+def _labels(key):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in key)
+    return '{' + ','.join(f'{label}="{value}"' for label, value in zip(LABELS, escaped)) + '}'
+
+
+def prometheus_text():
+    from figure_cache import FIGURE_CACHE
+
+    timings, payloads = RECORDER.snapshot()
+    lines = [f"# HELP {PREFIX}_stage_seconds Time spent per dashboard stage",
+             f"# TYPE {PREFIX}_stage_seconds summary"]
+    for key, (count, total, _) in sorted(timings.items()):
+        lines += [f"{PREFIX}_stage_seconds_count{_labels(key)} {count}",
+                  f"{PREFIX}_stage_seconds_sum{_labels(key)} {total:.6f}"]
+    lines += [f"# HELP {PREFIX}_stage_seconds_max Slowest observation per dashboard stage",
+              f"# TYPE {PREFIX}_stage_seconds_max gauge"]
+    lines += [f"{PREFIX}_stage_seconds_max{_labels(key)} {peak:.6f}"
+              for key, (_, _, peak) in sorted(timings.items())]
+
+    lines += [f"# HELP {PREFIX}_payload_bytes Bytes sent to the browser per chart or map",
+              f"# TYPE {PREFIX}_payload_bytes summary"]
+    for key, (count, total, _) in sorted(payloads.items()):
+        lines += [f"{PREFIX}_payload_bytes_count{_labels(key)} {count}",
+                  f"{PREFIX}_payload_bytes_sum{_labels(key)} {total}"]
+
+    stats = FIGURE_CACHE.stats()
+    for counter in ('hits', 'misses', 'evictions'):
+        lines += [f"# TYPE {PREFIX}_figure_cache_{counter}_total counter",
+                  f"{PREFIX}_figure_cache_{counter}_total {stats[counter]}"]
+    for gauge in ('entries', 'json_bytes'):
+        lines += [f"# TYPE {PREFIX}_figure_cache_{gauge} gauge",
+                  f"{PREFIX}_figure_cache_{gauge} {stats[gauge]}"]
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = prometheus_text().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def ensure_exporter(port=METRICS_PORT, host=METRICS_HOST):
+    # Starts the /metrics server once per process; returns it, or None when
+    # instrumentation or the port is not configured
+    global _exporter
+    if not ENABLED or not port:
+        return None
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            _exporter.daemon_threads = True
+            threading.Thread(target=_exporter.serve_forever, name='metrics-exporter', daemon=True).start()
+    return _exporter
@@ -0,0 +1,344 @@
+# Cultural circuit itineraries.
+#
+# Plans a multi-day route through the sites that best match a set of
+# interests within a time budget. A route only draws on a candidate set of
+# at most MAX_CANDIDATES sites: the best-scored ones plus the scored sites
+# nearest the start, found with the spatial index. Great-circle distances
+# between every pair of candidates are computed with vectorized haversine,
+# in blocks of rows. They are saved as a .npy file under data/cache/, keyed
+# by data version and candidate set, which later requests and processes
+# memory-map instead of recomputing.
+#
+# Routing is heuristic:
+# 1. Greedy insertion adds the site with the most interest per added hour
+#    (visit plus detour) at its cheapest position, while the budget allows.
+# 2. 2-opt untangles the route, and the time it frees is offered to more
+#    insertions.
+# 3. The route is cut into days; if that needs more days than allowed,
+#    the weakest stops are dropped.
+#
+# Plans are memoized per data version and request.
+#
+#   python itinerary.py --days 5 --interests heritage arts --start Kerala
+import argparse
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+import numpy as np
+
+import data_store
+from spatial_index import SiteIndex, haversine_km
+
+MATRIX_DIR = data_store.DATA_DIR / "cache" / "distances"
+# Sites a route can draw on; the matrix is this size squared (4 MB)
+MAX_CANDIDATES = 1000
+# Rows of the distance matrix computed per block
+BLOCK_ROWS = 1024
+KEEP_MATRICES = 32
+PLAN_CACHE_ENTRIES = 128
+
+# Road distance per great-circle km, and average road speed
+ROAD_FACTOR = 1.3
+SPEED_KMH = 50.0
+VISIT_HOURS = 3.0
+DAY_HOURS = 8.0
+
+# Interest -> (label, column); a site scores its share of the column's
+# maximum. The offbeat interest favours sites with fewer tourists.
+INTERESTS = {
+    'heritage': ("UNESCO heritage", 'UNESCO_Sites'),
+    'arts': ("Living art forms", 'Art_Forms'),
+    'offbeat': ("Off the beaten path", 'Annual_Tourists'),
+}
+
+Itinerary = namedtuple('Itinerary', [
+    'stops',          # one row per stop, in visiting order (see route_frame)
+    'days',           # days the route needs
+    'total_km',       # road distance
+    'travel_hours',
+    'score',          # summed interest score of the stops
+])
+
+
+def interest_scores(sites, interests):
+    scores = np.zeros(len(sites))
+    for interest in interests:
+        values = sites[INTERESTS[interest][1]].to_numpy(dtype=np.float64)
+        share = values / max(values.max(initial=0.0), 1.0)
+        scores += 1.0 - share if interest == 'offbeat' else share
+    return scores
+
+
+def travel_hours(km):
+    return km * ROAD_FACTOR / SPEED_KMH
+
+
+def candidate_sites(sites, scores, start, limit=MAX_CANDIDATES):
+    # Positions a route can use, start first: every scored site when there
+    # are few, otherwise the best-scored half of the limit plus the scored
+    # sites nearest the start
+    scored = np.flatnonzero(scores > 0)
+    if len(scored) < limit:
+        picks = scored
+    else:
+        best = scored[np.argsort(-scores[scored], kind='stable')[:limit // 2]]
+        index = SiteIndex.from_sites(sites)
+        near, _ = index.nearest(index.lat[start], index.lon[start], limit - 1 - len(best), mask=scores > 0)
+        picks = np.union1d(best, near)
+    return np.concatenate([[start], picks[picks != start]]).astype(np.int64)
+
+
+def distance_matrix_file(lat, lon, path, block_rows=BLOCK_ROWS):
+    # Writes the float32 matrix block by block, so only one block is in
+    # memory at a time, then swaps the finished file into place. The
+    # temporary name is unique, so processes building the same matrix
+    # don't write into one file.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix=".tmp")
+    os.close(fd)
+    try:
+        n = len(lat)
+        matrix = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float32, shape=(n, n))
+        for start in range(0, n, block_rows):
+            stop = min(start + block_rows, n)
+            matrix[start:stop] = haversine_km(lat[start:stop, None], lon[start:stop, None],
+                                              lat[None, :], lon[None, :])
+        matrix.flush()
+        del matrix
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def _prune_matrices(keep=KEEP_MATRICES):
+    files = sorted(MATRIX_DIR.glob("*.npy"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in files[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def _insertion_costs(matrix, route, candidates):
+    # (cheapest added km, position to insert at) for each candidate. The
+    # route is an open path, so a site can also be appended at the end.
+    rows = matrix[route][:, candidates]
+    if len(route) > 1:
+        base = matrix[route[:-1], route[1:]]
+        detours = rows[:-1] + rows[1:] - base[:, None]
+        detours = np.vstack([detours, rows[-1:]])
+    else:
+        detours = rows
+    at = np.argmin(detours, axis=0)
+    return detours[at, np.arange(len(candidates))], at + 1
+
+
+def insert_sites(matrix, route, scores, budget_hours):
+    # Greedy: the unrouted site with the best score per added hour that
+    # still fits, until none does
+    route = list(route)
+    used = route_hours(matrix, route)
+    unrouted = np.setdiff1d(np.flatnonzero(scores > 0), route)
+    while len(unrouted):
+        detour_km, at = _insertion_costs(matrix, np.asarray(route), unrouted)
+        cost = VISIT_HOURS + travel_hours(detour_km)
+        fits = used + cost <= budget_hours
+        if not fits.any():
+            break
+        ratio = np.where(fits, scores[unrouted] / cost, -np.inf)
+        best = int(np.argmax(ratio))
+        route.insert(int(at[best]), int(unrouted[best]))
+        used += float(cost[best])
+        unrouted = np.delete(unrouted, best)
+    return route
+
+
+def two_opt(matrix, route):
+    # Reverses the segment with the largest saving until none saves
+    # anything; the first stop stays first. Returns (route, improved).
+    route = np.asarray(route)
+    r = len(route)
+    if r < 3:
+        return route.tolist(), False
+    # Distances between the route's stops, plus a zero-cost node after the
+    # last one so the open end needs no special case
+    sub = np.zeros((r + 1, r + 1))
+    i, j = np.triu_indices(r, k=1)
+    keep = i >= 1
+    i, j = i[keep], j[keep]
+    improved = False
+    for _ in range(r * r):
+        sub[:r, :r] = matrix[np.ix_(route, route)]
+        gains = sub[i - 1, i] + sub[j, j + 1] - sub[i - 1, j] - sub[i, j + 1]
+        best = int(np.argmax(gains))
+        if gains[best] <= 1e-6:
+            break
+        route[i[best]:j[best] + 1] = route[i[best]:j[best] + 1][::-1]
+        improved = True
+    return route.tolist(), improved
+
+
+def leg_km(matrix, route):
+    route = np.asarray(route)
+    return np.concatenate([[0.0], matrix[route[:-1], route[1:]]])
+
+
+def route_hours(matrix, route):
+    return float(travel_hours(leg_km(matrix, route)).sum()) + VISIT_HOURS * len(route)
+
+
+def split_days(matrix, route, day_hours=DAY_HOURS):
+    # Day each stop is visited on: a day ends when the next leg and visit
+    # would not fit, and a leg longer than a day takes several
+    hours = travel_hours(leg_km(matrix, route)) + VISIT_HOURS
+    days = np.empty(len(route), dtype=np.int64)
+    day, used = 1, 0.0
+    for k, h in enumerate(hours):
+        if used > 0 and used + h > day_hours:
+            day, used = day + 1, 0.0
+        used += h
+        while used > day_hours:
+            day, used = day + 1, used - day_hours
+        days[k] = day
+    return days
+
+
+def plan_route(matrix, scores, start, days, day_hours=DAY_HOURS):
+    budget = days * day_hours
+    route = insert_sites(matrix, [start], scores, budget)
+    while True:
+        route, improved = two_opt(matrix, route)
+        grown = insert_sites(matrix, route, scores, budget)
+        if not improved or len(grown) == len(route):
+            route = grown
+            break
+        route = grown
+    # Cutting into days wastes the end of each day; drop the weakest stops
+    # until the route fits
+    while len(route) > 1 and split_days(matrix, route, day_hours)[-1] > days:
+        weakest = 1 + int(np.argmin(scores[route[1:]]))
+        del route[weakest]
+        route, _ = two_opt(matrix, route)
+    return route
+
+
+def route_frame(sites, matrix, route, scores, day_hours=DAY_HOURS):
+    legs = leg_km(matrix, route) * ROAD_FACTOR
+    stops = sites.iloc[route].reset_index(drop=True)
+    stops.insert(0, 'Day', split_days(matrix, route, day_hours))
+    stops.insert(1, 'Stop', np.arange(1, len(route) + 1))
+    return stops.assign(
+        Distance_Km=legs.round(1),
+        Travel_Hours=(legs / SPEED_KMH).round(1),
+        Visit_Hours=VISIT_HOURS,
+        Interest_Score=scores[route].round(2),
+    )
+
+
+class Planner:
+    # Distance matrices (memory-mapped, per data version and candidate set)
+    # and memoized plans, least recently used evicted first
+    def __init__(self, max_plans=PLAN_CACHE_ENTRIES):
+        self.max_plans = max_plans
+        self._lock = threading.Lock()
+        self._matrices = OrderedDict()
+        self._plans = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def matrix(self, sites, data_version, candidates):
+        key = f"{data_version}-{hashlib.sha256(candidates.tobytes()).hexdigest()[:12]}"
+        with self._lock:
+            matrix = self._matrices.get(key)
+            if matrix is not None:
+                self._matrices.move_to_end(key)
+                return matrix
+        path = MATRIX_DIR / f"{key}.npy"
+        if not path.exists():
+            distance_matrix_file(sites['Latitude'].to_numpy(dtype=np.float64)[candidates],
+                                 sites['Longitude'].to_numpy(dtype=np.float64)[candidates], path)
+            _prune_matrices()
+        matrix = np.load(path, mmap_mode='r')
+        with self._lock:
+            self._matrices[key] = matrix
+            while len(self._matrices) > KEEP_MATRICES:
+                self._matrices.popitem(last=False)
+        return matrix
+
+    def plan(self, sites, data_version, interests, days, start_state=None, day_hours=DAY_HOURS):
+        interests = tuple(sorted(set(interests)))
+        key = (data_version, interests, int(days), start_state, float(day_hours))
+        with self._lock:
+            itinerary = self._plans.get(key)
+            if itinerary is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return itinerary
+            self.misses += 1
+
+        scores = interest_scores(sites, interests)
+        # Start at the best match, within the chosen state if any
+        eligible = np.ones(len(sites), dtype=bool)
+        if start_state is not None:
+            eligible = (sites['State'] == start_state).to_numpy()
+        # No site to start from: an unknown state, or one the filters left out
+        if not eligible.any():
+            return None
+        start = int(np.argmax(np.where(eligible, scores, -np.inf)))
+        # Routing runs on positions within the candidate set; the start is 0
+        candidates = candidate_sites(sites, scores, start)
+        matrix = self.matrix(sites, data_version, candidates)
+        route = plan_route(matrix, scores[candidates], 0, days, day_hours)
+        stops = route_frame(sites.iloc[candidates], matrix, route, scores[candidates], day_hours)
+        itinerary = Itinerary(stops, int(stops['Day'].max()), float(stops['Distance_Km'].sum()),
+                              float(stops['Travel_Hours'].sum()), float(stops['Interest_Score'].sum()))
+        with self._lock:
+            self._plans[key] = itinerary
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return itinerary
+
+    def stats(self):
+        with self._lock:
+            return {'matrices': len(self._matrices), 'plans': len(self._plans),
+                    'hits': self.hits, 'misses': self.misses}
+
+
+PLANNER = Planner()
+
+
+def plan_itinerary(sites, data_version, interests, days, start_state=None, day_hours=DAY_HOURS):
+    # None when there is no site to start from
+    return PLANNER.plan(sites, data_version, interests, days, start_state, day_hours)
+
+
+def main(argv=None):
+    import loaders
+
+    parser = argparse.ArgumentParser(description="Plan a cultural circuit over the dashboard's sites")
+    parser.add_argument('--days', type=int, default=3)
+    parser.add_argument('--hours', type=float, default=DAY_HOURS, help="touring hours per day")
+    parser.add_argument('--interests', nargs='+', choices=list(INTERESTS), default=list(INTERESTS))
+    parser.add_argument('--start', help="state to start in")
+    args = parser.parse_args(argv)
+
+    data = loaders.load_dashboard_data()
+    started = time.perf_counter()
+    itinerary = plan_itinerary(data.cultural_sites, data.data_version, args.interests, args.days,
+                               args.start, args.hours)
+    elapsed = time.perf_counter() - started
+    if itinerary is None:
+        parser.exit(1, f"No sites in {args.start}\n")
+    print(itinerary.stops[['Day', 'Stop', 'State', 'Distance_Km', 'Travel_Hours', 'Interest_Score']]
+          .to_string(index=False))
+    print(f"{len(itinerary.stops)} stops over {itinerary.days} days, {itinerary.total_km:,.0f} km, "
+          f"planned in {elapsed * 1000:.0f} ms from {len(data.cultural_sites):,} sites")
+
+
+if __name__ == '__main__':
+    main()
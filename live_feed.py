@@ -0,0 +1,307 @@
+# Live ticket-gate footfall.
+#
+# A daemon thread reads gate events from a local source into per-site ring
+# buffers at three resolutions:
+# - 5-minute buckets for the last day,
+# - hourly buckets for the last week,
+# - daily buckets for the last 90 days.
+# Each buffer is a fixed NumPy array indexed by bucket number modulo its
+# length, so a slot is reused once its bucket leaves the window. At most
+# MAX_SITES sites are tracked, and the longest idle one is dropped for a
+# new one. Memory therefore stays fixed however long the app runs.
+# Buckets are in server local time, so days start at local midnight.
+#
+# LIVE_FEED selects the source:
+#   file:/path/to/gates.jsonl   follow a file the gates append to
+#   tcp://127.0.0.1:9100        accept gate connections on a local port
+# Each line is one JSON event:
+#   {"time": <epoch seconds or ISO 8601>, "site": "<name>", "visitors": <count, default 1>}
+#
+#   python live_feed.py --emit file:data/live/gates.jsonl   # sample gate feed
+import argparse
+import json
+import logging
+import math
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+LIVE_SOURCE = os.environ.get('LIVE_FEED')
+MAX_SITES = int(os.environ.get('LIVE_MAX_SITES', 2048))
+# Seconds between redraws of the live chart
+REFRESH_SECONDS = float(os.environ.get('LIVE_REFRESH_SECONDS', 5))
+# Resolution -> (bucket seconds, buckets kept)
+RESOLUTIONS = {
+    '5 min': (300, 288),
+    'Hourly': (3600, 168),
+    'Daily': (86400, 90),
+}
+FOLLOW_POLL_SECONDS = 0.5
+# Local time = UTC + this, fixed at startup
+UTC_OFFSET = datetime.now().astimezone().utcoffset().total_seconds()
+# Events older than the longest window are counted and dropped
+HORIZON_SECONDS = max(seconds * slots for seconds, slots in RESOLUTIONS.values())
+# So are events stamped further ahead than this: one bad stamp (e.g. epoch
+# milliseconds) would otherwise push a site's buffers past every real event
+MAX_SKEW_SECONDS = float(os.environ.get('LIVE_MAX_SKEW_SECONDS', 300))
+
+log = logging.getLogger(__name__)
+
+
+class RingBuffer:
+    def __init__(self, bucket_seconds, slots):
+        self.bucket_seconds = bucket_seconds
+        self.counts = np.zeros(slots)
+        # Bucket each slot currently holds; -1 when unused
+        self.buckets = np.full(slots, -1, dtype=np.int64)
+        self.newest = -1
+
+    def add(self, local_time, visitors):
+        # False when the bucket has already left the window
+        bucket = int(local_time // self.bucket_seconds)
+        slots = len(self.counts)
+        if bucket <= self.newest - slots:
+            return False
+        slot = bucket % slots
+        if self.buckets[slot] != bucket:
+            self.buckets[slot] = bucket
+            self.counts[slot] = 0.0
+        self.counts[slot] += visitors
+        self.newest = max(self.newest, bucket)
+        return True
+
+    def window(self, last_bucket):
+        # Counts of the buckets ending at last_bucket, oldest first; zero
+        # where nothing arrived
+        slots = len(self.counts)
+        buckets = np.arange(last_bucket - slots + 1, last_bucket + 1)
+        at = buckets % slots
+        return np.where(self.buckets[at] == buckets, self.counts[at], 0.0)
+
+
+def parse_event(line):
+    # (local epoch seconds, site, visitors) or None for a malformed line
+    try:
+        event = json.loads(line)
+        stamp = event['time']
+        if isinstance(stamp, str):
+            stamp = datetime.fromisoformat(stamp).timestamp()
+        stamp = float(stamp)
+        visitors = float(event.get('visitors', 1))
+        site = str(event['site'])
+    except (ValueError, KeyError, TypeError, AttributeError, OverflowError):
+        return None
+    # json.loads accepts NaN and Infinity
+    if not site or not math.isfinite(stamp) or not math.isfinite(visitors) or visitors < 0:
+        return None
+    return stamp + UTC_OFFSET, site, visitors
+
+
+class LiveFootfall:
+    def __init__(self, max_sites=MAX_SITES):
+        self.max_sites = max_sites
+        self._lock = threading.Lock()
+        # site -> {resolution: RingBuffer}, least recently updated first
+        self._sites = OrderedDict()
+        self._thread = None
+        # (inode, offset) read up to in the followed file; kept across
+        # restarts of _follow so a recovery never counts a line twice
+        self._position = (None, 0)
+        self.status = {'source': None, 'events': 0, 'rejected': 0, 'late': 0, 'future': 0, 'sites_dropped': 0,
+                       'last_event': None, 'last_error': None}
+
+    def add_lines(self, lines):
+        events = [parse_event(line) for line in lines if line.strip()]
+        now = time.time() + UTC_OFFSET
+        horizon = now - HORIZON_SECONDS
+        with self._lock:
+            for event in events:
+                if event is None:
+                    self.status['rejected'] += 1
+                    continue
+                local_time, site, visitors = event
+                if local_time < horizon:
+                    self.status['late'] += 1
+                    continue
+                if local_time > now + MAX_SKEW_SECONDS:
+                    self.status['future'] += 1
+                    continue
+                buffers = self._sites.get(site)
+                if buffers is None:
+                    buffers = {name: RingBuffer(*spec) for name, spec in RESOLUTIONS.items()}
+                    self._sites[site] = buffers
+                    if len(self._sites) > self.max_sites:
+                        self._sites.popitem(last=False)
+                        self.status['sites_dropped'] += 1
+                else:
+                    self._sites.move_to_end(site)
+                kept = [buffer.add(local_time, visitors) for buffer in buffers.values()]
+                if not any(kept):
+                    self.status['late'] += 1
+                self.status['events'] += 1
+                self.status['last_event'] = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(local_time))
+
+    def sites(self):
+        with self._lock:
+            return sorted(self._sites)
+
+    def series(self, resolution, site=None, now=None):
+        # (bucket start times, visitors) over the resolution's window up to
+        # now, for one site or summed over all
+        bucket_seconds, slots = RESOLUTIONS[resolution]
+        last_bucket = int(((now or time.time()) + UTC_OFFSET) // bucket_seconds)
+        values = np.zeros(slots)
+        with self._lock:
+            for name, buffers in self._sites.items():
+                if site is None or name == site:
+                    values += buffers[resolution].window(last_bucket)
+        starts = (np.arange(last_bucket - slots + 1, last_bucket + 1) * bucket_seconds).astype('datetime64[s]')
+        return starts, values
+
+    def _follow(self, path):
+        # tail -f: reads what is appended, and starts over when the file is
+        # truncated or replaced
+        path = Path(path)
+        handle, inode = None, None
+        try:
+            while True:
+                if handle is None:
+                    if not path.exists():
+                        time.sleep(FOLLOW_POLL_SECONDS)
+                        continue
+                    handle = open(path, 'rb')
+                    inode = os.fstat(handle.fileno()).st_ino
+                    # Resume where the last run stopped, if it is the same
+                    # file and hasn't been truncated since
+                    seen_inode, offset = self._position
+                    if seen_inode == inode and offset <= os.fstat(handle.fileno()).st_size:
+                        handle.seek(offset)
+                lines = handle.readlines()
+                # A partial last line waits for the rest of it
+                if lines and not lines[-1].endswith(b'\n'):
+                    handle.seek(-len(lines.pop()), os.SEEK_CUR)
+                if lines:
+                    # Recorded first: a batch that fails isn't read again
+                    self._position = (inode, handle.tell())
+                    self.add_lines([line.decode('utf-8', errors='replace') for line in lines])
+                    continue
+                time.sleep(FOLLOW_POLL_SECONDS)
+                try:
+                    stat = path.stat()
+                    replaced = stat.st_ino != inode or stat.st_size < handle.tell()
+                except FileNotFoundError:
+                    replaced = True
+                if replaced:
+                    handle.close()
+                    handle = None
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def _listen(self, host, port):
+        live = self
+
+        class GateHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    live.add_lines([line.decode('utf-8', errors='replace')])
+
+        server = socketserver.ThreadingTCPServer((host, port), GateHandler)
+        server.daemon_threads = True
+        server.serve_forever()
+
+    def _run(self, source):
+        url = urlsplit(source)
+        while True:
+            try:
+                if url.scheme == 'tcp':
+                    self._listen(url.hostname or '127.0.0.1', url.port)
+                else:
+                    self._follow(url.path if url.scheme == 'file' else source)
+            except Exception as e:
+                # Keep the buffers; reopen the source after a pause
+                self.status['last_error'] = f"{type(e).__name__}: {e}"
+                log.exception("live feed failed")
+                time.sleep(5)
+
+    def start(self, source):
+        if self._thread is None:
+            self.status['source'] = source
+            self._thread = threading.Thread(target=self._run, args=(source,), name='live-feed', daemon=True)
+            self._thread.start()
+        return self
+
+
+LIVE = LiveFootfall()
+_start_lock = threading.Lock()
+
+
+def ensure_started(source=LIVE_SOURCE):
+    # Starts following the feed once per process, when one is configured
+    if not source:
+        return None
+    with _start_lock:
+        return LIVE.start(source)
+
+
+def sample_events(sites, rates, start, end, step=60):
+    # Stand-in gate events: one line per site and step with the visitors
+    # counted at its gates, at the rates given in visitors per second
+    rng = np.random.default_rng()
+    times = np.arange(start, end, step)
+    counts = rng.poisson(np.asarray(rates) * step, size=(len(times), len(rates)))
+    return [json.dumps({'time': int(t), 'site': site, 'visitors': int(n)})
+            for t, row in zip(times, counts) for site, n in zip(sites, row) if n]
+
+
+def main(argv=None):
+    import loaders
+    import seasonality
+
+    parser = argparse.ArgumentParser(description="Write a sample ticket-gate feed from the dashboard's sites")
+    parser.add_argument('--emit', required=True, help="file:<path> to append to, or tcp://host:port to send to")
+    parser.add_argument('--backfill-hours', type=float, default=24, help="history to write first")
+    parser.add_argument('--step', type=int, default=60, help="seconds between event batches")
+    args = parser.parse_args(argv)
+
+    data = loaders.load_dashboard_data()
+    month = seasonality.MONTHS[time.localtime().tm_mon - 1]
+    index = data.tourism_trends.set_index('Month')['Cultural_Tourism'].astype(float)
+    seasonal = index[month] / index.mean()
+    sites = data.cultural_sites['State'].astype(str).tolist()
+    rates = data.cultural_sites['Annual_Tourists'].to_numpy(dtype=float) / (365 * 86400) * seasonal
+
+    url = urlsplit(args.emit)
+    if url.scheme == 'tcp':
+        import socket
+        connection = socket.create_connection((url.hostname, url.port))
+        write = lambda lines: connection.sendall(''.join(line + '\n' for line in lines).encode())
+    else:
+        path = Path(url.path if url.scheme == 'file' else args.emit)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        def write(lines):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.writelines(line + '\n' for line in lines)
+
+    now = int(time.time()) // args.step * args.step
+    write(sample_events(sites, rates, now - int(args.backfill_hours * 3600), now, args.step))
+    print(f"emitting {len(sites)} sites to {args.emit} every {args.step}s (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(args.step)
+            write(sample_events(sites, rates, now, now + args.step, args.step))
+            now += args.step
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
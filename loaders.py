@@ -0,0 +1,121 @@
+# Data loading shared by the dashboard sections and offline tools.
+import threading
+from collections import namedtuple
+
+import streamlit as st
+
+import data_store
+import filters
+import schemas
+import timeseries
+from instrumentation import timed
+from spatial_index import SiteIndex
+
+DashboardData = namedtuple('DashboardData', [
+    'cultural_sites', 'tourism_trends', 'art_forms', 'sustainability_data', 'data_version',
+    # data_store.StoreVersion the frames came from; lazy readers (footfall,
+    # seasonality, boundaries, filtered views) read the same version
+    'store',
+    'filters',
+], defaults=[filters.NO_FILTERS])
+
+
+def prepare_store():
+    # Raw exports, choropleth boundaries included, are converted on first
+    # use into a new store version
+    data_store.ensure_store()
+
+
+# Tables come from the columnar store in data/store (see data_store.py). Raw
+# CSV exports from data.gov.in are converted to Parquet once, on first use.
+# The frames are cast to their compact schemas (see schemas.py), loaded
+# once per data version, and every session gets the same objects
+# (st.cache_data would unpickle a copy per caller), so they are read-only:
+# derive new frames instead of assigning into them.
+def load_cultural_data(store_dir):
+    cultural_sites = schemas.load('cultural_sites', store_dir)
+    tourism_trends = schemas.load('tourism_trends', store_dir)
+    art_forms = schemas.load('art_forms', store_dir)
+    
+    return cultural_sites, tourism_trends, art_forms
+
+def load_responsible_tourism_data(store_dir):
+    sustainability_data = schemas.load('sustainability_data', store_dir)
+    
+    return sustainability_data
+
+
+def build_dashboard_data(store_dir=None):
+    # store_dir is the version to load (the refresher's next one); by
+    # default the published version
+    if store_dir is None:
+        prepare_store()
+    store = data_store.StoreVersion(data_store.version_dir(store_dir))
+    with timed('data_load', name='cultural_data'):
+        cultural_sites, tourism_trends, art_forms = load_cultural_data(store.path)
+    with timed('data_load', name='responsible_tourism_data'):
+        sustainability_data = load_responsible_tourism_data(store.path)
+    return DashboardData(cultural_sites, tourism_trends, art_forms, sustainability_data,
+                         data_store.data_version(store.path), store)
+
+
+# The published snapshot. refresher.py builds the next one in the background
+# from its own store version and replaces it with a single assignment, so a
+# rerun sees one complete data version.
+_published = None
+_publish_lock = threading.Lock()
+
+
+def load_dashboard_data():
+    global _published
+    if _published is None:
+        with _publish_lock:
+            if _published is None:
+                _published = build_dashboard_data()
+    return _published
+
+
+def publish(data):
+    global _published
+    _published = data
+
+
+# What the sidebar filters offer: states, footfall years, top of the
+# tourists range
+@st.cache_data(max_entries=2)
+def load_filter_options(_cultural_sites, data_version, store_dir):
+    states = sorted(_cultural_sites['State'].unique())
+    years = None
+    if timeseries.footfall_available(store_dir):
+        first, last = timeseries.date_bounds(store_dir)
+        years = (first.year, last.year)
+    return states, years, int(_cultural_sites['Annual_Tourists'].max())
+
+
+# The published data narrowed by the sidebar filters. The filters are
+# pushed into the store scans (see filters.py) and only the columns the
+# published frames hold are read. Shared read-only like the published data.
+@st.cache_resource(max_entries=32)
+def query_dashboard_data(_data, data_version, active_filters):
+    if active_filters == filters.NO_FILTERS:
+        return _data
+    site_filter = filters.site_expression(active_filters)
+    cultural_sites = _data.cultural_sites
+    if site_filter is not None:
+        with timed('data_load', name='filtered_cultural_sites'):
+            cultural_sites = schemas.load('cultural_sites', _data.store.path,
+                                          columns=list(cultural_sites.columns), filter=site_filter)
+    state_filter = filters.state_expression(active_filters)
+    sustainability_data = _data.sustainability_data
+    if state_filter is not None:
+        with timed('data_load', name='filtered_sustainability_data'):
+            sustainability_data = schemas.load('sustainability_data', _data.store.path,
+                                               columns=list(sustainability_data.columns), filter=state_filter)
+    return _data._replace(cultural_sites=cultural_sites, sustainability_data=sustainability_data,
+                          data_version=filters.version(data_version, active_filters), filters=active_filters)
+
+
+# Built once per data version (or filtered view) and shared by every session
+@st.cache_resource(max_entries=8)
+def load_site_index(_cultural_sites, data_version):
+    return SiteIndex.from_sites(_cultural_sites)
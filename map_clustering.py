@@ -0,0 +1,161 @@
+# Server-side marker clustering for the Cultural Hotspots map.
+#
+# Sites are projected to Web Mercator pixel space for the requested zoom,
+# cut down to the viewport (snapped outward to 256px tiles so small pans
+# reuse the same layer), and binned into a pixel grid. Everything is done
+# with NumPy on whole columns; only the resulting clusters and markers are
+# sent to the browser as a single GeoJSON layer.
+import json
+
+import numpy as np
+import pandas as pd
+
+from formatting import thousands
+
+TILE_PX = 256
+CLUSTER_PX = 48
+# Viewports with at most this many sites are sent unclustered
+MAX_MARKERS = 300
+# From this zoom on every site is drawn individually
+MAX_CLUSTER_ZOOM = 12
+
+INDIA_CENTER = (20.5937, 78.9629)
+DEFAULT_ZOOM = 5
+
+
+def project(lat, lon, zoom):
+    scale = TILE_PX * 2.0 ** zoom
+    x = (np.asarray(lon, dtype=float) + 180.0) / 360.0 * scale
+    sin_lat = np.clip(np.sin(np.radians(np.asarray(lat, dtype=float))), -0.9999, 0.9999)
+    y = (0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)) * scale
+    return x, y
+
+
+def unproject(x, y, zoom):
+    scale = TILE_PX * 2.0 ** zoom
+    lon = np.asarray(x, dtype=float) / scale * 360.0 - 180.0
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * np.asarray(y, dtype=float) / scale))))
+    return lat, lon
+
+
+def viewport_tiles(bounds, zoom):
+    # ((south, west), (north, east)) -> inclusive tile range (x0, y0, x1, y1)
+    (south, west), (north, east) = bounds
+    x0, y1 = project(south, west, zoom)
+    x1, y0 = project(north, east, zoom)
+    last = 2 ** zoom - 1
+    return tuple(int(np.clip(v // TILE_PX, 0, last)) for v in (x0, y0, x1, y1))
+
+
+def default_bounds(center, zoom, width, height):
+    # Bounds of a width x height viewport before the browser reports any
+    cx, cy = project(center[0], center[1], zoom)
+    xs = np.array([cx - width / 2, cx + width / 2])
+    ys = np.array([cy + height / 2, cy - height / 2])
+    lats, lons = unproject(xs, ys, zoom)
+    return (lats[0], lons[0]), (lats[1], lons[1])
+
+
+def tile_bounds(tiles, zoom):
+    # Inclusive tile range -> ((south, west), (north, east)) it covers
+    x0, y0, x1, y1 = tiles
+    lats, lons = unproject(np.array([x0, x1 + 1]) * TILE_PX, np.array([y1 + 1, y0]) * TILE_PX, zoom)
+    return (lats[0], lons[0]), (lats[1], lons[1])
+
+
+def bounds_from_state(map_state):
+    # st_folium bounds dict -> ((south, west), (north, east)), or None if unset
+    bounds = (map_state or {}).get('bounds') or {}
+    sw, ne = bounds.get('_southWest') or {}, bounds.get('_northEast') or {}
+    corners = (sw.get('lat'), sw.get('lng'), ne.get('lat'), ne.get('lng'))
+    if any(v is None for v in corners):
+        return None
+    return (corners[0], corners[1]), (corners[2], corners[3])
+
+
+def marker_colors(annual_tourists):
+    # Color code based on tourist volume
+    tourists = np.asarray(annual_tourists)
+    return np.select([tourists > 3000000, tourists > 1500000], ['red', 'orange'], 'green')
+
+
+def _text(values):
+    # Column -> object array of str, so "+" concatenates element-wise
+    return np.asarray(pd.Series(values).astype(str), dtype=object)
+
+
+def popup_html(sites):
+    return ("<b>" + _text(sites['State']) + "</b><br>"
+            + "UNESCO Sites: " + _text(sites['UNESCO_Sites']) + "<br>"
+            + "Art Forms: " + _text(sites['Art_Forms']) + "<br>"
+            + "Annual Tourists: " + thousands(sites['Annual_Tourists']) + "<br>"
+            + "Cultural Budget: ₹" + thousands(sites['Cultural_Budget'].to_numpy(dtype=np.float64)) + " cr")
+
+
+def _features(lats, lons, props):
+    # Column-oriented properties -> list of GeoJSON point features
+    keys = list(props)
+    rows = zip(lats.tolist(), lons.tolist(), *(np.asarray(props[k]).tolist() for k in keys))
+    return [
+        {"type": "Feature",
+         "geometry": {"type": "Point", "coordinates": [lon, lat]},
+         "properties": dict(zip(keys, values))}
+        for lat, lon, *values in rows
+    ]
+
+
+def cluster_sites(sites, zoom, tiles):
+    # Returns a GeoJSON FeatureCollection for the sites inside the tile range
+    x, y = project(sites['Latitude'].to_numpy(), sites['Longitude'].to_numpy(), zoom)
+    x0, y0, x1, y1 = tiles
+    in_view = ((x >= x0 * TILE_PX) & (x < (x1 + 1) * TILE_PX)
+               & (y >= y0 * TILE_PX) & (y < (y1 + 1) * TILE_PX))
+    visible = sites[in_view]
+    x, y = x[in_view], y[in_view]
+
+    if len(visible) <= MAX_MARKERS or zoom >= MAX_CLUSTER_ZOOM:
+        singles = np.ones(len(visible), dtype=bool)
+        cell_ids = np.arange(len(visible))
+        counts = np.ones(len(visible), dtype=np.int64)
+    else:
+        cells_per_row = int(TILE_PX * 2 ** zoom // CLUSTER_PX) + 1
+        cell = (x // CLUSTER_PX).astype(np.int64) * cells_per_row + (y // CLUSTER_PX).astype(np.int64)
+        _, cell_ids, counts = np.unique(cell, return_inverse=True, return_counts=True)
+        singles = counts[cell_ids] == 1
+
+    lat = visible['Latitude'].to_numpy()
+    lon = visible['Longitude'].to_numpy()
+    tourists = visible['Annual_Tourists'].to_numpy()
+
+    single = visible[singles]
+    colors = marker_colors(tourists[singles])
+    features = _features(lat[singles], lon[singles], {
+        "kind": np.full(len(single), "site"),
+        "popup": popup_html(single),
+        "tooltip": _text(single['State']),
+        "radius": np.maximum(5, single['UNESCO_Sites'].to_numpy(dtype=np.int32) * 3),
+        "color": colors,
+    })
+
+    multi = counts > 1
+    if multi.any():
+        n_cells = len(counts)
+        center_lat = np.bincount(cell_ids, weights=lat, minlength=n_cells)[multi] / counts[multi]
+        center_lon = np.bincount(cell_ids, weights=lon, minlength=n_cells)[multi] / counts[multi]
+        total_tourists = np.bincount(cell_ids, weights=tourists, minlength=n_cells)[multi]
+        total_unesco = np.bincount(cell_ids, weights=visible['UNESCO_Sites'].to_numpy(), minlength=n_cells)[multi]
+        n = counts[multi]
+        n_label = _text(n)
+        features += _features(center_lat, center_lon, {
+            "kind": np.full(len(n), "cluster"),
+            "popup": "<b>" + n_label + " sites</b><br>Annual Tourists: " + thousands(total_tourists),
+            "tooltip": n_label + " sites, UNESCO: " + _text(total_unesco.astype(np.int64)),
+            "radius": np.minimum(40, 8 + 4 * np.log2(n)).round(1),
+            "color": np.full(len(n), '#2E86AB'),
+        })
+
+    return {"type": "FeatureCollection", "features": features}
+
+
+def cluster_layer_json(sites, zoom, tiles):
+    return json.dumps(cluster_sites(sites, zoom, tiles), separators=(",", ":"))
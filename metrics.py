@@ -0,0 +1,192 @@
+# Derived metrics, materialized once per data version.
+#
+# Sections used to recompute scores and masks inline on every rerun. They
+# now read them from here. When a new data version arrives, each table's
+# rows are fingerprinted and compared with the previous version: unchanged
+# tables are kept as-is, and row-local scores are recomputed only for rows
+# that changed. Results only add columns to shallow copies of the shared
+# source frames; copy-on-write keeps the source columns shared.
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import timed
+
+PEAK_THRESHOLD = 85
+OFF_PEAK_THRESHOLD = 70
+UNDEREXPLORED_MAX_TOURISTS = 1000000
+TREND_COLUMNS = ['Cultural_Tourism', 'Heritage_Sites', 'Art_Festivals']
+KEEP_VERSIONS = 8
+
+DerivedMetrics = namedtuple('DerivedMetrics', [
+    'data_version',
+    'cultural_sites',    # + Potential_Score, Underexplored
+    'underexplored',     # Underexplored sites, ascending by Potential_Score
+    'art_forms',         # + Performance_Score
+    'tourism_trends',    # + Peak, Off_Peak
+    'peak_months',
+    'off_peak_months',
+    'peak_averages',     # mean of each trend column over peak months
+    'champions',         # sustainability_data ranked by Eco_Score
+])
+
+
+def row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def potential_scores(cultural_sites):
+    # Widened first: the stored columns are narrow unsigned ints
+    return (cultural_sites['Art_Forms'].to_numpy(dtype=np.int32) * 2
+            + cultural_sites['UNESCO_Sites'].to_numpy(dtype=np.int32) * 10)
+
+
+def performance_scores(art_forms, revenue_max):
+    return np.round(art_forms['Tourism_Impact'].to_numpy() * 0.4
+                    + art_forms['Revenue_Crores'].to_numpy() / revenue_max * 100 * 0.6, 1)
+
+
+def _changed_rows(old_hashes, new_hashes):
+    # Positions of changed rows, or None when the table was reshaped
+    if old_hashes is None or len(old_hashes) != len(new_hashes):
+        return None
+    return np.flatnonzero(old_hashes != new_hashes)
+
+
+def _update_rows(result, source, changed):
+    # Copy the changed source rows into result, column by column, in the
+    # source's dtype (its categories cover labels new in this version)
+    for column in source.columns:
+        values = result[column].to_numpy(copy=True)
+        values[changed] = source[column].to_numpy()[changed]
+        result[column] = pd.array(values, dtype=source[column].dtype)
+
+
+class MetricsStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self._tables = {}
+        self._scalars = {}
+        # data version -> DerivedMetrics, least recently used dropped first.
+        # Filtered views have versions of their own, and the previous data
+        # version stays so reruns still on it during a refresh don't
+        # recompute.
+        self._versions = OrderedDict()
+        # Rows recomputed per table on the last refresh, for diagnostics
+        self.last_refresh = {}
+
+    def get(self, data):
+        with self._lock:
+            metrics = self._versions.get(data.data_version)
+            if metrics is not None:
+                self._versions.move_to_end(data.data_version)
+            else:
+                with timed('transform', name='derived_metrics'):
+                    metrics = self._refresh(data)
+                self._versions[data.data_version] = metrics
+                while len(self._versions) > KEEP_VERSIONS:
+                    self._versions.popitem(last=False)
+            return metrics
+
+    def _refresh(self, data):
+        self.last_refresh = {}
+        cultural_sites = self._refresh_cultural_sites(data.cultural_sites)
+        art_forms = self._refresh_art_forms(data.art_forms)
+        tourism_trends = self._refresh_tourism_trends(data.tourism_trends)
+        champions = self._refresh_champions(data.sustainability_data)
+
+        underexplored = cultural_sites[cultural_sites['Underexplored']].sort_values('Potential_Score')
+        return DerivedMetrics(
+            data_version=data.data_version,
+            cultural_sites=cultural_sites,
+            underexplored=underexplored,
+            art_forms=art_forms,
+            tourism_trends=tourism_trends,
+            peak_months=tourism_trends.loc[tourism_trends['Peak'], 'Month'].tolist(),
+            off_peak_months=tourism_trends.loc[tourism_trends['Off_Peak'], 'Month'].tolist(),
+            peak_averages=self._scalars['peak_averages'],
+            champions=champions,
+        )
+
+    def _unchanged(self, name, df):
+        hashes = row_hashes(df)
+        old = self._hashes.get(name)
+        self._hashes[name] = hashes
+        changed = _changed_rows(old, hashes)
+        if changed is not None and len(changed) == 0 and name in self._tables:
+            self.last_refresh[name] = 0
+            return True, changed
+        self.last_refresh[name] = len(df) if changed is None else len(changed)
+        return False, changed
+
+    def _refresh_cultural_sites(self, cultural_sites):
+        unchanged, changed = self._unchanged('cultural_sites', cultural_sites)
+        if unchanged:
+            return self._tables['cultural_sites']
+
+        if changed is None:
+            result = cultural_sites.copy(deep=False)
+            result['Potential_Score'] = potential_scores(cultural_sites)
+        else:
+            # Potential_Score only depends on its own row
+            result = self._tables['cultural_sites'].copy(deep=False)
+            _update_rows(result, cultural_sites, changed)
+            scores = result['Potential_Score'].to_numpy(copy=True)
+            scores[changed] = potential_scores(cultural_sites.iloc[changed])
+            result['Potential_Score'] = scores
+        result['Underexplored'] = result['Annual_Tourists'].to_numpy() < UNDEREXPLORED_MAX_TOURISTS
+        self._tables['cultural_sites'] = result
+        return result
+
+    def _refresh_art_forms(self, art_forms):
+        unchanged, changed = self._unchanged('art_forms', art_forms)
+        if unchanged:
+            return self._tables['art_forms']
+
+        revenue_max = art_forms['Revenue_Crores'].max()
+        if changed is None or revenue_max != self._scalars.get('revenue_max'):
+            # Scores are scaled by the catalogue-wide maximum revenue
+            result = art_forms.copy(deep=False)
+            result['Performance_Score'] = performance_scores(art_forms, revenue_max)
+        else:
+            result = self._tables['art_forms'].copy(deep=False)
+            _update_rows(result, art_forms, changed)
+            scores = result['Performance_Score'].to_numpy(copy=True)
+            scores[changed] = performance_scores(art_forms.iloc[changed], revenue_max)
+            result['Performance_Score'] = scores
+        self._scalars['revenue_max'] = revenue_max
+        self._tables['art_forms'] = result
+        return result
+
+    def _refresh_tourism_trends(self, tourism_trends):
+        unchanged, _ = self._unchanged('tourism_trends', tourism_trends)
+        if unchanged:
+            return self._tables['tourism_trends']
+
+        result = tourism_trends.copy(deep=False)
+        index = result['Cultural_Tourism'].to_numpy()
+        result['Peak'] = index >= PEAK_THRESHOLD
+        result['Off_Peak'] = index < OFF_PEAK_THRESHOLD
+        # One masked mean over all trend columns at once
+        self._scalars['peak_averages'] = result.loc[result['Peak'], TREND_COLUMNS].mean()
+        self._tables['tourism_trends'] = result
+        return result
+
+    def _refresh_champions(self, sustainability_data):
+        unchanged, _ = self._unchanged('sustainability_data', sustainability_data)
+        if unchanged:
+            return self._tables['sustainability_data']
+
+        result = sustainability_data.sort_values('Eco_Score', ascending=False)
+        self._tables['sustainability_data'] = result
+        return result
+
+
+METRICS_STORE = MetricsStore()
+
+
+def derived_metrics(data):
+    return METRICS_STORE.get(data)
@@ -0,0 +1,225 @@
+# JSON API over the derived metrics.
+#
+# Serves the numbers the sections plot: underexplored sites by
+# Potential_Score, the sustainability champions, the peak and off-peak
+# months with their averages, and the art form scores. They come from the
+# same published data and MetricsStore as the app, through a small
+# ThreadingHTTPServer next to Streamlit, so scrapers never trigger a rerun.
+# Each response body is serialized once per data version and query and kept
+# in memory. Its ETag is a hash of the body: If-None-Match gets a 304, also
+# across data refreshes that left that response unchanged. The data version
+# is therefore sent in the X-Data-Version header, not in the body.
+# The API root lists the endpoints and isn't cached.
+#
+# DASHBOARD_API_PORT starts it with the app on 127.0.0.1:<port>, or run it
+# on its own:
+#
+#   python metrics_api.py --port 8502
+#   curl http://127.0.0.1:8502/api/v1/underexplored?state=Kerala&limit=5
+import argparse
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import loaders
+from metrics import derived_metrics
+
+API_HOST = '127.0.0.1'
+API_PORT = os.environ.get('DASHBOARD_API_PORT')
+API_ROOT = '/api/v1'
+CACHE_ENTRIES = 256
+UNDEREXPLORED_COLUMNS = ['State', 'Annual_Tourists', 'UNESCO_Sites', 'Art_Forms', 'Potential_Score']
+ART_FORM_COLUMNS = ['Art_Form', 'Practitioners', 'Revenue_Crores', 'Tourism_Impact', 'Performance_Score']
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _limit(params):
+    value = params.get('limit')
+    if value is None:
+        return None
+    if not value.isdigit():
+        raise BadRequest("limit must be a non-negative integer")
+    return int(value)
+
+
+def _records(df, limit=None):
+    if limit is not None:
+        df = df.head(limit)
+    # Six digits keep float32 columns from printing as 9.1999998
+    return json.loads(df.to_json(orient='records', double_precision=6))
+
+
+def underexplored(metrics, params):
+    sites = metrics.underexplored
+    if 'state' in params:
+        sites = sites[sites['State'] == params['state']]
+    return {'items': _records(sites[UNDEREXPLORED_COLUMNS], _limit(params))}
+
+
+def champions(metrics, params):
+    return {'items': _records(metrics.champions, _limit(params))}
+
+
+def seasons(metrics, params):
+    months = metrics.tourism_trends[['Month', 'Cultural_Tourism', 'Peak', 'Off_Peak']]
+    return {
+        'peak_months': metrics.peak_months,
+        'off_peak_months': metrics.off_peak_months,
+        'peak_averages': {k: round(float(v), 2) for k, v in metrics.peak_averages.items()},
+        'months': _records(months),
+    }
+
+
+def art_forms(metrics, params):
+    ranked = metrics.art_forms.sort_values('Performance_Score', ascending=False, kind='stable')
+    return {'items': _records(ranked[ART_FORM_COLUMNS], _limit(params))}
+
+
+# Path under API_ROOT -> (handler, accepted query parameters)
+ENDPOINTS = {
+    'underexplored': (underexplored, {'state', 'limit'}),
+    'champions': (champions, {'limit'}),
+    'seasons': (seasons, set()),
+    'art_forms': (art_forms, {'limit'}),
+}
+
+
+class ResponseCache:
+    # (data version, endpoint, query) -> (etag, body), least recently used
+    # evicted first; older versions age out the same way
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        # Built outside the lock; concurrent misses build the same body
+        body = build()
+        entry = ('"' + hashlib.sha256(body).hexdigest()[:32] + '"', body)
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+RESPONSE_CACHE = ResponseCache()
+
+
+def response(path, query):
+    # (status, etag, body, data version) for one request
+    if path.rstrip('/') == API_ROOT:
+        data = loaders.load_dashboard_data()
+        body = {'data_version': data.data_version,
+                'endpoints': [f"{API_ROOT}/{name}" for name in ENDPOINTS],
+                'cache': RESPONSE_CACHE.stats()}
+        return 200, None, json.dumps(body).encode(), data.data_version
+
+    name = path[len(API_ROOT) + 1:].strip('/') if path.startswith(API_ROOT + '/') else None
+    if name not in ENDPOINTS:
+        return 404, None, json.dumps({'error': f"no such endpoint: {path}"}).encode(), None
+    handler, accepted = ENDPOINTS[name]
+    params = {k: v[-1] for k, v in parse_qs(query).items()}
+    unknown = sorted(set(params) - accepted)
+    if unknown:
+        return 400, None, json.dumps({'error': f"unknown parameters: {', '.join(unknown)}"}).encode(), None
+
+    data = loaders.load_dashboard_data()
+
+    def build():
+        # No data version in the body, so its hash only changes with the
+        # numbers
+        return json.dumps(handler(derived_metrics(data), params), ensure_ascii=False).encode()
+
+    try:
+        etag, body = RESPONSE_CACHE.get((data.data_version, name, tuple(sorted(params.items()))), build)
+    except BadRequest as e:
+        return 400, None, json.dumps({'error': str(e)}).encode(), None
+    return 200, etag, body, data.data_version
+
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        status, etag, body, data_version = response(url.path, url.query)
+        if etag is not None and etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('X-Data-Version', data_version)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if data_version is not None:
+            self.send_header('X-Data-Version', data_version)
+        if etag is not None:
+            self.send_header('ETag', etag)
+            # Cache, but check back with the ETag before each reuse
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def ensure_api(port=API_PORT, host=API_HOST):
+    # Starts the API server once per process; returns it, or None when no
+    # port is configured
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, int(port)), _ApiHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name='metrics-api', daemon=True).start()
+    return _server
+
+
+def main(argv=None):
+    import refresher
+
+    parser = argparse.ArgumentParser(description="Serve the dashboard's derived metrics as JSON")
+    parser.add_argument('--host', default=API_HOST)
+    parser.add_argument('--port', type=int, default=int(API_PORT or 8502))
+    args = parser.parse_args(argv)
+
+    loaders.load_dashboard_data()
+    refresher.ensure_started()
+    server = ThreadingHTTPServer((args.host, args.port), _ApiHandler)
+    server.daemon_threads = True
+    print(f"serving {API_ROOT} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+# Background refresh of the dashboard data.
+#
+# A daemon thread polls the raw export directory (data/raw, where the
+# data.gov.in drops land). Files whose size or mtime moved are hashed, and
+# only a real content change re-converts that table, into a new store
+# version directory next to the published one (see data_store.py). The next
+# DashboardData is then loaded from that directory and its derived metrics
+# computed off the request path, and published with one reference swap: a
+# rerun sees either the old version or the new one, never a mix. Readers
+# bound to the old snapshot keep reading the old directory, which is only
+# removed once nothing references it. Cached figures are carried over to the
+# new version unless their section reads a changed table.
+#
+# DATA_REFRESH_SECONDS sets the poll interval (default 60; 0 disables).
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import boundaries
+import data_store
+import loaders
+import timeseries
+from figure_cache import FIGURE_CACHE
+from metrics import derived_metrics
+
+REFRESH_SECONDS = float(os.environ.get('DATA_REFRESH_SECONDS', 60))
+
+# Tables each section's figures are built from
+SECTION_TABLES = {
+    'overview': {'cultural_sites'},
+    'art_forms': {'art_forms'},
+    'hotspots': {'cultural_sites', boundaries.BOUNDARY_TABLE},
+    'trends': {'cultural_sites', 'tourism_trends', timeseries.FOOTFALL_TABLE, 'carrying_capacity'},
+    'responsible_tourism': {'sustainability_data', 'cultural_sites', 'tourism_trends', 'carrying_capacity'},
+    'insights': set(data_store.ALL_TABLES),
+}
+# The sample footfall series is derived from these tables
+SAMPLE_INPUTS = {'cultural_sites', 'tourism_trends'}
+
+log = logging.getLogger(__name__)
+
+
+def rebuild_sample_footfall(staging):
+    # Update for the sample series, from the tables converted just before it
+    # into the same version
+    cultural_sites = data_store.load_table('cultural_sites', staging)
+    tourism_trends = data_store.load_table('tourism_trends', staging)
+    return data_store.frame_writer(timeseries.FOOTFALL_TABLE,
+                                   timeseries.sample_footfall(cultural_sites, tourism_trends),
+                                   timeseries.SAMPLE_SOURCE)(staging)
+
+
+class DataRefresher:
+    def __init__(self, raw_dir=None, store_dir=None, interval=REFRESH_SECONDS):
+        self.raw_dir = Path(raw_dir or data_store.RAW_DIR)
+        self.store_dir = store_dir
+        self.interval = interval
+        # table -> (size, mtime_ns) of the raw file when it was last hashed
+        self._seen = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.status = {'checks': 0, 'refreshes': 0, 'last_changed': [], 'last_error': None}
+
+    def changed_tables(self):
+        # (tables whose raw export content differs from what the store
+        # holds, {table: file signature} to remember once that is published)
+        stored = data_store.read_manifest(self.store_dir)['tables']
+        changed = []
+        signatures = {}
+        for name in data_store.available_raw_tables(self.raw_dir):
+            path = data_store.raw_path(name, self.raw_dir)
+            stat = path.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._seen.get(name) == signature and name in stored:
+                continue
+            if stored.get(name, {}).get('sha256') != data_store.file_digest(path):
+                changed.append(name)
+            signatures[name] = signature
+        return changed, signatures
+
+    def refresh(self):
+        # One poll; returns the tables that changed
+        with self._lock:
+            self.status['checks'] += 1
+            changed, signatures = self.changed_tables()
+            if not changed:
+                # Unchanged files needn't be hashed again
+                self._seen.update(signatures)
+                return []
+
+            current = loaders.load_dashboard_data()
+            updates = data_store.converters(changed, self.raw_dir)
+            footfall = data_store.read_manifest(self.store_dir)['tables'].get(timeseries.FOOTFALL_TABLE, {})
+            if footfall.get('source') == timeseries.SAMPLE_SOURCE and SAMPLE_INPUTS & set(changed):
+                updates[timeseries.FOOTFALL_TABLE] = rebuild_sample_footfall
+                changed.append(timeseries.FOOTFALL_TABLE)
+            next_dir = data_store.reconvert(updates, self.store_dir)
+
+            # Everything the first rerun on the new version needs, before
+            # anyone can see it
+            data = loaders.build_dashboard_data(next_dir)
+            derived_metrics(data)
+            changed_set = set(changed)
+            kept, dropped = FIGURE_CACHE.carry_over(
+                current.data_version, data.data_version,
+                lambda key: not SECTION_TABLES.get(key[0], changed_set) & changed_set)
+            loaders.publish(data)
+            data_store.publish_version(next_dir)
+            # Only now: a failed conversion is retried on the next poll
+            self._seen.update(signatures)
+
+            self.status.update(refreshes=self.status['refreshes'] + 1, last_changed=changed, last_error=None,
+                               data_version=data.data_version, figures_kept=kept, figures_dropped=dropped,
+                               refreshed_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+            log.info("data refreshed to %s (changed: %s)", data.data_version, ", ".join(changed))
+            return changed
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh()
+                # Versions the last snapshots held, once they are gone
+                data_store.prune_versions(self.store_dir)
+            except Exception as e:
+                # Keep serving the published version; retry on the next poll
+                self.status['last_error'] = f"{type(e).__name__}: {e}"
+                log.exception("data refresh failed")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='data-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+
+REFRESHER = DataRefresher()
+_start_lock = threading.Lock()
+
+
+def ensure_started():
+    # Starts the poller once per process, unless disabled
+    if REFRESH_SECONDS <= 0:
+        return None
+    with _start_lock:
+        return REFRESHER.start()
@@ -0,0 +1,325 @@
+# Offline HTML snapshots of every dashboard section.
+#
+# Each section, and the season analysis of each state, is rendered in its
+# own worker process. Pages are built with the same loaders and figure
+# builders as the live app and written as standalone HTML with plotly.js
+# inlined; the hotspots page embeds the folium map. Interactive panels
+# (nearby sites, crowding simulation, itinerary) are shown at their
+# default settings; the live gate feed is left out. Figures are also
+# exported as PNG when kaleido is installed. Per-page timings are printed,
+# and index.html links every page.
+#
+#   python report.py                          # reports/<date>/
+#   python report.py --out /srv/snapshots/nightly --workers 4 --images
+import argparse
+import html
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+# First: quiets Streamlit before the dashboard modules load
+import report_bootstrap  # noqa: F401
+import boundaries
+import crowding
+import insight_engine
+import itinerary
+import loaders
+import map_clustering
+import timeseries
+from metrics import derived_metrics
+from sections import SECTIONS
+from sections import art_forms, hotspots, insights, overview, responsible_tourism, trends
+
+# Rows of the art forms matrix included in the snapshot
+MATRIX_ROWS = 100
+
+STYLE = """
+body { font-family: sans-serif; margin: 2rem auto; max-width: 1200px; color: #222; }
+h1 { color: #FF6B35; }
+h2 { color: #2E86AB; border-bottom: 3px solid #F18F01; padding-bottom: 0.3rem; }
+table { border-collapse: collapse; margin: 1rem 0; }
+th, td { border: 1px solid #ddd; padding: 0.3rem 0.6rem; text-align: left; }
+.insight-box { background: #f8f9fa; padding: 1rem; border-left: 4px solid #FF6B35; margin: 1rem 0; }
+.markdown { white-space: pre-line; }
+.caption { color: #666; font-size: 0.9rem; }
+"""
+
+
+def slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+class Page:
+    # Accumulates one standalone HTML page
+    def __init__(self, title, name, out_dir, images=False):
+        self.title = title
+        self.name = name
+        self.out_dir = Path(out_dir)
+        self.images = images
+        self.parts = []
+        self.n_figures = 0
+
+    def heading(self, text):
+        self.parts.append(f"<h2>{html.escape(text)}</h2>")
+
+    def text(self, text, css='caption'):
+        self.parts.append(f'<p class="{css}">{html.escape(text)}</p>')
+
+    def raw(self, markup):
+        self.parts.append(markup)
+
+    def table(self, df):
+        self.parts.append(df.to_html(index=False, border=0))
+
+    def figure(self, fig, chart_id):
+        # plotly.js is inlined once per page
+        self.parts.append(fig.to_html(full_html=False, include_plotlyjs=self.n_figures == 0))
+        self.n_figures += 1
+        if self.images:
+            fig.write_image(self.out_dir / f"{self.name}-{chart_id}.png", width=1000, height=600)
+
+    def map(self, folium_map):
+        doc = folium_map.get_root().render()
+        self.parts.append(f'<iframe srcdoc="{html.escape(doc)}" width="100%" height="520" '
+                          f'style="border:0"></iframe>')
+
+    def write(self):
+        path = self.out_dir / f"{self.name}.html"
+        path.write_text(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(self.title)}"
+                        f"</title><style>{STYLE}</style></head><body><h1>{html.escape(self.title)}</h1>"
+                        + "\n".join(self.parts) + "</body></html>", encoding='utf-8')
+        return path
+
+
+def overview_page(data, page):
+    page.heading("State-wise Cultural Investment")
+    page.figure(overview.budget_allocation_figure(data.cultural_sites), 'budget_allocation')
+    page.heading("Tourism vs Art Forms Correlation")
+    page.figure(overview.tourism_art_forms_figure(data.cultural_sites), 'tourism_art_forms')
+
+
+def art_forms_page(data, page):
+    page.heading("Art Form Practitioners")
+    page.figure(art_forms.practitioners_figure(data.art_forms), 'practitioners')
+    page.heading("Economic Impact of Art Forms")
+    page.figure(art_forms.revenue_figure(data.art_forms), 'revenue')
+
+    page.heading("Art Forms Performance Matrix")
+    scored = derived_metrics(data).art_forms
+    top = scored.sort_values('Performance_Score', ascending=False, kind='stable').head(MATRIX_ROWS)
+    page.table(art_forms.format_page(top))
+    page.text(f"Top {len(top):,} of {len(scored):,} art forms by Performance_Score")
+
+
+def hotspots_page(data, page):
+    page.heading("Interactive Cultural Sites Map")
+    zoom = map_clustering.DEFAULT_ZOOM
+    bounds = map_clustering.default_bounds(map_clustering.INDIA_CENTER, zoom, 700, 500)
+    layer_json = map_clustering.cluster_layer_json(data.cultural_sites, zoom,
+                                                   map_clustering.viewport_tiles(bounds, zoom))
+    m, sites_layer = hotspots.sites_map(layer_json)
+    if boundaries.boundaries_available(data.store.path):
+        level = boundaries.level_for_zoom(zoom)
+        layer = boundaries.choropleth_layer_json(boundaries.load_geometries(level, data.store.path),
+                                                 data.cultural_sites)
+        hotspots.choropleth_layer(layer).add_to(m)
+    sites_layer.add_to(m)
+    page.map(m)
+
+    page.heading("Nearby Sites")
+    origin = sorted(data.cultural_sites['State'].unique())[0]
+    nearby, nearest = hotspots.nearby_tables(data.cultural_sites,
+                                             loaders.load_site_index(data.cultural_sites, data.data_version),
+                                             origin, hotspots.NEARBY_RADIUS_KM, hotspots.NEARBY_K)
+    page.text(f"Sites within {hotspots.NEARBY_RADIUS_KM:,} km of {origin}")
+    page.table(nearby)
+    page.text(f"Nearest {hotspots.NEARBY_K} UNESCO sites to {origin}")
+    page.table(nearest)
+
+    page.heading("Tourist Volume Distribution")
+    page.figure(hotspots.tourist_volume_figure(data.cultural_sites), 'tourist_volume')
+    page.heading("Underexplored Destinations")
+    page.figure(hotspots.underexplored_figure(derived_metrics(data).underexplored), 'underexplored')
+
+
+def _footfall(page, data, state):
+    sample = timeseries.footfall_is_sample(data.store.path)
+    dates, visitors = timeseries.daily_totals(state, store_dir=data.store.path)
+    x, y = timeseries.downsample(dates, visitors)
+    page.figure(trends.footfall_figure(x, y, state or 'All states', sample), 'daily_footfall')
+    page.text(f"{len(visitors):,} days · {len(y):,} points plotted" + (f" · {timeseries.SAMPLE_NOTE}" if sample else ""))
+
+
+def _season(page, peak_months, peak_data, off_peak_months, opportunity_data, peak_sample=False, sample=False):
+    page.heading("Peak Season Analysis")
+    page.text(f"Peak Months: {', '.join(peak_months)}")
+    page.figure(trends.peak_season_figure(peak_data, peak_sample), 'peak_season')
+    page.heading("Off-Peak Opportunities")
+    page.text(f"Off-Peak Months: {', '.join(off_peak_months)}")
+    page.figure(trends.off_peak_figure(opportunity_data, sample), 'off_peak')
+
+
+def trends_page(data, page):
+    page.heading("Monthly Tourism Patterns")
+    page.figure(trends.seasonality_figure(data.tourism_trends), 'seasonality')
+    page.heading("Daily Footfall")
+    headroom = None
+    if timeseries.footfall_available(data.store.path):
+        _footfall(page, data, None)
+        headroom = trends.load_headroom(data.data_version, data.store.path)
+    else:
+        page.text(timeseries.MISSING_NOTE)
+    _season(page, *trends.national_season(derived_metrics(data), headroom),
+            sample=timeseries.footfall_is_sample(data.store.path))
+
+
+def responsible_tourism_page(data, page):
+    page.heading("State-wise Sustainability Performance")
+    page.figure(responsible_tourism.sustainability_radar_figure(data.sustainability_data), 'sustainability_radar')
+    page.heading("Community Impact Analysis")
+    page.figure(responsible_tourism.community_impact_figure(data.sustainability_data), 'community_impact')
+    page.heading("Sustainability Champions")
+    page.figure(responsible_tourism.champions_figure(derived_metrics(data).champions), 'champions')
+
+    page.heading("🚦 Crowd & Carrying Capacity Simulation")
+    params = crowding.DEFAULT_PARAMS
+    monthly, summary = crowding.crowding_risk(data.cultural_sites, data.tourism_trends, params, data.store.path)
+    page.table(pd.DataFrame([(label, value) for label, value, _ in
+                             responsible_tourism.crowding_metrics(monthly, summary)], columns=['Metric', 'Value']))
+    page.figure(responsible_tourism.crowding_heatmap_figure(monthly), 'crowding_heatmap')
+    page.figure(responsible_tourism.overflow_days_figure(summary), 'overflow_days')
+    page.text(f"{params.scenarios:,} simulated years per site · capacity {params.capacity_factor}× "
+              f"peak-month average · variability {params.variability}")
+
+
+def insights_page(data, page):
+    computed = insight_engine.compute_insights(data, derived_metrics(data))
+    page.heading("🔍 Data-Driven Insights")
+    page.raw(insight_engine.insight_box_html("🎯 High-Impact Opportunities", computed.opportunities)
+             + insight_engine.insight_box_html("⚠️ Critical Challenges", computed.challenges))
+    page.heading("Correlations Across State-Level Measures")
+    page.figure(insights.correlation_figure(computed.correlations), 'correlations')
+    page.table(computed.top_pairs)
+
+    page.heading("🧭 Plan a Cultural Circuit")
+    plan = itinerary.plan_itinerary(data.cultural_sites, data.data_version, insights.ITINERARY_INTERESTS,
+                                    insights.ITINERARY_DAYS)
+    if plan is None:
+        page.text("No sites for the current filters.")
+    else:
+        page.text(f"{len(plan.stops)} stops over {plan.days} days · {plan.total_km:,.0f} km · "
+                  f"{plan.travel_hours:,.1f} h on the road · interests: "
+                  + ", ".join(itinerary.INTERESTS[key][0] for key in insights.ITINERARY_INTERESTS))
+        page.figure(insights.route_figure(plan.stops), 'itinerary_route')
+        page.table(plan.stops[insights.STOP_COLUMNS])
+    page.heading("🚀 Strategic Recommendations")
+    for label, content in insights.RECOMMENDATIONS:
+        page.raw(f"<h3>{html.escape(label)}</h3>")
+        page.text(content.strip(), css='markdown')
+    page.heading("📈 Implementation Roadmap")
+    page.table(insights.roadmap_table())
+    page.heading("📊 Success Metrics Dashboard")
+    page.table(pd.DataFrame(computed.success_metrics, columns=['Metric', 'Current', 'Target', 'Definition']).fillna(''))
+
+
+def state_page(data, page, state):
+    state_seasonality = trends.load_state_seasonality(data.data_version, data.store.path)
+    headroom = trends.load_headroom(data.data_version, data.store.path)
+    page.heading("Daily Footfall")
+    _footfall(page, data, state)
+    sample = timeseries.footfall_is_sample(data.store.path)
+    _season(page, *trends.state_season(derived_metrics(data), state_seasonality, headroom, state), sample, sample)
+
+
+# Section module name -> page builder
+SECTION_PAGES = {
+    overview.SECTION: overview_page,
+    art_forms.SECTION: art_forms_page,
+    hotspots.SECTION: hotspots_page,
+    trends.SECTION: trends_page,
+    responsible_tourism.SECTION: responsible_tourism_page,
+    insights.SECTION: insights_page,
+}
+
+_data = None
+
+
+def _init_worker(store_dir):
+    global _data
+    _data = loaders.build_dashboard_data(store_dir)
+
+
+def render_job(job, out_dir, images=False):
+    # job is ('section', label) or ('state', state); returns (title, file, seconds, figures)
+    start = time.perf_counter()
+    kind, value = job
+    if kind == 'section':
+        module = SECTIONS[value].rsplit('.', 1)[-1]
+        page = Page(value, f"section-{module}", out_dir, images)
+        SECTION_PAGES[module](_data, page)
+    else:
+        page = Page(f"Season analysis: {value}", f"state-{slug(value)}", out_dir, images)
+        state_page(_data, page, value)
+    path = page.write()
+    return page.title, path.name, time.perf_counter() - start, page.n_figures
+
+
+def write_index(out_dir, rows, data_version):
+    index = pd.DataFrame(rows, columns=['Page', 'File', 'Seconds', 'Figures'])
+    index['Page'] = [f'<a href="{html.escape(f)}">{html.escape(p)}</a>' for p, f in zip(index['Page'], index['File'])]
+    index['Seconds'] = index['Seconds'].round(2)
+    body = index.drop(columns='File').to_html(index=False, border=0, escape=False)
+    path = Path(out_dir) / "index.html"
+    path.write_text(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Dashboard snapshot</title>"
+                    f"<style>{STYLE}</style></head><body><h1>Dashboard snapshot {date.today()}</h1>"
+                    f"<p class='caption'>Data version {data_version}</p>{body}</body></html>", encoding='utf-8')
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every dashboard section to standalone HTML")
+    parser.add_argument('--out', type=Path, default=Path('reports') / date.today().isoformat())
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--no-states', action='store_true', help="skip the per-state season pages")
+    parser.add_argument('--images', action='store_true', help="also export figures as PNG (needs kaleido)")
+    args = parser.parse_args(argv)
+
+    if args.images:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error("--images needs the kaleido package")
+
+    # Build the store once up front; workers read the same version
+    data = loaders.build_dashboard_data()
+    jobs = [('section', label) for label in SECTIONS]
+    # Per-state pages are built from daily footfall
+    if not args.no_states and timeseries.footfall_available(data.store.path):
+        jobs += [('state', state) for state in sorted(data.cultural_sites['State'].unique())]
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    rows = []
+    # spawn, not fork, for the same reasons as seasonality.decompose
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_init_worker, initargs=(data.store.path,)) as pool:
+        futures = {pool.submit(render_job, job, args.out, args.images): job for job in jobs}
+        for future in as_completed(futures):
+            title, name, seconds, n_figures = future.result()
+            rows.append((title, name, seconds, n_figures))
+            print(f"{title:<45} {seconds:7.2f}s  {n_figures:2d} figures  {name}", flush=True)
+
+    # Sections first, then states, whatever order they finished in
+    rows.sort(key=lambda row: (not row[1].startswith('section-'), row[1]))
+    index = write_index(args.out, rows, data.data_version)
+    print(f"{len(rows)} pages in {time.perf_counter() - start:.2f}s -> {index}")
+
+
+if __name__ == '__main__':
+    main()
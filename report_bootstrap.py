@@ -0,0 +1,10 @@
+# Streamlit setup for report.py, imported before anything else.
+#
+# Cached loaders used outside a Streamlit server warn on every call, in
+# every worker. The config sets the log level when first parsed, so it is
+# parsed here, before the dashboard modules are imported or anything is
+# cached.
+from streamlit import config, logger
+
+config.get_config_options()
+logger.set_log_level('error')
@@ -0,0 +1,143 @@
+# Compact dtypes for the tables the loaders return.
+#
+# Each table has an explicit schema. Labels become categoricals with sorted
+# categories, and months become an ordered Jan..Dec categorical. Counts and
+# scores get the narrowest integer or float that holds their range. Tables
+# are cast from Arrow as they are loaded. Any of the following raises
+# SchemaError instead of being widened or dropped silently:
+# - a missing column,
+# - a null,
+# - a value that does not fit its type,
+# - an unknown month.
+# Memory before and after each load is recorded for the debug panel.
+#
+#   python schemas.py    # validate the store and print the memory saved
+import calendar
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import data_store
+
+MONTHS = list(calendar.month_abbr[1:])
+
+# Table -> column -> 'category', 'month' or an Arrow numeric type name
+SCHEMAS = {
+    'cultural_sites': {
+        'State': 'category',
+        'UNESCO_Sites': 'uint8',
+        'Art_Forms': 'uint16',
+        'Annual_Tourists': 'uint32',
+        'Cultural_Budget': 'float32',
+        # Coordinates stay float64 so the map's GeoJSON carries them exactly
+        'Latitude': 'float64',
+        'Longitude': 'float64',
+    },
+    'tourism_trends': {
+        'Month': 'month',
+        'Cultural_Tourism': 'uint8',
+        'Heritage_Sites': 'uint8',
+        'Art_Festivals': 'uint8',
+    },
+    'art_forms': {
+        'Art_Form': 'category',
+        'Practitioners': 'uint32',
+        'Revenue_Crores': 'float32',
+        'Tourism_Impact': 'uint8',
+    },
+    'sustainability_data': {
+        'State': 'category',
+        'Eco_Score': 'float32',
+        'Community_Participation': 'uint8',
+        'Cultural_Preservation': 'uint8',
+        'Local_Employment': 'uint8',
+    },
+}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+# Table -> (bytes as loaded before, bytes compact, rows) for the last load
+_memory = {}
+_memory_lock = threading.Lock()
+
+
+def _types(arrow_type):
+    # Dictionary columns become pandas categoricals, everything else stays
+    # Arrow-backed
+    return None if pa.types.is_dictionary(arrow_type) else pd.ArrowDtype(arrow_type)
+
+
+def compact(name, table, columns=None):
+    # Arrow table -> validated DataFrame with the table's compact dtypes
+    schema = SCHEMAS[name]
+    expected = schema if columns is None else [c for c in columns if c in schema]
+    missing = [c for c in expected if c not in table.column_names]
+    if missing:
+        raise SchemaError(f"{name}: missing columns {', '.join(missing)}")
+
+    arrays = []
+    for column in table.column_names:
+        values = table[column]
+        kind = schema.get(column)
+        if kind is None:
+            arrays.append(values)
+            continue
+        if values.null_count:
+            raise SchemaError(f"{name}.{column}: {values.null_count} null values")
+        if kind == 'month':
+            unknown = pc.filter(values, pc.invert(pc.is_in(values, pa.array(MONTHS))))
+            if len(unknown):
+                raise SchemaError(f"{name}.{column}: unknown months {sorted(set(unknown.to_pylist()))}")
+        if kind in ('category', 'month'):
+            arrays.append(pc.dictionary_encode(values.cast(pa.string())))
+            continue
+        try:
+            arrays.append(values.cast(getattr(pa, kind)(), safe=True))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise SchemaError(f"{name}.{column}: values do not fit {kind} ({e})") from None
+
+    df = pa.Table.from_arrays(arrays, names=table.column_names).combine_chunks().to_pandas(types_mapper=_types)
+    for column in df.columns:
+        kind = schema.get(column)
+        if kind == 'month':
+            df[column] = df[column].cat.set_categories(MONTHS, ordered=True)
+        elif kind == 'category':
+            # Sorted categories make sorting by the column alphabetical
+            df[column] = df[column].cat.reorder_categories(sorted(df[column].cat.categories))
+    return df
+
+
+def load(name, store_dir=None, columns=None, filter=None):
+    table = data_store.load_arrow(name, store_dir, columns, filter)
+    df = compact(name, table, columns)
+    with _memory_lock:
+        _memory[name] = (table.nbytes, int(df.memory_usage(index=False, deep=True).sum()), len(df))
+    return df
+
+
+def memory_rows():
+    with _memory_lock:
+        memory = dict(_memory)
+    return [{'table': name, 'rows': rows, 'arrow_bytes': before, 'compact_bytes': after,
+             'saved_bytes': before - after, 'saved_pct': round((1 - after / before) * 100, 1) if before else 0.0}
+            for name, (before, after, rows) in sorted(memory.items())]
+
+
+def main():
+    data_store.ensure_store()
+    for name in SCHEMAS:
+        table = data_store.load_arrow(name)
+        default = int(table.to_pandas().memory_usage(index=False, deep=True).sum())
+        load(name)
+        _, after, rows = _memory[name]
+        print(f"{name:<20} {rows:>10,} rows  default pandas {default:>12,} B  arrow {table.nbytes:>12,} B  "
+              f"compact {after:>12,} B  ({after / default:.0%} of default)")
+
+
+if __name__ == '__main__':
+    main()
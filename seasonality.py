@@ -0,0 +1,126 @@
+# Batched seasonality engine over the daily footfall table.
+#
+# Footfall is pivoted into one (series x days) matrix and every series is
+# decomposed at once: a centered 365-day moving average for the trend, the
+# month-of-year mean of the detrended values for the seasonal part, and
+# whatever is left as the residual. The monthly level is the series' mean
+# trend plus the month's seasonal part, so growth over the window doesn't
+# favour the later months. It is turned into the same "100 = peak" index
+# the dashboard uses, and peak / off-peak months are picked with the
+# thresholds from metrics.py. Large matrices are split by rows across a
+# process pool.
+import calendar
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import data_store
+from metrics import OFF_PEAK_THRESHOLD, PEAK_THRESHOLD
+from timeseries import FOOTFALL_TABLE, date_filter
+
+MONTHS = list(calendar.month_abbr[1:])
+TREND_WINDOW = 365
+# Matrices with more cells than this are decomposed in a process pool
+PARALLEL_MIN_CELLS = 20_000_000
+
+Decomposition = namedtuple('Decomposition', ['trend', 'seasonal', 'residual', 'month_index'])
+
+
+def footfall_matrix(by='State', start=None, end=None, store_dir=None, states=None):
+    # Daily visitors as a (labels x days) matrix; missing days are zero.
+    # A scope without footfall gives no labels and no days.
+    dataset = data_store.open_dataset(FOOTFALL_TABLE, store_dir)
+    table = dataset.to_table(columns=[by, 'Date', 'Visitors'], filter=date_filter(start, end, states))
+    if table.num_rows == 0:
+        return np.array([], dtype=object), np.array([], dtype='datetime64[D]'), np.zeros((0, 0))
+    codes = table[by].combine_chunks().dictionary_encode()
+    labels = np.asarray(codes.dictionary.to_pylist(), dtype=object)
+    days = table['Date'].to_numpy().astype('datetime64[D]')
+
+    first = days.min()
+    n_days = int((days.max() - first).astype(np.int64)) + 1
+    cell = codes.indices.to_numpy().astype(np.int64) * n_days + (days - first).astype(np.int64)
+    matrix = np.bincount(cell, weights=table['Visitors'].to_numpy(), minlength=len(labels) * n_days)
+
+    order = np.argsort(labels)
+    dates = first + np.arange(n_days)
+    return labels[order], dates, matrix.reshape(len(labels), n_days)[order]
+
+
+def moving_average(matrix, window):
+    # Centered moving average along each row, with shrinking edge windows
+    n = matrix.shape[1]
+    cumsum = np.zeros((matrix.shape[0], n + 1))
+    np.cumsum(matrix, axis=1, out=cumsum[:, 1:])
+    idx = np.arange(n)
+    lo = np.clip(idx - window // 2, 0, n)
+    hi = np.clip(idx + window // 2 + 1, 0, n)
+    return (cumsum[:, hi] - cumsum[:, lo]) / (hi - lo)
+
+
+def month_one_hot(dates):
+    months = dates.astype('datetime64[M]').astype(np.int64) % 12
+    one_hot = np.zeros((len(dates), 12))
+    one_hot[np.arange(len(dates)), months] = 1.0
+    return months, one_hot
+
+
+def _decompose_rows(args):
+    matrix, dates, window = args
+    months, one_hot = month_one_hot(dates)
+    counts = np.maximum(one_hot.sum(axis=0), 1)
+
+    trend = moving_average(matrix, window)
+    # Edge windows are one-sided and lag a growing trend, so the month means
+    # only use days with a full window when every month has some
+    half = window // 2
+    day = np.arange(len(dates))
+    full = one_hot * ((day >= half) & (day < len(dates) - half))[:, None]
+    if full.sum(axis=0).all():
+        by_month = (matrix - trend) @ full / full.sum(axis=0)
+    else:
+        by_month = (matrix - trend) @ one_hot / counts
+    by_month -= by_month.mean(axis=1, keepdims=True)
+    seasonal = by_month[:, months]
+    residual = matrix - trend - seasonal
+
+    # Seasonal pattern on a flat trend
+    level = np.clip(trend.mean(axis=1, keepdims=True) + by_month, 0, None)
+    peak_level = level.max(axis=1, keepdims=True)
+    month_index = np.divide(level * 100, peak_level, out=np.zeros_like(level), where=peak_level > 0)
+    return trend, seasonal, residual, month_index
+
+
+def decompose(matrix, dates, window=TREND_WINDOW, workers=None):
+    if matrix.size < PARALLEL_MIN_CELLS or matrix.shape[0] < 2:
+        return Decomposition(*_decompose_rows((matrix, dates, window)))
+
+    workers = workers or os.cpu_count() or 1
+    chunks = np.array_split(matrix, min(workers, matrix.shape[0]))
+    # spawn, not fork: the Streamlit server process is multi-threaded
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        parts = list(pool.map(_decompose_rows, [(chunk, dates, window) for chunk in chunks]))
+    return Decomposition(*(np.concatenate(part) for part in zip(*parts)))
+
+
+def peak_windows(month_index, peak=PEAK_THRESHOLD, off_peak=OFF_PEAK_THRESHOLD):
+    return month_index >= peak, month_index < off_peak
+
+
+def monthly_seasonality(by='State', start=None, end=None, store_dir=None, states=None):
+    # Long frame: one row per (label, month) with the seasonal index and
+    # peak / off-peak flags, for every label at once
+    labels, dates, matrix = footfall_matrix(by, start, end, store_dir, states)
+    month_index = decompose(matrix, dates).month_index if len(labels) else np.zeros((0, 12))
+    peak, off_peak = peak_windows(month_index)
+    return pd.DataFrame({
+        by: np.repeat(labels, 12),
+        'Month': np.tile(MONTHS, len(labels)),
+        'Index': month_index.round(1).ravel(),
+        'Peak': peak.ravel(),
+        'Off_Peak': off_peak.ravel(),
+    })
@@ -0,0 +1,29 @@
+# Dashboard sections, one module each. Modules are imported the first time
+# their section is opened, so plotting and mapping libraries are only loaded
+# by the sections that use them.
+import importlib
+import sys
+import time
+
+SECTIONS = {
+    "🏠 Overview": "sections.overview",
+    "🎨 Traditional Art Forms": "sections.art_forms",
+    "🗺️ Cultural Hotspots Mapping": "sections.hotspots",
+    "📊 Tourism Trends & Seasonality": "sections.trends",
+    "🌱 Responsible Tourism": "sections.responsible_tourism",
+    "💡 Insights & Recommendations": "sections.insights",
+}
+
+# Section label -> seconds spent importing it in this process
+IMPORT_TIMES = {}
+
+
+def load_section(label):
+    module_name = SECTIONS[label]
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES[label] = time.perf_counter() - start
+    return module
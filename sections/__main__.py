@@ -0,0 +1,51 @@
+# Startup-time report: cold import cost of each section.
+#
+#   python -m sections
+#
+# Every section is imported in a fresh interpreter, after the top-level
+# imports of cultural_tourism_app.py (read from the file, so the baseline
+# follows the app), so the numbers are what a cold pod pays on the first
+# visit to that section.
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+from sections import SECTIONS
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "cultural_tourism_app.py"
+
+PROBE = """
+import time
+{shell}
+start = time.perf_counter()
+{body}
+print(time.perf_counter() - start)
+"""
+
+
+def shell_imports(app=APP):
+    # The app's top-level import statements: what it loads before any
+    # section
+    tree = ast.parse(Path(app).read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def cold_import_time(body, shell=None):
+    shell = shell_imports() if shell is None else shell
+    result = subprocess.run([sys.executable, "-c", PROBE.format(shell=shell, body=body)],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    shell = shell_imports()
+    print(f"{'Section':<36}{'cold import (ms)':>18}")
+    print(f"{'App shell':<36}{cold_import_time(shell, shell='') * 1000:>18.1f}")
+    for label, module in SECTIONS.items():
+        print(f"{label:<36}{cold_import_time(f'import {module}', shell) * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
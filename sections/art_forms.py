@@ -0,0 +1,144 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+import insight_engine
+from figure_cache import cached_figure
+from formatting import thousands
+from instrumentation import plotly_chart
+from metrics import derived_metrics
+
+SECTION = 'art_forms'
+MATRIX_COLUMNS = ['Art_Form', 'Practitioners', 'Revenue_Crores', 'Tourism_Impact', 'Performance_Score']
+PAGE_SIZES = [25, 50, 100]
+
+
+def practitioners_figure(art_forms):
+    fig = px.pie(art_forms, 
+                values='Practitioners', 
+                names='Art_Form',
+                title="Distribution of Art Form Practitioners",
+                color_discrete_sequence=px.colors.qualitative.Set3)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=400)
+    return fig
+
+
+def revenue_figure(art_forms):
+    fig = px.bar(art_forms.sort_values('Revenue_Crores', ascending=True),
+                x='Revenue_Crores', 
+                y='Art_Form',
+                orientation='h',
+                title="Revenue Generation by Art Form (₹ Crores)",
+                color='Tourism_Impact',
+                color_continuous_scale='RdYlBu')
+    fig.update_layout(height=400)
+    return fig
+
+
+# Display order of the matrix rows matching query, sorted on the typed
+# column; cached so paging through a large catalogue doesn't re-sort
+@st.cache_data(max_entries=64)
+def matrix_order(_scored, data_version, query, sort_by, descending):
+    positions = np.arange(len(_scored))
+    if query:
+        matches = _scored['Art_Form'].str.contains(query, case=False, regex=False)
+        positions = positions[matches.to_numpy(dtype=bool, na_value=False)]
+    keys = pd.Series(_scored[sort_by].array[positions], index=positions)
+    return keys.sort_values(ascending=not descending, kind='stable', na_position='last').index.to_numpy()
+
+
+def format_page(page):
+    # Only the rows on screen are turned into display strings
+    revenue = page['Revenue_Crores'].to_numpy(dtype=np.float64, na_value=0)
+    return pd.DataFrame({
+        'Art_Form': page['Art_Form'].to_numpy(),
+        'Practitioners': thousands(page['Practitioners'].to_numpy(dtype=np.int64, na_value=0)),
+        'Revenue_Crores': thousands(revenue, prefix='₹', decimals=0 if (revenue % 1 == 0).all() else 2),
+        'Tourism_Impact': page['Tourism_Impact'].to_numpy(),
+        'Performance_Score': page['Performance_Score'].to_numpy(),
+    })
+
+
+# Sorting, filtering and paging happen here on the server; a page change
+# reruns only this fragment and sends only that page
+@st.fragment
+def performance_matrix(data):
+    # Performance scores are precomputed per data version
+    scored = derived_metrics(data).art_forms
+    
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        query = st.text_input("Filter art forms", key='matrix_query').strip()
+    with col2:
+        sort_by = st.selectbox("Sort by", MATRIX_COLUMNS, index=MATRIX_COLUMNS.index('Performance_Score'),
+                               key='matrix_sort')
+    with col3:
+        descending = st.toggle("Descending", value=True, key='matrix_descending')
+    with col4:
+        page_size = st.selectbox("Rows", PAGE_SIZES, key='matrix_page_size')
+    
+    order = matrix_order(scored, data.data_version, query, sort_by, descending)
+    n_pages = max(1, -(-len(order) // page_size))
+    # A narrower filter can leave the remembered page past the end
+    if st.session_state.get('matrix_page', 1) > n_pages:
+        st.session_state['matrix_page'] = n_pages
+    
+    page = st.session_state.get('matrix_page', 1)
+    rows = order[(page - 1) * page_size:page * page_size]
+    st.dataframe(format_page(scored.iloc[rows]), hide_index=True, use_container_width=True)
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        st.number_input("Page", min_value=1, max_value=n_pages, key='matrix_page')
+    with col2:
+        st.caption(f"{len(order):,} of {len(scored):,} art forms · page {page} of {n_pages}")
+
+
+def render(data):
+    art_forms = data.art_forms
+    
+    st.markdown('<h2 class="section-header">Traditional Art Forms Analysis</h2>', unsafe_allow_html=True)
+    
+    # Ensure data is available
+    if not art_forms.empty:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Art Form Practitioners")
+            fig = cached_figure(SECTION, 'practitioners', data.data_version,
+                                lambda: practitioners_figure(art_forms))
+            plotly_chart(fig, SECTION, 'practitioners', use_container_width=True)
+        
+        with col2:
+            st.subheader("Economic Impact of Art Forms")
+            fig = cached_figure(SECTION, 'revenue', data.data_version,
+                                lambda: revenue_figure(art_forms))
+            plotly_chart(fig, SECTION, 'revenue', use_container_width=True)
+    else:
+        st.error("Data loading issue. Please refresh the page.")
+    
+    # Detailed art forms table
+    st.subheader("Art Forms Performance Matrix")
+    
+    try:
+        performance_matrix(data)
+        
+    except Exception as e:
+        st.error(f"Error processing performance data: {str(e)}")
+        st.dataframe(art_forms.head(PAGE_SIZES[0]), use_container_width=True)
+    
+    # Insights box
+    
+    st.markdown("""
+<style>
+.insight-box {
+    color: black;
+}
+</style>
+""", unsafe_allow_html=True)
+    # Computed from the scored art forms of this data version
+    items = insight_engine.art_form_insights(derived_metrics(data).art_forms)
+    if items:
+        st.markdown(insight_engine.insight_box_html("🔍 Key Insights", items), unsafe_allow_html=True)
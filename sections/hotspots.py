@@ -0,0 +1,215 @@
+import streamlit as st
+import plotly.express as px
+import folium
+from folium.utilities import JsCode
+from streamlit_folium import st_folium
+
+import boundaries
+import map_clustering
+from figure_cache import cached_figure
+from instrumentation import payload, plotly_chart, timed
+from loaders import load_site_index
+from metrics import derived_metrics
+
+SECTION = 'hotspots'
+# Nearby panel defaults, also used by the offline report
+NEARBY_RADIUS_KM = 500
+NEARBY_K = 5
+NEARBY_COLUMNS = ['State', 'UNESCO_Sites', 'Art_Forms', 'Annual_Tourists']
+
+
+# Clustered site layer for one viewport; keyed by data version, zoom and the
+# viewport snapped to map tiles so nearby pans reuse the same payload
+@st.cache_data(max_entries=256)
+def load_map_layer(_cultural_sites, _site_index, data_version, zoom, tiles):
+    # Only the sites under the tile range are clustered
+    visible = _site_index.bbox(map_clustering.tile_bounds(tiles, zoom))
+    return map_clustering.cluster_layer_json(_cultural_sites.iloc[visible], zoom, tiles)
+
+
+# Boundary geometries of one simplification level, decoded and serialized
+# once per process and boundary export: filters and refreshes of other
+# tables don't change them
+@st.cache_resource(max_entries=8)
+def load_boundary_geometries(boundary_digest, _store_dir, level):
+    return boundaries.load_geometries(level, _store_dir)
+
+
+# State choropleth at the level that fits the zoom. The coarsest level is
+# the whole country; finer ones only carry the states under the viewport
+# tiles, like the site layer.
+@st.cache_data(max_entries=64)
+def load_choropleth_layer(_cultural_sites, data_version, store_dir, level, zoom, tiles):
+    bounds = map_clustering.tile_bounds(tiles, zoom) if level > 0 else None
+    geometries = load_boundary_geometries(boundaries.boundary_digest(store_dir), store_dir, level)
+    return boundaries.choropleth_layer_json(geometries, _cultural_sites, bounds)
+
+
+def choropleth_layer(layer_json):
+    states_layer = folium.FeatureGroup(name="States")
+    folium.GeoJson(
+        layer_json,
+        on_each_feature=JsCode("""
+        function(feature, layer) {
+            layer.setStyle({
+                color: '#555555',
+                weight: 1,
+                fillColor: feature.properties.color,
+                fillOpacity: 0.45
+            });
+        }
+        """),
+        tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False)
+    ).add_to(states_layer)
+    return states_layer
+
+
+def sites_map(layer_json):
+    # Create base map; clustered sites are added as one dynamic layer so
+    # the map itself is not reloaded when the viewport changes
+    m = folium.Map(location=list(map_clustering.INDIA_CENTER), zoom_start=map_clustering.DEFAULT_ZOOM)
+    sites_layer = folium.FeatureGroup(name="Cultural sites")
+    folium.GeoJson(
+        layer_json,
+        marker=folium.CircleMarker(fill=True),
+        # Style each marker in the browser from its own properties
+        on_each_feature=JsCode("""
+        function(feature, layer) {
+            layer.setStyle({
+                color: feature.properties.color,
+                fillColor: feature.properties.color,
+                fillOpacity: 0.7,
+                radius: feature.properties.radius
+            });
+        }
+        """),
+        popup=folium.GeoJsonPopup(fields=['popup'], labels=False),
+        tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False)
+    ).add_to(sites_layer)
+    return m, sites_layer
+
+
+# The hotspots map and everything that depends on its viewport. Running it
+# as a fragment means a pan or zoom reruns only this function.
+@st.fragment
+def hotspots_map(cultural_sites, data_version, store_dir):
+    site_index = load_site_index(cultural_sites, data_version)
+    # Work out the visible viewport from the last map interaction
+    map_state = st.session_state.get('hotspots_map') or {}
+    zoom = int(map_state.get('zoom') or map_clustering.DEFAULT_ZOOM)
+    bounds = map_clustering.bounds_from_state(map_state) or map_clustering.default_bounds(
+        map_clustering.INDIA_CENTER, zoom, 700, 500)
+    tiles = map_clustering.viewport_tiles(bounds, zoom)
+    with timed('map_layer', SECTION, 'hotspots_map'):
+        layer_json = load_map_layer(cultural_sites, site_index, data_version, zoom, tiles)
+    payload('map_layer', len(layer_json), SECTION, 'hotspots_map')
+    
+    m, sites_layer = sites_map(layer_json)
+    layers = [sites_layer]
+    
+    # States shaded by tourist volume, under the site markers
+    if boundaries.boundaries_available(store_dir):
+        level = boundaries.level_for_zoom(zoom)
+        # Tiles only matter below the coarsest level
+        view = (zoom, tiles) if level > 0 else (None, None)
+        with timed('map_layer', SECTION, 'choropleth'):
+            states_json = load_choropleth_layer(cultural_sites, data_version, store_dir, level, *view)
+        payload('map_layer', len(states_json), SECTION, 'choropleth')
+        layers.insert(0, choropleth_layer(states_json))
+    
+    # Display map
+    with timed('map_render', SECTION, 'hotspots_map'):
+        st_folium(m, key='hotspots_map', width=700, height=500,
+                  feature_group_to_add=layers,
+                  returned_objects=['zoom', 'bounds'])
+    
+    in_view = site_index.bbox(bounds)
+    st.caption(f"{len(in_view):,} sites in view · "
+               f"{int(cultural_sites['Annual_Tourists'].iloc[in_view].sum()):,} annual tourists · zoom {zoom}")
+
+
+def nearby_tables(cultural_sites, site_index, origin, radius_km, k):
+    # (sites within radius_km, k nearest UNESCO sites) around the centre of
+    # the origin state's sites
+    at_origin = cultural_sites['State'] == origin
+    lat = float(cultural_sites.loc[at_origin, 'Latitude'].mean())
+    lon = float(cultural_sites.loc[at_origin, 'Longitude'].mean())
+    found, distance = site_index.within(lat, lon, radius_km)
+    nearby = cultural_sites[NEARBY_COLUMNS].iloc[found].assign(Distance_km=distance.round(1))
+    unesco = cultural_sites['UNESCO_Sites'].to_numpy() > 0
+    found, distance = site_index.nearest(lat, lon, k, mask=unesco)
+    nearest = cultural_sites[NEARBY_COLUMNS].iloc[found].assign(Distance_km=distance.round(1))
+    return nearby, nearest
+
+
+# Sites around a chosen state, answered from the shared spatial index
+@st.fragment
+def nearby_panel(cultural_sites, data_version):
+    site_index = load_site_index(cultural_sites, data_version)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        origin = st.selectbox("Around", sorted(cultural_sites['State'].unique()), key='nearby_origin')
+    with col2:
+        radius_km = st.slider("Within (km)", 50, 2000, NEARBY_RADIUS_KM, step=50, key='nearby_radius')
+    with col3:
+        k = st.number_input("Nearest UNESCO sites", 1, 20, NEARBY_K, key='nearby_k')
+    
+    nearby, nearest = nearby_tables(cultural_sites, site_index, origin, radius_km, k)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"**Sites within {radius_km:,} km**")
+        st.dataframe(nearby, hide_index=True, use_container_width=True)
+    with col2:
+        st.markdown(f"**Nearest {k} UNESCO sites**")
+        st.dataframe(nearest, hide_index=True, use_container_width=True)
+
+
+def tourist_volume_figure(cultural_sites):
+    fig = px.box(cultural_sites, 
+                y='Annual_Tourists',
+                title="Distribution of Annual Tourists Across States")
+    fig.update_layout(yaxis_title="Annual Tourists")
+    return fig
+
+
+def underexplored_figure(underexplored):
+    # underexplored comes sorted by Potential_Score from the metrics layer
+    return px.bar(underexplored,
+                  x='Potential_Score',
+                  y='State',
+                  orientation='h',
+                  title="Hidden Gems - High Potential, Low Tourism",
+                  color='Art_Forms',
+                  color_continuous_scale='Viridis')
+
+
+def render(data):
+    cultural_sites = data.cultural_sites
+    data_version = data.data_version
+    
+    st.markdown('<h2 class="section-header">Cultural Hotspots & Geographic Distribution</h2>', unsafe_allow_html=True)
+    
+    # Interactive map
+    st.subheader("Interactive Cultural Sites Map")
+    
+    # Map interactions only rerun this fragment, not the whole dashboard
+    hotspots_map(cultural_sites, data_version, data.store.path)
+    
+    st.subheader("Nearby Sites")
+    nearby_panel(cultural_sites, data_version)
+    
+    # Analysis below map
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Tourist Volume Distribution")
+        fig = cached_figure(SECTION, 'tourist_volume', data_version,
+                            lambda: tourist_volume_figure(cultural_sites))
+        plotly_chart(fig, SECTION, 'tourist_volume', use_container_width=True)
+    
+    with col2:
+        st.subheader("Underexplored Destinations")
+        fig = cached_figure(SECTION, 'underexplored', data_version,
+                            lambda: underexplored_figure(derived_metrics(data).underexplored))
+        plotly_chart(fig, SECTION, 'underexplored', use_container_width=True)
@@ -0,0 +1,265 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import insight_engine
+import itinerary
+import timeseries
+from figure_cache import cached_figure
+from instrumentation import plotly_chart, timed
+from metrics import derived_metrics
+
+SECTION = 'insights'
+# Itinerary planner defaults, also used by the offline report
+ITINERARY_INTERESTS = ['heritage', 'arts']
+ITINERARY_DAYS = 4
+STOP_COLUMNS = ['Day', 'Stop', 'State', 'UNESCO_Sites', 'Art_Forms', 'Distance_Km', 'Travel_Hours']
+
+
+# The content below is shared with the offline report (report.py)
+RECOMMENDATIONS = [
+    ("🗺️ Geographic Diversification", """
+            ### Geographic Diversification Strategy
+            
+            **Priority 1: Northeast Circuit Development**
+            - Create dedicated Northeast cultural circuit
+            - Partner with local communities for authentic experiences
+            - Develop infrastructure gradually to maintain authenticity
+            - Target: 200% increase in Northeast tourism by 2027
+            
+            **Priority 2: Tier-2 Cultural Cities**
+            - Promote lesser-known cultural centers
+            - Develop theme-based circuits (textile, music, dance)
+            - Create quality accommodation and transport links
+            - Target: 150% growth in Tier-2 city cultural tourism
+            
+            **Implementation Timeline:** 24 months  
+            **Investment Required:** ₹2,500 crores  
+            **Expected ROI:** 340% over 5 years
+            """),
+    ("📅 Seasonal Management", """
+            ### Seasonal Management Strategy
+            
+            **Off-Peak Incentivization**
+            - 30% discount on accommodation during off-peak months
+            - Special monsoon cultural festivals
+            - Winter art workshops and residencies
+            - Target: 40% reduction in seasonal variation
+            
+            **Festival Calendar Optimization**
+            - Distribute major cultural events across the year
+            - Create new festivals during low seasons
+            - Promote regional harvest festivals
+            - Target: Balanced monthly distribution by 2026
+            
+            **Weather-Independent Experiences**
+            - Indoor cultural centers and museums
+            - Covered art galleries and performance spaces
+            - All-weather cultural experiences
+            """),
+    ("🤝 Community Engagement", """
+            ### Community Engagement Framework
+            
+            **Local Ownership Model**
+            - Transfer 51% tourism business ownership to communities
+            - Establish community tourism boards
+            - Create profit-sharing mechanisms
+            - Target: 80% community participation by 2026
+            
+            **Skill Development Programs**
+            - Train locals as cultural guides and interpreters
+            - Hospitality and tourism management courses
+            - Traditional craft entrepreneurship programs
+            - Target: 50,000 new skilled jobs
+            
+            **Cultural Preservation Incentives**
+            - Reward communities for maintaining traditions
+            - Document and digitize cultural practices
+            - Support master artisan programs
+            """),
+    ("💻 Digital Innovation", """
+            ### Digital Innovation Roadmap
+            
+            **Virtual Cultural Experiences**
+            - 360° virtual tours of UNESCO sites
+            - AR-enabled cultural storytelling
+            - Online workshops with master artisans
+            - Target: 10M virtual visitors annually
+            
+            **AI-Powered Personalization**
+            - Customized cultural itineraries
+            - Real-time crowd management
+            - Intelligent recommendation systems
+            - Multi-language cultural AI guides
+            
+            **Blockchain for Authenticity**
+            - Verify authentic cultural products
+            - Track community revenue distribution
+            - Certify cultural experiences
+            - Prevent cultural appropriation
+            """),
+]
+
+def roadmap_table():
+    return pd.DataFrame({
+        'Phase': ['Phase 1 (0-6 months)', 'Phase 2 (6-18 months)', 'Phase 3 (18-36 months)'],
+        'Focus Areas': [
+            'Data Collection, Stakeholder Mapping, Pilot Projects',
+            'Infrastructure Development, Community Training, Digital Platform',
+            'Scale-up, Performance Monitoring, Continuous Improvement'
+        ],
+        'Investment (₹ Cr)': [500, 1500, 2000],
+        'Expected Impact': ['Foundation Building', 'Visible Changes', 'Transformational Results']
+    })
+
+
+# Statements and statistics, computed once per data version (filtered
+# views included) and shared by every session
+@st.cache_resource(max_entries=8)
+def load_insights(_data, data_version):
+    with timed('transform', SECTION, 'insights'):
+        return insight_engine.compute_insights(_data, derived_metrics(_data))
+
+
+def correlation_figure(correlations):
+    fig = px.imshow(correlations.round(2),
+                    text_auto=True,
+                    color_continuous_scale='RdBu',
+                    zmin=-1, zmax=1,
+                    aspect='auto',
+                    title="Correlations Across State-Level Measures")
+    fig.update_layout(height=600)
+    return fig
+
+
+def route_figure(stops):
+    fig = go.Figure(go.Scattergeo(
+        lat=stops['Latitude'], lon=stops['Longitude'],
+        mode='lines+markers+text',
+        text=stops['Stop'].astype(str), textposition='top center',
+        hovertext="Day " + stops['Day'].astype(str) + ": " + stops['State'].astype(str),
+        hoverinfo='text',
+        marker=dict(size=9, color=stops['Day'], colorscale='Viridis'),
+        line=dict(width=2, color='#555555')
+    ))
+    fig.update_geos(fitbounds='locations', showcountries=True, resolution=50)
+    fig.update_layout(title="Planned Circuit", margin=dict(l=0, r=0, t=40, b=0), height=450)
+    return fig
+
+
+# Widget changes replan without rerunning the rest of the section
+@st.fragment
+def itinerary_planner(cultural_sites, data_version):
+    st.markdown("#### 🧭 Plan a Cultural Circuit")
+    
+    states = sorted(cultural_sites['State'].unique())
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        interests = st.multiselect("Interests", list(itinerary.INTERESTS), default=ITINERARY_INTERESTS,
+                                   format_func=lambda key: itinerary.INTERESTS[key][0], key='itinerary_interests')
+    with col2:
+        start_state = st.selectbox("Start in", ["Best match"] + states, key='itinerary_start')
+    with col3:
+        days = st.slider("Days", 1, 14, ITINERARY_DAYS, key='itinerary_days')
+        day_hours = st.slider("Touring hours per day", 4, 12, int(itinerary.DAY_HOURS), key='itinerary_hours')
+    
+    if not interests:
+        st.info("Pick at least one interest to plan a circuit.")
+        return
+    
+    with timed('transform', SECTION, 'itinerary'):
+        plan = itinerary.plan_itinerary(cultural_sites, data_version, interests, days,
+                                        None if start_state == "Best match" else start_state, day_hours)
+    if plan is None:
+        st.info(f"No sites in {start_state} for the current filters." if start_state != "Best match"
+                else "No sites for the current filters.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Stops", len(plan.stops), f"over {plan.days} days")
+    with col2:
+        st.metric("Road Distance", f"{plan.total_km:,.0f} km")
+    with col3:
+        st.metric("Time on the Road", f"{plan.travel_hours:,.1f} h")
+    
+    plotly_chart(route_figure(plan.stops), SECTION, 'itinerary_route', use_container_width=True)
+    st.dataframe(plan.stops[STOP_COLUMNS], hide_index=True, use_container_width=True)
+
+
+def render(data):
+    st.markdown('<h2 class="section-header">Strategic Insights & Recommendations</h2>', unsafe_allow_html=True)
+    
+    try:
+        # Key insights
+        st.subheader("🔍 Data-Driven Insights")
+        
+        insight_col1, insight_col2 = st.columns(2)
+        
+        # Add custom CSS to set text color to black
+        st.markdown("""
+    <style>
+.insight-box {
+    color: black;
+}
+</style>
+""", unsafe_allow_html=True)
+        insights = load_insights(data, data.data_version)
+        
+        with insight_col1:
+            st.markdown(insight_engine.insight_box_html("🎯 High-Impact Opportunities", insights.opportunities),
+                        unsafe_allow_html=True)
+        
+        with insight_col2:
+            st.markdown(insight_engine.insight_box_html("⚠️ Critical Challenges", insights.challenges),
+                        unsafe_allow_html=True)
+        
+        with st.expander("🔗 Correlations, movers and anomalies"):
+            if data.sustainability_data.empty:
+                st.info("No sustainability scores for the states picked in the sidebar; "
+                        "the statistics below cover site totals only.")
+            fig = cached_figure(SECTION, 'correlations', data.data_version,
+                                lambda: correlation_figure(insights.correlations))
+            plotly_chart(fig, SECTION, 'correlations', use_container_width=True)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.markdown("**Strongest correlations**")
+                st.dataframe(insights.top_pairs, hide_index=True)
+            with col2:
+                sample = timeseries.SAMPLE_TAG if timeseries.footfall_is_sample(data.store.path) else ""
+                st.markdown(f"**Footfall movers (last year vs the year before){sample}**")
+                st.dataframe(insights.movers.head(insight_engine.TOP_MOVERS), hide_index=True,
+                             column_config={'Change': st.column_config.NumberColumn(format="percent")})
+            with col3:
+                st.markdown(f"**Anomalies (robust |z| ≥ {insight_engine.ANOMALY_Z})**")
+                st.dataframe(insights.anomalies, hide_index=True)
+        
+        # Strategic recommendations
+        st.subheader("🚀 Strategic Recommendations")
+        
+        tabs = st.tabs([label for label, _ in RECOMMENDATIONS])
+        
+        for tab, (label, content) in zip(tabs, RECOMMENDATIONS):
+            with tab:
+                st.markdown(content)
+                if label == "💻 Digital Innovation":
+                    itinerary_planner(data.cultural_sites, data.data_version)
+        
+        # Implementation roadmap
+        st.subheader("📈 Implementation Roadmap")
+        
+        st.table(roadmap_table())
+        
+        # Success metrics
+        st.subheader("📊 Success Metrics Dashboard")
+        
+        for col, (label, value, target, help) in zip(st.columns(len(insights.success_metrics)),
+                                                     insights.success_metrics):
+            with col:
+                st.metric(label, value, target, help=help)
+    
+    except Exception as e:
+        st.error(f"Error loading insights section: {str(e)}")
+        st.write("Please refresh the page or contact support if the issue persists.")
@@ -0,0 +1,90 @@
+import streamlit as st
+import plotly.express as px
+
+import dense_scatter
+from figure_cache import cached_figure
+from instrumentation import plotly_chart
+
+SECTION = 'overview'
+
+
+def budget_allocation_figure(cultural_sites):
+    fig = px.bar(cultural_sites.head(10), 
+                x='State', y='Cultural_Budget',
+                title="Government Cultural Budget Allocation (₹ Crores)",
+                color='Cultural_Budget',
+                color_continuous_scale='Viridis')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+def tourism_art_forms_figure(cultural_sites):
+    # SVG, WebGL or a server-side raster, depending on the number of sites
+    return dense_scatter.scatter(cultural_sites,
+                                 x='Art_Forms', y='Annual_Tourists',
+                                 size='UNESCO_Sites',
+                                 hover_data=['State'],
+                                 title="Traditional Art Forms vs Tourist Footfall",
+                                 color='Cultural_Budget',
+                                 color_continuous_scale='Plasma')
+
+
+def render(data):
+    cultural_sites = data.cultural_sites
+    
+    st.markdown('<h2 class="section-header">Cultural Heritage Overview</h2>', unsafe_allow_html=True)
+    
+    # Key metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown("""
+        <div class="metric-card">
+            <h3>UNESCO Sites</h3>
+            <h2>40+</h2>
+            <p>World Heritage Sites</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+        <div class="metric-card">
+            <h3>Art Forms</h3>
+            <h2>200+</h2>
+            <p>Traditional Art Forms</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown("""
+        <div class="metric-card">
+            <h3>Annual Visitors</h3>
+            <h2>32M+</h2>
+            <p>Cultural Tourists</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown("""
+        <div class="metric-card">
+            <h3>Economic Impact</h3>
+            <h2>₹15,000+</h2>
+            <p>Crores Revenue</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Overview charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("State-wise Cultural Investment")
+        fig = cached_figure(SECTION, 'budget_allocation', data.data_version,
+                            lambda: budget_allocation_figure(cultural_sites))
+        plotly_chart(fig, SECTION, 'budget_allocation', use_container_width=True)
+    
+    with col2:
+        st.subheader("Tourism vs Art Forms Correlation")
+        fig = cached_figure(SECTION, 'tourism_art_forms', data.data_version,
+                            lambda: tourism_art_forms_figure(cultural_sites))
+        plotly_chart(fig, SECTION, 'tourism_art_forms', use_container_width=True)
+        st.caption(dense_scatter.describe(fig))
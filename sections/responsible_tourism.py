@@ -0,0 +1,222 @@
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+import crowding
+import dense_scatter
+from figure_cache import cached_figure
+from instrumentation import plotly_chart, timed
+from metrics import derived_metrics
+
+SECTION = 'responsible_tourism'
+
+
+def sustainability_radar_figure(sustainability_data):
+    # Create radar chart for top performing states
+    top_states = sustainability_data.head(5)
+    
+    fig = go.Figure()
+    
+    for idx, state in enumerate(top_states['State']):
+        state_data = top_states[top_states['State'] == state]
+        
+        fig.add_trace(go.Scatterpolar(
+            r=[state_data['Eco_Score'].values[0],
+               state_data['Community_Participation'].values[0],
+               state_data['Cultural_Preservation'].values[0],
+               state_data['Local_Employment'].values[0]],
+            theta=['Eco Score', 'Community Participation', 'Cultural Preservation', 'Local Employment'],
+            fill='toself',
+            name=state
+        ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100]
+            )),
+        showlegend=True,
+        title="Top 5 States - Responsible Tourism Performance"
+    )
+    return fig
+
+
+def community_impact_figure(sustainability_data):
+    # SVG, WebGL or a server-side raster, depending on the number of rows
+    return dense_scatter.scatter(sustainability_data,
+                                 x='Community_Participation',
+                                 y='Local_Employment',
+                                 size='Eco_Score',
+                                 hover_data=['State'],
+                                 title="Community Participation vs Local Employment",
+                                 color='Cultural_Preservation',
+                                 color_continuous_scale='Greens')
+
+
+def champions_figure(ranked):
+    fig = px.bar(ranked.head(5),
+                x='State',
+                y='Eco_Score',
+                title="Top 5 Eco-Friendly Tourism States",
+                color='Eco_Score',
+                color_continuous_scale='Greens')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+
+# Simulated once per data version and parameter set
+@st.cache_data(max_entries=32)
+def load_crowding_risk(_cultural_sites, _tourism_trends, data_version, store_dir, params):
+    return crowding.crowding_risk(_cultural_sites, _tourism_trends, params, store_dir)
+
+
+def crowding_heatmap_figure(monthly):
+    # A state's riskiest site sets its color
+    risk = monthly.pivot_table(index='State', columns='Month', values='Month_Risk', aggfunc='max', observed=True)
+    fig = px.imshow(risk * 100,
+                    labels=dict(x="Month", y="State", color="% chance"),
+                    color_continuous_scale='Reds',
+                    zmin=0, zmax=100,
+                    aspect='auto',
+                    title="Chance of at Least One Day Over Capacity, by Month")
+    fig.update_layout(height=max(400, 22 * len(risk)))
+    return fig
+
+
+def overflow_days_figure(summary):
+    # summary is sorted by Overflow_Days, so this keeps each state's worst site
+    worst = summary.drop_duplicates('State').head(10)
+    return px.bar(worst,
+                  x='State',
+                  y='Overflow_Days',
+                  error_y=worst['Overflow_Days_P90'] - worst['Overflow_Days'],
+                  title="Expected Days Over Capacity per Year (whisker to 90th percentile)",
+                  color='Overflow_Days',
+                  color_continuous_scale='Reds')
+
+
+def crowding_metrics(monthly, summary):
+    # [(label, value, help)] headline numbers of one simulation
+    worst = monthly.groupby('Month', observed=True)['Day_Risk'].mean().idxmax()
+    return [
+        ("Sites at Risk", f"{int((summary['Any_Overflow'] >= 0.5).sum())} / {len(summary)}",
+         "Sites more likely than not to go over capacity at least once a year"),
+        ("Overflow Days per Year", f"{summary['Overflow_Days'].sum():,.0f}", "Summed over all sites"),
+        ("Riskiest Month", worst, None),
+    ]
+
+
+# Parameter changes rerun only the simulation panel
+@st.fragment
+def crowding_panel(cultural_sites, tourism_trends, data_version, store_dir):
+    st.subheader("🚦 Crowd & Carrying Capacity Simulation")
+    st.caption("Simulated years of daily arrivals per site, following the monthly tourism index. "
+               "Where the carrying_capacity table has a state's capacity, it is split across the state's "
+               "sites by their peak-month visitors; elsewhere a site's capacity is a multiple of its "
+               "average daily visitors in its peak month.")
+    
+    defaults = crowding.DEFAULT_PARAMS
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        scenarios = st.select_slider("Scenarios", [500, 1000, 2000, 5000], defaults.scenarios,
+                                     key='crowding_scenarios')
+    with col2:
+        capacity_factor = st.slider("Capacity (× peak-month average)", 1.0, 3.0, defaults.capacity_factor, 0.1,
+                                    key='crowding_capacity')
+    with col3:
+        variability = st.slider("Day-to-day variability", 0.0, 0.6, defaults.variability, 0.05,
+                                key='crowding_variability')
+    with col4:
+        growth = st.slider("Demand growth %", -30, 100, int(defaults.growth * 100), 5, key='crowding_growth')
+    
+    params = crowding.CrowdParams(scenarios, capacity_factor, variability, growth / 100, defaults.seed)
+    with timed('transform', SECTION, 'crowding'):
+        monthly, summary = load_crowding_risk(cultural_sites, tourism_trends, data_version, store_dir, params)
+    
+    for col, (label, value, help) in zip(st.columns(3), crowding_metrics(monthly, summary)):
+        with col:
+            st.metric(label, value, help=help)
+    
+    # Slider moves back to a parameter set seen before reuse its figures
+    col1, col2 = st.columns(2)
+    with col1:
+        fig = cached_figure(SECTION, 'crowding_heatmap', data_version, lambda: crowding_heatmap_figure(monthly),
+                            filters=params._asdict())
+        plotly_chart(fig, SECTION, 'crowding_heatmap', use_container_width=True)
+    with col2:
+        fig = cached_figure(SECTION, 'overflow_days', data_version, lambda: overflow_days_figure(summary),
+                            filters=params._asdict())
+        plotly_chart(fig, SECTION, 'overflow_days', use_container_width=True)
+
+
+def sustainability_charts(data):
+    sustainability_data = data.sustainability_data
+    
+    fig = cached_figure(SECTION, 'sustainability_radar', data.data_version,
+                        lambda: sustainability_radar_figure(sustainability_data))
+    plotly_chart(fig, SECTION, 'sustainability_radar', use_container_width=True)
+    
+    # Detailed analysis
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Community Impact Analysis")
+        fig = cached_figure(SECTION, 'community_impact', data.data_version,
+                            lambda: community_impact_figure(sustainability_data))
+        plotly_chart(fig, SECTION, 'community_impact', use_container_width=True)
+        st.caption(dense_scatter.describe(fig))
+    
+    with col2:
+        st.subheader("Sustainability Champions")
+        fig = cached_figure(SECTION, 'champions', data.data_version,
+                            lambda: champions_figure(derived_metrics(data).champions))
+        plotly_chart(fig, SECTION, 'champions', use_container_width=True)
+
+
+def render(data):
+    sustainability_data = data.sustainability_data
+    
+    st.markdown('<h2 class="section-header">Responsible Tourism & Sustainability</h2>', unsafe_allow_html=True)
+    
+    # Sustainability metrics
+    st.subheader("State-wise Sustainability Performance")
+    
+    if sustainability_data.empty:
+        st.info("No sustainability scores for the states picked in the sidebar.")
+    else:
+        sustainability_charts(data)
+    
+    crowding_panel(data.cultural_sites, data.tourism_trends, data.data_version, data.store.path)
+    
+    # Best practices showcase
+    st.subheader("Best Practices & Success Stories")
+    
+    tab1, tab2, tab3 = st.tabs(["Kerala Model", "Sikkim Initiative", "Himachal Approach"])
+    
+    with tab1:
+        st.markdown("""
+        ### Kerala's Responsible Tourism Model
+        - **Community Ownership**: 95% of tourism activities managed by local communities
+        - **Revenue Distribution**: 60% of tourism revenue stays in local communities
+        - **Environmental Protection**: Strict regulations on coastal and backwater tourism
+        - **Cultural Preservation**: Integration of traditional art forms in tourism packages
+        """)
+    
+    with tab2:
+        st.markdown("""
+        ### Sikkim's Organic Tourism Initiative
+        - **100% Organic State**: First fully organic state in India
+        - **Carrying Capacity**: Strict limits on tourist numbers to protected areas
+        - **Local Employment**: 85% of tourism jobs filled by locals
+        - **Cultural Integration**: Mandatory cultural orientation for tourists
+        """)
+    
+    with tab3:
+        st.markdown("""
+        ### Himachal Pradesh's Sustainable Mountain Tourism
+        - **Waste Management**: Zero-waste tourism initiatives in key destinations
+        - **Cultural Villages**: Authentic village tourism experiences
+        - **Seasonal Distribution**: Promoting off-season tourism to reduce pressure
+        - **Local Crafts**: Integration of traditional handicrafts in tourism economy
+        """)
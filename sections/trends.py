@@ -0,0 +1,321 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import capacity
+import filters
+import live_feed
+import seasonality
+import timeseries
+from figure_cache import cached_figure
+from instrumentation import plotly_chart
+from metrics import TREND_COLUMNS, derived_metrics
+
+SECTION = 'trends'
+NATIONAL = "National index"
+
+
+def seasonality_figure(tourism_trends):
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=tourism_trends['Month'],
+        y=tourism_trends['Cultural_Tourism'],
+        mode='lines+markers',
+        name='Cultural Tourism',
+        line=dict(color='#FF6B35', width=3)
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=tourism_trends['Month'],
+        y=tourism_trends['Heritage_Sites'],
+        mode='lines+markers',
+        name='Heritage Sites',
+        line=dict(color='#2E86AB', width=3)
+    ))
+    
+    fig.add_trace(go.Scatter(
+        x=tourism_trends['Month'],
+        y=tourism_trends['Art_Festivals'],
+        mode='lines+markers',
+        name='Art Festivals',
+        line=dict(color='#F18F01', width=3)
+    ))
+    
+    fig.update_layout(
+        title="Seasonal Tourism Trends (Index: 100 = Peak)",
+        xaxis_title="Month",
+        yaxis_title="Tourism Index",
+        hovermode='x unified'
+    )
+    return fig
+
+
+def peak_season_figure(peak_data, sample=False):
+    return px.bar(peak_data, x='Category', y='Average_Peak',
+                  title="Average Tourism Index During Peak Season" + (timeseries.SAMPLE_TAG if sample else ""),
+                  color='Average_Peak',
+                  color_continuous_scale='Reds')
+
+
+def off_peak_figure(opportunity_data, sample=False):
+    # Potential_Increase is missing without daily footfall to model it from
+    return px.bar(opportunity_data, x='Month',
+                  y=[c for c in ['Current_Index', 'Potential_Increase'] if c in opportunity_data],
+                  title="Off-Peak Tourism Growth Potential" + (timeseries.SAMPLE_TAG if sample else ""),
+                  barmode='stack')
+
+
+def footfall_scope(data):
+    # (start, end, states) of the footfall behind the sidebar filters;
+    # states is None when every state is in
+    start, end = filters.footfall_window(data.filters)
+    states = None
+    if data.filters != filters.NO_FILTERS:
+        states = tuple(sorted(data.cultural_sites['State'].unique()))
+    return start, end, states
+
+
+# Seasonal index, peak and off-peak months for every state in one batch
+@st.cache_data
+def load_state_seasonality(data_version, store_dir, start=None, end=None, states=None):
+    return seasonality.monthly_seasonality(by='State', start=start, end=end, store_dir=store_dir, states=states)
+
+
+# Monthly headroom for every state plus the national total
+@st.cache_data
+def load_headroom(data_version, store_dir, start=None, end=None, states=None):
+    return capacity.headroom_by('State', national_label=NATIONAL, store_dir=store_dir, start=start, end=end,
+                                states=states).set_index(['State', 'Month'])
+
+
+def national_season(metrics, headroom):
+    peak_data = pd.DataFrame({
+        'Category': ['Cultural Tourism', 'Heritage Sites', 'Art Festivals'],
+        'Average_Peak': metrics.peak_averages[TREND_COLUMNS].to_numpy()
+    })
+    
+    # Opportunity analysis: capacity headroom of the national total, when
+    # there is footfall to model it from
+    off_peak = metrics.tourism_trends[metrics.tourism_trends['Off_Peak']]
+    opportunity_data = pd.DataFrame({
+        'Month': off_peak['Month'].tolist(),
+        'Current_Index': off_peak['Cultural_Tourism'].tolist(),
+    })
+    if headroom is not None:
+        opportunity_data['Potential_Increase'] = (headroom.loc[NATIONAL].reindex(off_peak['Month'])['Headroom_Index']
+                                                  .tolist())
+    return metrics.peak_months, peak_data, metrics.off_peak_months, opportunity_data
+
+
+def state_season(metrics, state_seasonality, headroom, state):
+    season = state_seasonality[state_seasonality['State'] == state]
+    peak = season[season['Peak']]
+    off_peak = season[season['Off_Peak']]
+    
+    # The state's peak level next to the national one
+    peak_data = pd.DataFrame({
+        'Category': [state, 'National'],
+        'Average_Peak': [peak['Index'].mean(), metrics.peak_averages['Cultural_Tourism']]
+    })
+    
+    # Headroom below the state's carrying capacity
+    opportunity_data = pd.DataFrame({
+        'Month': off_peak['Month'].tolist(),
+        'Current_Index': off_peak['Index'].tolist(),
+        'Potential_Increase': headroom.loc[state].reindex(off_peak['Month'])['Headroom_Index'].tolist()
+    })
+    return peak['Month'].tolist(), peak_data, off_peak['Month'].tolist(), opportunity_data
+
+
+@st.cache_data
+def load_footfall_bounds(data_version, store_dir):
+    return timeseries.date_bounds(store_dir)
+
+
+# Daily totals for the selected window, downsampled to the chart width.
+# Narrowing the window re-queries the store, so zooming in brings back
+# detail that was bucketed away at the wider range.
+@st.cache_data(max_entries=64)
+def load_footfall_window(data_version, store_dir, state, start, end, pixel_width):
+    dates, visitors = timeseries.daily_totals(state, start, end, store_dir)
+    x, y = timeseries.downsample(dates, visitors, pixel_width)
+    return x, y, len(visitors)
+
+
+def footfall_figure(x, y, label, sample=False):
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=y,
+        mode='lines',
+        name=label,
+        line=dict(color='#FF6B35', width=1)
+    ))
+    
+    fig.update_layout(
+        title=("Daily Footfall" + timeseries.SAMPLE_TAG) if sample else "Daily Ticketed Footfall",
+        xaxis_title="Date",
+        yaxis_title="Visitors",
+        hovermode='x unified'
+    )
+    return fig
+
+
+# Selector and slider changes only rerun this panel
+@st.fragment
+def footfall_panel(data, sample):
+    states = ['All states'] + sorted(data.cultural_sites['State'].unique())
+    first_day, last_day = load_footfall_bounds(data.data_version, data.store.path)
+    start, end, scope = footfall_scope(data)
+    first_day, last_day = max(first_day, start or first_day), min(last_day, end or last_day)
+    # A window picked before the year filter changed may fall outside it;
+    # start over from the whole filtered range
+    window = st.session_state.get('footfall_window')
+    if window is not None and (window[0] < first_day or window[1] > last_day):
+        del st.session_state['footfall_window']
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        state = st.selectbox("State", states, key='footfall_state')
+    with col2:
+        start, end = st.slider("Date range", min_value=first_day, max_value=last_day,
+                               value=(first_day, last_day), format="MMM YYYY",
+                               key='footfall_window')
+    
+    x, y, raw_points = load_footfall_window(data.data_version, data.store.path,
+                                            scope if state == 'All states' else state,
+                                            start, end, timeseries.DEFAULT_PIXEL_WIDTH)
+    if raw_points == 0:
+        st.info("No daily footfall for the sites picked in the sidebar.")
+        return
+    fig = cached_figure(SECTION, 'daily_footfall', data.data_version,
+                        lambda: footfall_figure(x, y, state, sample),
+                        filters={'state': state, 'start': start, 'end': end})
+    plotly_chart(fig, SECTION, 'daily_footfall', use_container_width=True)
+    st.caption(f"{raw_points:,} days in range · {len(y):,} points plotted"
+               + (f" · {timeseries.SAMPLE_NOTE}" if sample else ""))
+
+
+def live_figure(x, y, label, resolution):
+    fig = go.Figure()
+    
+    fig.add_trace(go.Bar(
+        x=x,
+        y=y,
+        name=label,
+        marker_color='#2E86AB'
+    ))
+    
+    fig.update_layout(
+        title=f"Live Gate Footfall ({resolution})",
+        xaxis_title="Time",
+        yaxis_title="Visitors",
+        bargap=0.05,
+        # Keep zoom and pan across timer redraws
+        uirevision=f"{label}-{resolution}"
+    )
+    return fig
+
+
+# Redrawn on a timer from the in-memory buffers; the timer and the widgets
+# here only rerun this panel, never the rest of the app
+@st.fragment(run_every=live_feed.REFRESH_SECONDS)
+def live_panel():
+    sites = live_feed.LIVE.sites()
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        site = st.selectbox("Site", ['All sites'] + sites, key='live_site')
+    with col2:
+        resolution = st.radio("Resolution", list(live_feed.RESOLUTIONS), horizontal=True, key='live_resolution')
+    site = None if site == 'All sites' else site
+    
+    x, y = live_feed.LIVE.series(resolution, site)
+    _, last_5min = live_feed.LIVE.series('5 min', site)
+    _, last_hours = live_feed.LIVE.series('Hourly', site)
+    _, last_days = live_feed.LIVE.series('Daily', site)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Last 5 Minutes", f"{last_5min[-1]:,.0f}", f"{last_5min[-1] - last_5min[-2]:+,.0f}")
+    with col2:
+        st.metric("This Hour", f"{last_hours[-1]:,.0f}", f"{last_hours[-1] - last_hours[-2]:+,.0f}")
+    with col3:
+        st.metric("Today", f"{last_days[-1]:,.0f}", f"{last_days[-1] - last_days[-2]:+,.0f}")
+    
+    plotly_chart(live_figure(x, y, site or 'All sites', resolution), SECTION, 'live_footfall',
+                 use_container_width=True)
+    status = live_feed.LIVE.status
+    st.caption(f"{status['source']} · {status['events']:,} events · last at {status['last_event'] or '–'}"
+               + (f" · {status['rejected']:,} rejected" if status['rejected'] else "")
+               + (f" · {status['future']:,} stamped in the future" if status['future'] else "")
+               + (f" · ⚠️ {status['last_error']}" if status['last_error'] else ""))
+
+
+def render(data):
+    tourism_trends = data.tourism_trends
+    metrics = derived_metrics(data)
+    
+    st.markdown('<h2 class="section-header">Tourism Trends & Seasonal Patterns</h2>', unsafe_allow_html=True)
+    
+    # Seasonality analysis
+    st.subheader("Monthly Tourism Patterns")
+    
+    fig = cached_figure(SECTION, 'seasonality', data.data_version,
+                        lambda: seasonality_figure(tourism_trends))
+    plotly_chart(fig, SECTION, 'seasonality', use_container_width=True)
+    
+    st.subheader("Daily Footfall")
+    has_footfall = timeseries.footfall_available(data.store.path)
+    sample = timeseries.footfall_is_sample(data.store.path)
+    if has_footfall:
+        footfall_panel(data, sample)
+    else:
+        st.info(timeseries.MISSING_NOTE)
+    
+    if live_feed.LIVE_SOURCE:
+        st.subheader("Live Footfall")
+        live_panel()
+    
+    # Peak and off-peak analysis, nationally or for one state. Per-state
+    # seasons and the headroom model need daily footfall.
+    state_seasonality = headroom = None
+    regions = []
+    if has_footfall:
+        scope = footfall_scope(data)
+        state_seasonality = load_state_seasonality(data.data_version, data.store.path, *scope)
+        if state_seasonality.empty:
+            st.info("No daily footfall for the states and years picked in the sidebar; "
+                    "showing the national season.")
+        else:
+            headroom = load_headroom(data.data_version, data.store.path, *scope)
+            regions = sorted(state_seasonality['State'].unique())
+    region = st.selectbox("Season analysis for", [NATIONAL] + regions, key='season_region')
+    if region == NATIONAL:
+        peak_months, peak_data, off_peak_months, opportunity_data = national_season(metrics, headroom)
+    else:
+        peak_months, peak_data, off_peak_months, opportunity_data = state_season(
+            metrics, state_seasonality, headroom, region)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Peak Season Analysis")
+        st.write(f"**Peak Months:** {', '.join(peak_months)}")
+        
+        fig = cached_figure(SECTION, 'peak_season', data.data_version,
+                            lambda: peak_season_figure(peak_data, sample and region != NATIONAL),
+                            filters={'region': region})
+        plotly_chart(fig, SECTION, 'peak_season', use_container_width=True)
+    
+    with col2:
+        st.subheader("Off-Peak Opportunities")
+        st.write(f"**Off-Peak Months:** {', '.join(off_peak_months)}")
+        
+        fig = cached_figure(SECTION, 'off_peak', data.data_version,
+                            lambda: off_peak_figure(opportunity_data, sample), filters={'region': region})
+        plotly_chart(fig, SECTION, 'off_peak', use_container_width=True)
+        if headroom is None:
+            st.caption("Growth potential is modelled from daily footfall; none is in the store.")
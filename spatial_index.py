@@ -0,0 +1,107 @@
+# Spatial index over site coordinates.
+#
+# Sites are bucketed into a fixed lat/lon grid and sorted by cell id, so the
+# sites in any run of cells along a grid row are one contiguous slice. A
+# bounding-box query turns into one searchsorted range per grid row plus an
+# exact check on the candidates; radius and nearest-neighbour queries use
+# the box around the search circle and then exact haversine distances.
+# Queries return positions into the indexed frame (use .iloc).
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = np.pi * EARTH_RADIUS_KM / 180.0
+# Grid cell size in degrees (~55 km north-south)
+CELL_DEG = 0.5
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def radius_bounds(lat, lon, radius_km):
+    # Lat/lon box containing the circle; all longitudes near the poles or
+    # where the circle crosses the antimeridian
+    dlat = radius_km / KM_PER_DEGREE
+    cos_lat = np.cos(np.radians(lat))
+    if lat + dlat >= 90 or lat - dlat <= -90 or cos_lat * 180 * KM_PER_DEGREE <= radius_km:
+        return (max(lat - dlat, -90.0), -180.0), (min(lat + dlat, 90.0), 180.0)
+    dlon = radius_km / (KM_PER_DEGREE * cos_lat)
+    if lon - dlon < -180 or lon + dlon > 180:
+        return (lat - dlat, -180.0), (lat + dlat, 180.0)
+    return (lat - dlat, lon - dlon), (lat + dlat, lon + dlon)
+
+
+class SiteIndex:
+    def __init__(self, lat, lon, cell_deg=CELL_DEG):
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.cell_deg = cell_deg
+        self.n_rows = int(np.ceil(180 / cell_deg)) + 1
+        self.n_cols = int(np.ceil(360 / cell_deg)) + 1
+
+        cells = self._row(self.lat) * self.n_cols + self._col(self.lon)
+        self.order = np.argsort(cells, kind='stable')
+        self.cells = cells[self.order]
+
+    @classmethod
+    def from_sites(cls, sites, cell_deg=CELL_DEG):
+        return cls(sites['Latitude'].to_numpy(), sites['Longitude'].to_numpy(), cell_deg)
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _row(self, lat):
+        return np.clip((np.asarray(lat) + 90) // self.cell_deg, 0, self.n_rows - 1).astype(np.int64)
+
+    def _col(self, lon):
+        return np.clip((np.asarray(lon) + 180) // self.cell_deg, 0, self.n_cols - 1).astype(np.int64)
+
+    def _candidates(self, bounds):
+        # Sites in the grid cells touching the box, from one slice per row
+        (south, west), (north, east) = bounds
+        rows = np.arange(self._row(south), self._row(north) + 1)
+        starts = np.searchsorted(self.cells, rows * self.n_cols + self._col(west), 'left')
+        stops = np.searchsorted(self.cells, rows * self.n_cols + self._col(east), 'right')
+        lengths = stops - starts
+        if lengths.sum() == 0:
+            return np.empty(0, dtype=np.int64)
+        # Concatenated ranges without a Python loop
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return self.order[offsets + np.arange(lengths.sum())]
+
+    def bbox(self, bounds):
+        # Positions of sites inside ((south, west), (north, east))
+        (south, west), (north, east) = bounds
+        found = self._candidates(bounds)
+        lat, lon = self.lat[found], self.lon[found]
+        keep = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return np.sort(found[keep])
+
+    def within(self, lat, lon, radius_km, mask=None):
+        # (positions, distances in km) of sites within radius_km, nearest first
+        found = self._candidates(radius_bounds(lat, lon, radius_km))
+        if mask is not None:
+            found = found[np.asarray(mask)[found]]
+        distance = haversine_km(lat, lon, self.lat[found], self.lon[found])
+        keep = distance <= radius_km
+        found, distance = found[keep], distance[keep]
+        order = np.argsort(distance, kind='stable')
+        return found[order], distance[order]
+
+    def nearest(self, lat, lon, k, mask=None):
+        # (positions, distances in km) of the k nearest sites; mask limits
+        # the search to a subset, e.g. sites with UNESCO listings. The search
+        # circle doubles until it holds k sites, so the k found are exact.
+        total = len(self) if mask is None else int(np.count_nonzero(mask))
+        k = min(k, total)
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        radius = self.cell_deg * KM_PER_DEGREE
+        while True:
+            found, distance = self.within(lat, lon, radius, mask)
+            if len(found) >= k or radius >= np.pi * EARTH_RADIUS_KM:
+                return found[:k], distance[:k]
+            radius *= 2
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from itinerary import leg_km, two_opt
+from spatial_index import haversine_km
+
+
+def distances(n, seed):
+    rng = np.random.default_rng(seed)
+    lat, lon = rng.uniform(8, 34, n), rng.uniform(68, 97, n)
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_two_opt_never_lengthens_a_route(seed):
+    matrix = distances(30, seed)
+    route = np.random.default_rng(seed).permutation(30)[:12].tolist()
+    improved_route, improved = two_opt(matrix, route)
+    before, after = leg_km(matrix, route).sum(), leg_km(matrix, improved_route).sum()
+    assert after <= before + 1e-9
+    assert improved == (after < before - 1e-6)
+    assert improved_route[0] == route[0]
+    assert sorted(improved_route) == sorted(route)
+
+
+def test_two_opt_leaves_an_optimal_route_alone():
+    # Stops in a line, visited in order
+    matrix = np.abs(np.arange(6)[:, None] - np.arange(6)[None, :]).astype(float)
+    assert two_opt(matrix, [0, 1, 2, 3, 4, 5]) == ([0, 1, 2, 3, 4, 5], False)
+    assert two_opt(matrix, [0, 3, 2, 1, 4, 5]) == ([0, 1, 2, 3, 4, 5], True)
+
+
+def test_two_opt_short_routes():
+    matrix = distances(3, 0)
+    assert two_opt(matrix, [2, 0]) == ([2, 0], False)
@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+import pytest
+
+from live_feed import UTC_OFFSET, RingBuffer, parse_event
+
+
+def test_ring_buffer_reuses_a_slot_once_its_bucket_leaves_the_window():
+    ring = RingBuffer(10, 4)
+    assert ring.add(5, 1)
+    assert ring.add(15, 2)
+    # Bucket 4 lands in bucket 0's slot and replaces it
+    assert ring.add(45, 3)
+    assert ring.window(4).tolist() == [2, 0, 0, 3]
+    assert ring.window(5).tolist() == [0, 0, 3, 0]
+
+
+def test_ring_buffer_drops_buckets_older_than_the_window():
+    ring = RingBuffer(10, 4)
+    ring.add(100, 1)
+    assert not ring.add(60, 5)
+    assert ring.add(70, 2)
+    assert ring.window(10).tolist() == [2, 0, 0, 1]
+
+
+def test_ring_buffer_adds_within_a_bucket():
+    ring = RingBuffer(10, 4)
+    ring.add(0, 1)
+    ring.add(9, 2)
+    assert ring.window(0).tolist() == [0, 0, 0, 3]
+
+
+def test_parse_event_accepts_epoch_and_iso_times():
+    assert parse_event('{"time": 1000, "site": "Hampi", "visitors": 3}') == (1000 + UTC_OFFSET, 'Hampi', 3.0)
+    stamp, site, visitors = parse_event('{"time": "2024-01-01T00:00:00+00:00", "site": "Hampi"}')
+    assert (stamp - UTC_OFFSET, site, visitors) == (1704067200, 'Hampi', 1.0)
+
+
+@pytest.mark.parametrize('line', [
+    'not json',
+    '[1, 2]',
+    '{"site": "Hampi"}',
+    '{"time": 1000}',
+    '{"time": 1000, "site": ""}',
+    '{"time": "yesterday", "site": "Hampi"}',
+    '{"time": NaN, "site": "Hampi"}',
+    '{"time": Infinity, "site": "Hampi"}',
+    '{"time": 1e400, "site": "Hampi"}',
+    '{"time": [1000], "site": "Hampi"}',
+    '{"time": 1000, "site": "Hampi", "visitors": NaN}',
+    '{"time": 1000, "site": "Hampi", "visitors": -Infinity}',
+    '{"time": 1000, "site": "Hampi", "visitors": -1}',
+    '{"time": 1000, "site": "Hampi", "visitors": "many"}',
+])
+def test_parse_event_rejects_malformed_lines(line):
+    assert parse_event(line) is None
+
+
+def test_parse_event_rejects_out_of_range_iso_times():
+    assert parse_event(json.dumps({'time': '99999-01-01', 'site': 'Hampi'})) is None
+    assert np.isfinite(parse_event(json.dumps({'time': '2024-06-01T10:00', 'site': 'Hampi'}))[0])
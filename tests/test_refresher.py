@@ -0,0 +1,54 @@
+import os
+import shutil
+
+import pytest
+
+import data_store
+from refresher import DataRefresher
+from schemas import SchemaError
+
+
+@pytest.fixture
+def refresher(tmp_path):
+    raw_dir, store_dir = tmp_path / 'raw', tmp_path / 'store'
+    shutil.copytree(data_store.RAW_DIR, raw_dir)
+    data_store.ensure_store(raw_dir, store_dir)
+    return DataRefresher(raw_dir, store_dir, interval=0)
+
+
+def rewrite(path, text):
+    # New content with an mtime the poller can't mistake for the old one
+    stat = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_unchanged_files_publish_nothing(refresher):
+    version = data_store.data_version(refresher.store_dir)
+    assert refresher.refresh() == []
+    assert refresher.refresh() == []
+    assert data_store.data_version(refresher.store_dir) == version
+    assert refresher.status['refreshes'] == 0
+
+
+def test_a_failed_refresh_is_retried_until_it_publishes(refresher):
+    path = data_store.raw_path('art_forms', refresher.raw_dir)
+    good = path.read_text()
+    refresher.refresh()
+    version = data_store.data_version(refresher.store_dir)
+
+    # Practitioners don't fit uint32 when negative
+    head, first, *rest = good.splitlines(keepends=True)
+    fields = first.split(',')
+    rewrite(path, head + ','.join([fields[0], '-' + fields[1]] + fields[2:]) + ''.join(rest))
+    for _ in range(2):
+        with pytest.raises(SchemaError):
+            refresher.refresh()
+        assert data_store.data_version(refresher.store_dir) == version
+
+    fields[2] = str(float(fields[2]) + 1)
+    rewrite(path, head + ','.join(fields) + ''.join(rest))
+    assert refresher.refresh() == ['art_forms']
+    assert data_store.data_version(refresher.store_dir) != version
+    assert refresher.status['last_error'] is None
+    assert refresher.refresh() == []
@@ -0,0 +1,50 @@
+import re
+
+import pyarrow as pa
+import pytest
+
+from schemas import MONTHS, SchemaError, compact
+
+
+def trends(**columns):
+    table = {
+        'Month': MONTHS,
+        'Cultural_Tourism': list(range(40, 100, 5)),
+        'Heritage_Sites': [10] * 12,
+        'Art_Festivals': [3] * 12,
+    }
+    table.update(columns)
+    return pa.table(table)
+
+
+def test_compact_types_a_valid_table():
+    df = compact('tourism_trends', trends())
+    assert df['Month'].cat.ordered
+    assert list(df['Month'].cat.categories) == MONTHS
+    assert str(df['Cultural_Tourism'].dtype) == 'uint8[pyarrow]'
+
+
+def test_compact_sorts_label_categories():
+    table = pa.table({'Art_Form': ['Kathakali', 'Bharatanatyam'], 'Practitioners': [10, 20],
+                      'Revenue_Crores': [1.5, 2.5], 'Tourism_Impact': [80, 90]})
+    df = compact('art_forms', table)
+    assert list(df['Art_Form'].cat.categories) == ['Bharatanatyam', 'Kathakali']
+    assert df['Art_Form'].tolist() == ['Kathakali', 'Bharatanatyam']
+
+
+def test_compact_reads_only_the_requested_columns():
+    table = trends().select(['Month', 'Art_Festivals'])
+    assert list(compact('tourism_trends', table, ['Month', 'Art_Festivals']).columns) == ['Month', 'Art_Festivals']
+
+
+@pytest.mark.parametrize('table, message', [
+    (trends().drop_columns(['Heritage_Sites']), 'missing columns Heritage_Sites'),
+    (trends(Art_Festivals=[3] * 11 + [None]), '1 null values'),
+    (trends(Cultural_Tourism=[300] * 12), 'do not fit uint8'),
+    (trends(Heritage_Sites=[-1] * 12), 'do not fit uint8'),
+    (trends(Art_Festivals=[2.5] * 12), 'do not fit uint8'),
+    (trends(Month=MONTHS[:11] + ['Dece']), "unknown months ['Dece']"),
+])
+def test_compact_raises_schema_error(table, message):
+    with pytest.raises(SchemaError, match=re.escape(message)):
+        compact('tourism_trends', table)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from spatial_index import SiteIndex, haversine_km
+
+
+@pytest.fixture(scope='module')
+def sites():
+    # Clustered like real sites, plus a few across the antimeridian and
+    # near a pole
+    rng = np.random.default_rng(11)
+    lat = np.concatenate([rng.normal(22, 6, 3000), rng.uniform(-89, 89, 200), [0.0, 0.1, 89.9]])
+    lon = np.concatenate([rng.normal(80, 6, 3000), rng.uniform(-180, 180, 200), [179.95, -179.95, 10.0]])
+    return np.clip(lat, -90, 90), np.clip(lon, -180, 180)
+
+
+QUERIES = [(22.0, 80.0, 50.0), (28.6, 77.2, 300.0), (0.05, 180.0, 40.0), (89.5, 0.0, 200.0), (-60.0, 20.0, 5.0)]
+
+
+@pytest.mark.parametrize('lat, lon, radius_km', QUERIES)
+def test_within_matches_brute_force(sites, lat, lon, radius_km):
+    index = SiteIndex(*sites)
+    distance = haversine_km(lat, lon, *sites)
+    found, found_distance = index.within(lat, lon, radius_km)
+    assert set(found) == set(np.flatnonzero(distance <= radius_km))
+    assert np.allclose(found_distance, distance[found])
+    assert np.all(np.diff(found_distance) >= 0)
+
+
+@pytest.mark.parametrize('lat, lon, radius_km', QUERIES)
+def test_nearest_matches_brute_force(sites, lat, lon, radius_km):
+    index = SiteIndex(*sites)
+    distance = haversine_km(lat, lon, *sites)
+    found, found_distance = index.nearest(lat, lon, 10)
+    assert np.allclose(found_distance, np.sort(distance)[:10])
+    assert np.allclose(distance[found], found_distance)
+
+
+def test_nearest_respects_the_mask(sites):
+    index = SiteIndex(*sites)
+    mask = np.zeros(len(index), dtype=bool)
+    mask[::97] = True
+    distance = np.where(mask, haversine_km(20.0, 75.0, *sites), np.inf)
+    found, found_distance = index.nearest(20.0, 75.0, 5, mask)
+    assert mask[found].all()
+    assert np.allclose(found_distance, np.sort(distance)[:5])
+
+
+def test_nearest_with_more_than_there_are(sites):
+    index = SiteIndex(sites[0][:3], sites[1][:3])
+    found, _ = index.nearest(0.0, 0.0, 10)
+    assert sorted(found) == [0, 1, 2]
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from timeseries import downsample, lttb_downsample, minmax_downsample
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    x = np.arange('2020-01-01', '2024-01-01', dtype='datetime64[D]')
+    return x, rng.normal(1000, 200, len(x)).cumsum()
+
+
+@pytest.mark.parametrize('method', ['minmax', 'lttb'])
+def test_downsample_keeps_the_first_and_last_points(series, method):
+    x, y = series
+    xs, ys = downsample(x, y, pixel_width=100, method=method)
+    assert len(xs) <= 2 * 100 + 2
+    assert (xs[0], ys[0]) == (x[0], y[0])
+    assert (xs[-1], ys[-1]) == (x[-1], y[-1])
+    assert np.all(np.diff(xs.astype(np.int64)) > 0)
+
+
+def test_minmax_keeps_every_bucket_extreme(series):
+    x, y = series
+    xs, ys = minmax_downsample(x, y, 50)
+    assert ys.min() == y.min() and ys.max() == y.max()
+    assert np.isin(xs, x).all()
+
+
+def test_lttb_returns_the_requested_point_count(series):
+    x, y = series
+    xs, ys = lttb_downsample(x, y, 300)
+    assert len(xs) == 300
+    assert np.array_equal(ys, y[np.searchsorted(x, xs)])
+
+
+def test_short_series_are_returned_unchanged(series):
+    x, y = series
+    for method in ('minmax', 'lttb'):
+        xs, ys = downsample(x[:50], y[:50], pixel_width=100, method=method)
+        assert np.array_equal(xs, x[:50])
+        assert np.array_equal(ys, y[:50])
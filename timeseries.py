@@ -0,0 +1,178 @@
+# Daily ticketed footfall time series.
+#
+# The footfall_daily table (Site, State, Date, Year, Visitors) is stored in
+# the columnar store partitioned by Year. Queries prune by year and date on
+# the Parquet scan, aggregate to one value per day, and are downsampled on
+# the server to roughly the chart's pixel width before they reach Plotly.
+#
+# Without a footfall export the table is absent and the charts built from it
+# are skipped. The sample series is only built on request, and every chart
+# built from it is labelled as sample data.
+#
+#   python timeseries.py --sample   # build the sample series into the store
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+import data_store
+
+FOOTFALL_TABLE = 'footfall_daily'
+# Plot area width the downsampled series is sized for
+DEFAULT_PIXEL_WIDTH = 1200
+
+SAMPLE_START = '2015-01-01'
+SAMPLE_END = '2024-12-31'
+SAMPLE_SOURCE = 'sample:state totals x monthly index'
+# Appended to the titles of charts built from the sample series
+SAMPLE_TAG = " (sample data)"
+SAMPLE_NOTE = ("Sample data: daily footfall synthesized from state totals and the monthly tourism index "
+               "(python timeseries.py --sample), not ticketing records.")
+MISSING_NOTE = ("No daily footfall export in the store. Convert one with `python data_store.py footfall_daily`, "
+                "or build the sample series with `python timeseries.py --sample`.")
+# Mon..Sun visitor multipliers for the sample series
+WEEKDAY_FACTORS = np.array([0.85, 0.8, 0.85, 0.9, 1.0, 1.35, 1.25])
+
+
+def footfall_available(store_dir=None):
+    return FOOTFALL_TABLE in data_store.read_manifest(store_dir)['tables']
+
+
+def footfall_is_sample(store_dir=None):
+    return data_store.read_manifest(store_dir)['tables'].get(FOOTFALL_TABLE, {}).get('source') == SAMPLE_SOURCE
+
+
+def sample_footfall(cultural_sites, tourism_trends, start=SAMPLE_START, end=SAMPLE_END, seed=7):
+    # Stand-in for the ticketing feed: each state's Annual_Tourists spread
+    # over the year by the monthly Cultural_Tourism index, with weekday
+    # and day-to-day variation. Built as one states x days matrix.
+    dates = pd.date_range(start, end, freq='D')
+    month_index = tourism_trends['Cultural_Tourism'].to_numpy(dtype=float)
+    seasonal = month_index[dates.month - 1] / month_index.mean()
+    weekday = WEEKDAY_FACTORS[dates.dayofweek] / WEEKDAY_FACTORS.mean()
+
+    daily_mean = cultural_sites['Annual_Tourists'].to_numpy(dtype=float)[:, None] / 365.0
+    rng = np.random.default_rng(seed)
+    noise = rng.lognormal(0.0, 0.15, size=(len(cultural_sites), len(dates)))
+    visitors = np.rint(daily_mean * (seasonal * weekday)[None, :] * noise).astype(np.int32)
+
+    states = np.repeat(cultural_sites['State'].to_numpy(), len(dates))
+    return pd.DataFrame({
+        'Site': states,
+        'State': states,
+        'Date': np.tile(dates.values.astype('datetime64[D]'), len(cultural_sites)),
+        'Year': np.tile(dates.year.to_numpy(dtype=np.int16), len(cultural_sites)),
+        'Visitors': visitors.ravel(),
+    })
+
+
+def date_filter(start=None, end=None, state=None):
+    # Year terms let the scan skip whole partitions; state is one name or a
+    # collection of them
+    expr = None
+    terms = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        terms += [ds.field('Year') >= start.year, ds.field('Date') >= pa.scalar(start.date())]
+    if end is not None:
+        end = pd.Timestamp(end)
+        terms += [ds.field('Year') <= end.year, ds.field('Date') <= pa.scalar(end.date())]
+    if isinstance(state, str):
+        terms.append(ds.field('State') == state)
+    elif state is not None:
+        terms.append(ds.field('State').isin(list(state)))
+    for term in terms:
+        expr = term if expr is None else expr & term
+    return expr
+
+
+def date_bounds(store_dir=None):
+    dates = data_store.open_dataset(FOOTFALL_TABLE, store_dir).to_table(columns=['Date'])['Date']
+    bounds = pc.min_max(dates)
+    return pd.Timestamp(bounds['min'].as_py()).date(), pd.Timestamp(bounds['max'].as_py()).date()
+
+
+def daily_totals(state=None, start=None, end=None, store_dir=None):
+    # Total visitors per day for one state, several, or all, as
+    # (dates, visitors)
+    dataset = data_store.open_dataset(FOOTFALL_TABLE, store_dir)
+    table = dataset.to_table(columns=['Date', 'Visitors'], filter=date_filter(start, end, state))
+    daily = table.group_by('Date').aggregate([('Visitors', 'sum')]).sort_by('Date')
+    return (daily['Date'].to_numpy().astype('datetime64[D]'),
+            daily['Visitors_sum'].to_numpy().astype(np.float64))
+
+
+def minmax_downsample(x, y, n_buckets):
+    # Keep the minimum and maximum of each equal-width bucket, in x order,
+    # plus the first and last points so the line spans the whole range
+    n = len(y)
+    size = -(-n // n_buckets)
+    n_buckets = -(-n // size)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    rows = padded.reshape(n_buckets, size)
+    offsets = np.arange(n_buckets) * size
+    picks = np.concatenate([[0, n - 1], offsets + np.nanargmin(rows, axis=1),
+                            offsets + np.nanargmax(rows, axis=1)])
+    picks = np.unique(picks)
+    return x[picks], y[picks]
+
+
+def lttb_downsample(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: first and last points are kept, and
+    # each bucket in between contributes the point forming the largest
+    # triangle with the previous pick and the next bucket's average
+    n = len(y)
+    xf = x.astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+    xf = xf.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, stops = edges[:-1], edges[1:]
+
+    # Bucket averages from cumulative sums; bucket i uses bucket i + 1's
+    # average (or the last point) as its third vertex
+    cum_x = np.concatenate([[0.0], np.cumsum(xf)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    counts = stops - starts
+    next_x = np.append(((cum_x[stops] - cum_x[starts]) / counts)[1:], xf[-1])
+    next_y = np.append(((cum_y[stops] - cum_y[starts]) / counts)[1:], y[-1])
+
+    picks = np.empty(n_out, dtype=np.int64)
+    picks[0], picks[-1] = 0, n - 1
+    prev = 0
+    for i, (lo, hi) in enumerate(zip(starts, stops)):
+        bx, by = xf[lo:hi], y[lo:hi]
+        area = np.abs((xf[prev] - next_x[i]) * (by - y[prev]) - (xf[prev] - bx) * (next_y[i] - y[prev]))
+        prev = lo + int(np.argmax(area))
+        picks[i + 1] = prev
+    return x[picks], y[picks]
+
+
+def downsample(x, y, pixel_width=DEFAULT_PIXEL_WIDTH, method='minmax'):
+    # About two points per horizontal pixel is all a line chart can show
+    if method == 'lttb':
+        n_out = 2 * pixel_width
+        return (x, y) if len(y) <= n_out else lttb_downsample(x, y, n_out)
+    return (x, y) if len(y) <= 2 * pixel_width else minmax_downsample(x, y, pixel_width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the daily footfall table")
+    parser.add_argument('--sample', action='store_true',
+                        help="(re)build the sample series from the state totals and monthly index")
+    args = parser.parse_args(argv)
+    if not args.sample:
+        parser.error("convert a real export with: python data_store.py footfall_daily")
+
+    data_store.ensure_store()
+    cultural_sites = data_store.load_table('cultural_sites')
+    tourism_trends = data_store.load_table('tourism_trends')
+    manifest = data_store.write_table(FOOTFALL_TABLE, sample_footfall(cultural_sites, tourism_trends),
+                                      SAMPLE_SOURCE)
+    print(f"{FOOTFALL_TABLE}: {manifest['tables'][FOOTFALL_TABLE]['rows']:,} rows")
+
+
+if __name__ == '__main__':
+    main()